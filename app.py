@@ -1,20 +1,20 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
-import re
-import io
-import matplotlib.pyplot as plt
 import datetime
-import base64
-from io import StringIO
-import plotly.express as px
-import plotly.graph_objects as go
-from PIL import Image
-# Adicione estas linhas ao início do arquivo, junto com os outros imports
-import io
-from docx import Document
-from docx.shared import Pt, Cm, RGBColor
-from docx.enum.text import WD_ALIGN_PARAGRAPH
+import uuid
+# Dependências pesadas (pandas, plotly, python-docx, PyPDF2) são importadas
+# apenas no caminho que as usa; ver benchmarks/import_time.py
+
+from processador.export import DOCX_MIME, word_report_bytes
+from processador.history_store import HistoryStore, make_exam_record, parse_collection_date
+from processador.instrumentation import recorder as perf
+from processador.metric_catalog import MetricCatalog
+from processador.ingest import UploadPool
+from processador.parse_cache import ParseCache
+from processador.rendering import render_exam_html
+from processador.repository import ExamRepository
+from processador.parsing import parse_report_text
+from processador.sample_data import SAMPLE_REPORT_TEXT
+from processador.units import normalize_value
 
 # Configuração da página
 st.set_page_config(
@@ -30,7 +30,7 @@ st.markdown("Ferramenta para processamento de PDFs de exames médicos")
 
 # Inicializar variáveis de estado da sessão
 if 'exam_history' not in st.session_state:
-    st.session_state.exam_history = []
+    st.session_state.exam_history = HistoryStore()
     
 if 'current_exam' not in st.session_state:
     st.session_state.current_exam = None
@@ -38,355 +38,160 @@ if 'current_exam' not in st.session_state:
 if 'patient_info' not in st.session_state:
     st.session_state.patient_info = {"name": "", "collectionDate": ""}
 
-if 'selected_metrics' not in st.session_state:
-    st.session_state.selected_metrics = []
+# Métricas disponíveis e selecionadas para os gráficos (atualizado a cada exame)
+if 'metric_catalog' not in st.session_state:
+    st.session_state.metric_catalog = MetricCatalog()
 
-# Função para calcular eGFR usando CKD-EPI
-def calculate_ckd_epi(creatinine, age, is_female=False, is_black=False):
-    cr = float(creatinine)
-    
-    if is_female:
-        if cr <= 0.7:
-            egfr = 144 * (cr / 0.7) ** -0.329 * 0.993 ** age
-        else:
-            egfr = 144 * (cr / 0.7) ** -1.209 * 0.993 ** age
-    else:
-        if cr <= 0.9:
-            egfr = 141 * (cr / 0.9) ** -0.411 * 0.993 ** age
-        else:
-            egfr = 141 * (cr / 0.9) ** -1.209 * 0.993 ** age
-    
-    # Ajuste para raça negra
-    if is_black:
-        egfr *= 1.159
-    
-    return round(egfr)
+# Paciente cujo histórico foi carregado do banco (None = histórico só em memória)
+if 'persisted_patient' not in st.session_state:
+    st.session_state.persisted_patient = None
 
-# Verificar se um resultado está fora do intervalo de referência
-def is_abnormal(value, reference):
-    if not reference:
-        return False
-    
-    # Extrair números do valor de referência
-    ref_match = re.findall(r'[\d,.]+', reference)
-    if not ref_match or len(ref_match) < 2:
-        return False
-    
-    min_ref = float(ref_match[0].replace(',', '.'))
-    max_ref = float(ref_match[1].replace(',', '.'))
-    
-    # Extrair o valor numérico do resultado
-    val_match = re.search(r'[\d,.]+', str(value))
-    if not val_match:
-        return False
-    
-    val = float(val_match.group().replace(',', '.'))
-    
-    return val < min_ref or val > max_ref
+# Laudos já importados nesta sessão, por hash do conteúdo (evita reler a cada
+# rerun). LRU limitado; cabe mais que um upload típico, e um arquivo que saiu
+# do cache volta do banco (ingested_files) sem nova extração
+UPLOAD_CACHE_ENTRIES = 256
+if 'parse_cache' not in st.session_state:
+    st.session_state.parse_cache = ParseCache(max_entries=UPLOAD_CACHE_ENTRIES)
 
 # Processar texto do PDF
 def process_pdf_text(text):
     try:
-        # Estrutura para armazenar os resultados
-        categories = {
-            'Hemograma': [],
-            'Bioquímica': [],
-            'Hormonais': [],
-            'Outros': [],
-            'Imagem': []
-        }
-        
-        # Extrair informações do paciente
-        name_match = re.search(r'Nome:\s*(.*)', text)
-        date_match = re.search(r'Data da Coleta:\s*(.*)', text)
-        
-        patient_info = {
-            "name": name_match.group(1).strip() if name_match else "",
-            "collectionDate": date_match.group(1).strip() if date_match else ""
-        }
-        
-        # Processar cada linha do texto
-        lines = text.split('\n')
-        current_category = 'Outros'
-        in_image_section = False
+        return parse_report_text(text)
+    
+    except Exception as e:
+        st.error(f"Erro ao processar o arquivo: {str(e)}")
+        return None, None
+
+HISTORY_PAGE_SIZE = 10
+
+# Repositório SQLite compartilhado por todas as sessões do processo
+@st.cache_resource
+def get_repository():
+    return ExamRepository()
+
+# Carregar do banco o histórico de um paciente salvo
+def load_persisted_patient(patient):
+    repository = get_repository()
+    latest = repository.latest_exam(patient)
+    if latest is None:
+        return
+    
+    st.session_state.patient_info = latest['patient_info']
+    st.session_state.current_exam = latest['data']
+    # Para os gráficos basta a tabela de resultados; os laudos completos
+    # são lidos página a página na aba de histórico
+    st.session_state.exam_history = HistoryStore.from_rows(
+        repository.history_rows(patient), repository.count_exams(patient)
+    )
+    st.session_state.metric_catalog.reset_history(st.session_state.exam_history.metric_keys)
+    st.session_state.persisted_patient = patient
+
+# Pool de processos para importar vários laudos, compartilhado pelas sessões
+@st.cache_resource
+def get_upload_pool():
+    return UploadPool()
+
+# Adicionar um exame ao banco e ao histórico, se o paciente ainda não tem exame na data
+def add_to_history(patient_info, exam_data, save=True):
+    if not patient_info["collectionDate"]:
+        return None
+    
+    exam_id = None
+    if save:
+        # Persistir no banco (o repositório ignora paciente e data já salvos)
+        with perf.stage("repository_save", items=1):
+            exam_id, _ = get_repository().save_exam(patient_info, exam_data)
+    
+    if st.session_state.exam_history.has_exam(patient_info["name"], patient_info["collectionDate"]):
+        return exam_id
+    
+    # Inserir mantendo ordem cronológica (mais recente primeiro, via bisect)
+    with perf.stage("history_insert", items=1):
+        st.session_state.exam_history.add_exam(make_exam_record(patient_info, exam_data))
+        st.session_state.metric_catalog.add_history_exam(exam_data)
+    return exam_id
+
+# Importar os arquivos enviados: cada um é lido uma única vez (por hash) no
+# pool de processos e entra no histórico assim que termina
+def ingest_uploaded_files(uploaded_files):
+    repository = get_repository()
+    pending = []
+    for uploaded_file in uploaded_files:
+        data = uploaded_file.getvalue()
+        key = ParseCache.key_for(data, uploaded_file.name)
+        if st.session_state.parse_cache.get(key) is None:
+            pending.append((key, uploaded_file.name, data))
+    if not pending:
+        return
+    
+    imported = []
+    with st.status(f"Importando {len(pending)} arquivo(s)...", expanded=True) as status:
+        bars = {}
+        to_parse = []
+        for key, name, data in pending:
+            bars[key] = st.progress(0.0, text=f"{name}: na fila")
+            # Arquivo já importado em outra sessão: o exame vem do banco
+            stored = repository.ingested_exam(key)
+            if stored is not None:
+                add_to_history(stored['patient_info'], stored['data'], save=False)
+                imported.append((stored['patient_info'], stored['data']))
+                st.session_state.parse_cache.put(key, (stored['patient_info'], stored['data']))
+                bars[key].progress(1.0, text=f"{name}: já importado ({stored['date']})")
+            else:
+                to_parse.append((key, name, data))
         
-        for line in lines:
-            line = line.strip()
-            
-            # Verificar seções principais
-            if 'EXAMES DE IMAGEM:' in line:
-                in_image_section = True
-                continue
-            
-            # Identificar categorias com base em palavras-chave
-            if 'Hemograma:' in line:
-                current_category = 'Hemograma'
-                continue
-            elif any(keyword in line for keyword in [
-                'Proteínas Totais', 'Bilirrubinas:', 'Ureia:', 'Creatinina:',
-                'Cálcio:', 'Potássio:', 'Fósforo:', 'Bicarbonato:',
-                'Ferro Sérico:', 'Fosfatase Alcalina:'
-            ]):
-                current_category = 'Bioquímica'
-            elif any(keyword in line for keyword in [
-                'Testosterona', 'PSA', 'Paratormônio'
-            ]):
-                current_category = 'Hormonais'
-            
-            # Processar resultados
-            result_match = re.search(r'○\s*(.*?):\s*(.*?)\s*\(Referência:\s*(.*?)\)', line)
-            simple_result_match = re.search(r'●\s*(.*?):\s*(.*?)\s*\(Referência:\s*(.*?)\)', line)
-            
-            if result_match or simple_result_match:
-                match = result_match or simple_result_match
-                name = match.group(1).strip()
-                value = match.group(2).strip()
-                reference = match.group(3).strip()
-                
-                # Extrair valor numérico para gráficos
-                numeric_value = None
-                if value:
-                    num_match = re.search(r'[\d,.]+', value)
-                    if num_match:
-                        numeric_value = float(num_match.group().replace(',', '.'))
-                
-                unit = re.sub(r'[\d,.\s]+', '', value).strip() if value else ""
-                
-                categories[current_category].append({
-                    "name": name,
-                    "value": value,
-                    "reference": reference,
-                    "numericValue": numeric_value,
-                    "unit": unit,
-                    "isAbnormal": is_abnormal(value, reference)
-                })
-            elif in_image_section:
-                # Processar resultados de imagem
-                image_finding_match = re.search(r'○\s*(.*?):\s*(.*)', line)
-                if image_finding_match:
-                    categories['Imagem'].append({
-                        "name": image_finding_match.group(1).strip(),
-                        "value": image_finding_match.group(2).strip(),
-                        "isAbnormal": True  # Consideramos todos os achados de imagem como relevantes
-                    })
+        names = {key: name for key, name, _ in to_parse}
         
-        # Verificar se precisamos calcular o clearance de creatinina
-        has_creatinine = any(item["name"] == "Creatinina" for item in categories['Bioquímica'])
-        has_egfr = any(item["name"] == "Estimativa do Ritmo de Filtração Glomerular" for item in categories['Bioquímica'])
+        def on_progress(key, page, total):
+            bars[key].progress(page / total, text=f"{names[key]}: página {page} de {total}")
         
-        if has_creatinine and not has_egfr:
-            creatinine_item = next((item for item in categories['Bioquímica'] if item["name"] == "Creatinina"), None)
-            if creatinine_item:
-                cr_value = float(re.search(r'[\d,.]+', creatinine_item["value"]).group().replace(',', '.'))
-                # Estimando idade como 65 para demonstração
-                estimated_age = 65
-                calculated_egfr = calculate_ckd_epi(cr_value, estimated_age, False, False)
+        failures = 0
+        with perf.stage("upload_batch", items=len(to_parse)):
+            for key, result, error in get_upload_pool().run(to_parse, on_progress):
+                if error is not None:
+                    # Fora do cache: o arquivo é tentado de novo no próximo rerun
+                    failures += 1
+                    bars[key].progress(1.0, text=f"{names[key]}: erro — {error}")
+                    continue
                 
-                categories['Bioquímica'].append({
-                    "name": "Estimativa do Ritmo de Filtração Glomerular (CKD-EPI)",
-                    "value": f"{calculated_egfr} mL/min/1,73m²",
-                    "numericValue": calculated_egfr,
-                    "unit": "mL/min/1,73m²",
-                    "reference": "> 90 mL/min/1,73m²",
-                    "isAbnormal": calculated_egfr < 90,
-                    "isCalculated": True
-                })
+                patient_info, exam_data, stages = result
+                # Extração e leitura medidas no processo do pool
+                for stage, wall, cpu, items in stages:
+                    perf.record(stage, wall, cpu, items=items)
+                exam_id = add_to_history(patient_info, exam_data)
+                if exam_id is not None:
+                    repository.record_ingested(key, exam_id, names[key])
+                st.session_state.parse_cache.put(key, (patient_info, exam_data))
+                imported.append((patient_info, exam_data))
+                bars[key].progress(1.0, text=f"{names[key]}: {patient_info['collectionDate'] or 'sem data'}")
         
-        return patient_info, categories
-    
-    except Exception as e:
-        st.error(f"Erro ao processar o arquivo: {str(e)}")
-        return None, None
+        status.update(
+            label=f"{len(imported)} arquivo(s) importado(s)" + (f", {failures} com erro" if failures else ""),
+            state="error" if failures and not imported else "complete",
+            expanded=bool(failures),
+        )
+    
+    # O exame mais recente importado vira o exame atual
+    if imported:
+        patient_info, exam_data = max(
+            imported, key=lambda exam: parse_collection_date(exam[0]["collectionDate"]) or datetime.date.min
+        )
+        st.session_state.patient_info = patient_info
+        st.session_state.current_exam = exam_data
 
 # Função para exibir resultados de exames com estilo
 def display_exam_results(exam_data, show_title=True):
     if show_title:
         st.subheader(f"Relatório de Exames")
     
-    # Hemograma
-    if exam_data['Hemograma']:
-        st.markdown("### Hemograma")
-        cols = st.columns(2)
-        for i, item in enumerate(exam_data['Hemograma']):
-            col = cols[i % 2]
-            with col:
-                if item['isAbnormal']:
-                    st.markdown(f"""
-                    <div style="background-color: rgba(255, 0, 0, 0.1); border-left: 4px solid #EF5350; padding: 10px; border-radius: 5px; margin-bottom: 10px;">
-                        <div style="display: flex; justify-content: space-between;">
-                            <span style="font-weight: 500;">{item['name']}</span>
-                            <span style="font-weight: 700; color: #D32F2F;">{item['value']}</span>
-                        </div>
-                    </div>
-                    """, unsafe_allow_html=True)
-                else:
-                    st.markdown(f"""
-                    <div style="background-color: #F5F5F5; padding: 10px; border-radius: 5px; margin-bottom: 10px;">
-                        <div style="display: flex; justify-content: space-between;">
-                            <span style="font-weight: 500;">{item['name']}</span>
-                            <span>{item['value']}</span>
-                        </div>
-                    </div>
-                    """, unsafe_allow_html=True)
-    
-    # Bioquímica
-    if exam_data['Bioquímica']:
-        st.markdown("### Bioquímica")
-        cols = st.columns(2)
-        for i, item in enumerate(exam_data['Bioquímica']):
-            col = cols[i % 2]
-            with col:
-                if item.get('isCalculated', False):
-                    st.markdown(f"""
-                    <div style="background-color: rgba(33, 150, 243, 0.1); border-left: 4px solid #2196F3; padding: 10px; border-radius: 5px; margin-bottom: 10px;">
-                        <div style="display: flex; justify-content: space-between;">
-                            <span style="font-weight: 500;">{item['name']} <span style="font-size: 0.8em; color: #2196F3;">(calculado)</span></span>
-                            <span style="font-weight: 700; color: {'#D32F2F' if item['isAbnormal'] else '#000'};">{item['value']}</span>
-                        </div>
-                    </div>
-                    """, unsafe_allow_html=True)
-                elif item['isAbnormal']:
-                    st.markdown(f"""
-                    <div style="background-color: rgba(255, 0, 0, 0.1); border-left: 4px solid #EF5350; padding: 10px; border-radius: 5px; margin-bottom: 10px;">
-                        <div style="display: flex; justify-content: space-between;">
-                            <span style="font-weight: 500;">{item['name']}</span>
-                            <span style="font-weight: 700; color: #D32F2F;">{item['value']}</span>
-                        </div>
-                    </div>
-                    """, unsafe_allow_html=True)
-                else:
-                    st.markdown(f"""
-                    <div style="background-color: #F5F5F5; padding: 10px; border-radius: 5px; margin-bottom: 10px;">
-                        <div style="display: flex; justify-content: space-between;">
-                            <span style="font-weight: 500;">{item['name']}</span>
-                            <span>{item['value']}</span>
-                        </div>
-                    </div>
-                    """, unsafe_allow_html=True)
-    
-    # Hormonais
-    if exam_data['Hormonais']:
-        st.markdown("### Hormonais")
-        cols = st.columns(2)
-        for i, item in enumerate(exam_data['Hormonais']):
-            col = cols[i % 2]
-            with col:
-                if item['isAbnormal']:
-                    st.markdown(f"""
-                    <div style="background-color: rgba(255, 0, 0, 0.1); border-left: 4px solid #EF5350; padding: 10px; border-radius: 5px; margin-bottom: 10px;">
-                        <div style="display: flex; justify-content: space-between;">
-                            <span style="font-weight: 500;">{item['name']}</span>
-                            <span style="font-weight: 700; color: #D32F2F;">{item['value']}</span>
-                        </div>
-                    </div>
-                    """, unsafe_allow_html=True)
-                else:
-                    st.markdown(f"""
-                    <div style="background-color: #F5F5F5; padding: 10px; border-radius: 5px; margin-bottom: 10px;">
-                        <div style="display: flex; justify-content: space-between;">
-                            <span style="font-weight: 500;">{item['name']}</span>
-                            <span>{item['value']}</span>
-                        </div>
-                    </div>
-                    """, unsafe_allow_html=True)
-    
-    # Outros
-    if exam_data['Outros']:
-        st.markdown("### Outros Exames")
-        cols = st.columns(2)
-        for i, item in enumerate(exam_data['Outros']):
-            col = cols[i % 2]
-            with col:
-                if item['isAbnormal']:
-                    st.markdown(f"""
-                    <div style="background-color: rgba(255, 0, 0, 0.1); border-left: 4px solid #EF5350; padding: 10px; border-radius: 5px; margin-bottom: 10px;">
-                        <div style="display: flex; justify-content: space-between;">
-                            <span style="font-weight: 500;">{item['name']}</span>
-                            <span style="font-weight: 700; color: #D32F2F;">{item['value']}</span>
-                        </div>
-                    </div>
-                    """, unsafe_allow_html=True)
-                else:
-                    st.markdown(f"""
-                    <div style="background-color: #F5F5F5; padding: 10px; border-radius: 5px; margin-bottom: 10px;">
-                        <div style="display: flex; justify-content: space-between;">
-                            <span style="font-weight: 500;">{item['name']}</span>
-                            <span>{item['value']}</span>
-                        </div>
-                    </div>
-                    """, unsafe_allow_html=True)
-    
-    # Imagem
-    if exam_data['Imagem']:
-        st.markdown("### Exames de Imagem")
-        with st.container():
-            st.markdown("""
-            <div style="background-color: #F5F5F5; padding: 15px; border-radius: 5px;">
-            """, unsafe_allow_html=True)
-            
-            for item in exam_data['Imagem']:
-                st.markdown(f"""
-                <div style="margin-bottom: 8px;">
-                    <span style="font-weight: 500;">{item['name']}:</span>
-                    <span style="margin-left: 8px;">{item['value']}</span>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            st.markdown("</div>", unsafe_allow_html=True)
+    # Um único bloco HTML por laudo
+    with perf.stage("render_exam", items=sum(len(items) for items in exam_data.values())):
+        st.markdown(render_exam_html(exam_data), unsafe_allow_html=True)
 
 # Função para adicionar exames históricos de exemplo
 def load_sample_data():
     # Exame mais recente
-    sample_report_text = """Resultados de Exames para PEP
-Dados do Paciente:
-● Nome: Nicomedes Ferreira Filho
-● Data da Coleta: 17/02/2025
-Resultados:
-● Hemograma:
-○ Hemoglobina: 11,4 g/dL (Referência: 13,0 a 17,0 g/dL)
-○ VCM: 91,0 fL (Referência: 83,0 a 101,0 fL)
-○ HCM: 30,3 pg (Referência: 27,0 a 32,0 pg)
-○ Leucócitos: 5340/µL (Referência: 4000 a 10000/µL)
-○ Segmentados: 56,9% (Referência: 2000,0 a 7000,0)
-○ Eosinófilos: 13,5% (Referência: 20,0 a 500,0)
-○ Linfócitos: 19,3% (Referência: 1000,0 a 3000,0)
-○ Monócitos: 8,4% (Referência: 200,0 a 1000,0)
-○ Basófilos: 1,9% (Referência: 20,0 a 100,0)
-○ Plaquetas: 192.000/µL (Referência: 150 a 400 mil/µL)
-● Ferro Sérico: 98 µg/dL (Referência: Mulheres: 50-170 µg/dL, Homens: 65-175 µg/dL)
-● Capacidade Total de Combinação do Ferro: 259 µg/dL (Referência: 250 a 450 µg/dL)
-● Ferritina: 106 ng/mL (Referência: Homens: 21,81-274,66 ng/mL, Mulheres: 4,63-204,00 ng/mL)
-● Proteínas Totais e Fracionadas:
-○ Proteínas Totais: 6,6 g/dL (Referência: 6,4-8,3 g/dL)
-○ Albumina: 4,2 g/dL (Referência: 3,5-5,0 g/dL)
-○ Globulina: 2,4 g/dL
-○ Relação A/G: 1,8
-● Bilirrubinas:
-○ Total: 0,55 mg/dL (Referência: Adulto: 0,2 a 1,2 mg/dL)
-○ Direta: 0,26 mg/dL (Referência: Adulto: 0,0 a 0,5 mg/dL)
-○ Indireta: 0,29 mg/dL (Referência: Adulto: 0,2 a 0,7 mg/dL)
-● Fosfatase Alcalina: 140 U/L (Referência: 22 a 79 anos, Homens: 50-116 U/L)
-● Ureia: 145,00 mg/dL (Referência: Adultos: 12,8-42,8 mg/dL, Adultos > 60 anos: 17,1-49,2 mg/dL)
-● Creatinina: 3,18 mg/dL (Referência: Adultos: 0,5-1,00 mg/dL, Homem > 60 anos: 0,6-1,20 mg/dL)
-● Cálcio: 8,8 mg/dL (Referência: Adulto: 8,4 a 10,2 mg/dL, Homem > 60 anos: 8,8 a 10,0 mg/dL)
-● Estimativa do Ritmo de Filtração Glomerular: 18 mL/min/1,73m^2 (Referência: Adultos > 18 anos: > 90 mL/min/1,73 m^2)
-● Potássio: 4,50 mmol/L (Referência: 3,5 a 5,1 mmol/L)
-● Cálcio Iônico: 1,11 mEq/L (Referência: 1,16 a 1,32 mEq/L)
-● Fósforo: 4,3 mg/dL (Referência: Adultos: 2,5-4,5 mg/dL)
-● Paratormônio PTH Intacto (Molécula Inteira): 265,1 pg/mL (Referência: 15 a 68,3 pg/mL)
-● Bicarbonato: 16 mEq/L (Referência: 20 a 32 mEq/L)
-● Testosterona Total: 12,49 ng/dL (Referência: Homens > 50 anos: 220,91 a 715,81 ng/dL)
-● PSA Total e Livre:
-○ PSA Livre: 0,14 ng/mL (Referência: 0,0 a 0,5 ng/mL)
-○ PSA Total: 0,54 ng/mL (Referência: 0,0 a 4,0 ng/mL)
-○ Porcentagem de PSA Livre/PSA Total: 26%
-● Testosterona Livre Calculada: 0,15 ng/dL (Referência: Homem de 50 a 89 anos: 1,81 a 10,20 ng/dL)
-2. EXAMES DE IMAGEM:
-Ultrassonografia dos Rins e Vias Urinárias:
-○ Rins: Sinais de nefropatia parenquimatosa crônica bilateral. Pequenos cistos renais simples corticais bilaterais.
-○ Bexiga: Pós-miccional de 66,7 mL. Sinais de bexiga."""
-
-    patient_info, exam_data = process_pdf_text(sample_report_text)
+    patient_info, exam_data = process_pdf_text(SAMPLE_REPORT_TEXT)
     
     st.session_state.patient_info = patient_info
     st.session_state.current_exam = exam_data
@@ -452,7 +257,9 @@ Ultrassonografia dos Rins e Vias Urinárias:
         }
     ]
     
-    st.session_state.exam_history = historical_exams
+    st.session_state.exam_history = HistoryStore.from_exams(historical_exams)
+    st.session_state.metric_catalog.reset_history(st.session_state.exam_history.metric_keys)
+    st.session_state.persisted_patient = None
     
     # Selecionar algumas métricas importantes por padrão
     default_metrics = [
@@ -462,9 +269,10 @@ Ultrassonografia dos Rins e Vias Urinárias:
         {"category": "Bioquímica", "name": "Estimativa do Ritmo de Filtração Glomerular", "unit": "mL/min/1,73m²"}
     ]
     
-    st.session_state.selected_metrics = default_metrics
+    st.session_state.metric_catalog.set_selection(default_metrics)
 
-# Função para exibir o histórico de exames
+# Função para exibir o histórico de exames (fragmento: trocar de página só reexecuta esta aba)
+@st.fragment
 def show_exam_history():
     if not st.session_state.exam_history:
         st.info("Nenhum histórico de exames disponível.")
@@ -472,246 +280,252 @@ def show_exam_history():
     
     st.subheader("Histórico de Exames")
     
-    for i, exam in enumerate(st.session_state.exam_history):
-        with st.expander(f"Exame de {exam['date']}", expanded=(i == 0)):
+    # Paginação: só os exames da página atual são carregados e exibidos
+    total = len(st.session_state.exam_history)
+    page_count = (total + HISTORY_PAGE_SIZE - 1) // HISTORY_PAGE_SIZE
+    page = 1
+    if page_count > 1:
+        page = st.number_input(f"Página (de {page_count})", min_value=1, max_value=page_count, value=1, step=1)
+    offset = (page - 1) * HISTORY_PAGE_SIZE
+    
+    if st.session_state.persisted_patient:
+        exams = get_repository().list_exams(st.session_state.persisted_patient, HISTORY_PAGE_SIZE, offset)
+    else:
+        exams = st.session_state.exam_history.exams[offset:offset + HISTORY_PAGE_SIZE]
+    
+    for i, exam in enumerate(exams):
+        with st.expander(f"Exame de {exam['date']}", expanded=(offset + i == 0)):
             display_exam_results(exam['data'], show_title=False)
 
-# Função para exibir gráficos de tendência
+# Função para exibir gráficos de tendência (fragmento: selecionar métricas,
+# trocar o modo ou o limite de pontos só reexecuta esta aba)
+@st.fragment
 def show_graphs():
     if not st.session_state.exam_history and not st.session_state.current_exam:
         st.info("Nenhum dado disponível para gráficos.")
         return
     
-    st.subheader("Gráficos de Evolução")
+    import pandas as pd
+    from processador.charts import DEFAULT_POINT_BUDGET, cached_trend_figure
     
-    # Preparar lista de métricas disponíveis
-    available_metrics = []
+    st.subheader("Gráficos de Evolução")
     
-    if st.session_state.current_exam:
-        for category in st.session_state.current_exam:
-            for item in st.session_state.current_exam[category]:
-                if item.get('numericValue') is not None:
-                    # Verificar se tem dados históricos
-                    has_history = False
-                    for exam in st.session_state.exam_history:
-                        if category in exam['data']:
-                            for hist_item in exam['data'][category]:
-                                if hist_item['name'] == item['name'] and hist_item.get('numericValue') is not None:
-                                    has_history = True
-                                    break
-                    
-                    if has_history or category == 'Bioquímica':  # Sempre mostrar itens de bioquímica
-                        metric = {
-                            "category": category,
-                            "name": item['name'],
-                            "unit": item.get('unit', '')
-                        }
-                        if metric not in available_metrics:
-                            available_metrics.append(metric)
+    # Lista de métricas disponíveis (mantida pelo catálogo a cada novo exame)
+    catalog = st.session_state.metric_catalog
+    catalog.set_current(st.session_state.current_exam)
+    available_metrics = catalog.available_metrics()
     
     # Interface para selecionar métricas
     st.markdown("### Selecione Parâmetros")
     
-    metric_buttons = []
-    for metric in available_metrics:
-        is_selected = any(m['name'] == metric['name'] and m['category'] == metric['category'] 
-                       for m in st.session_state.selected_metrics)
-        metric_buttons.append({"metric": metric, "selected": is_selected})
-    
     # Organizar botões em linhas
     cols = st.columns(3)
-    for i, button_data in enumerate(metric_buttons):
-        metric = button_data["metric"]
-        is_selected = button_data["selected"]
+    for i, metric in enumerate(available_metrics):
+        is_selected = catalog.is_selected(metric)
         
         col = cols[i % 3]
         with col:
-            if st.button(
+            # Alternar seleção no callback: o fragmento já redesenha com o novo estado
+            st.button(
                 f"{metric['name']}",
                 key=f"metric_{metric['category']}_{metric['name']}",
                 type="primary" if is_selected else "secondary",
-                use_container_width=True
-            ):
-                # Alternar seleção
-                if is_selected:
-                    st.session_state.selected_metrics = [
-                        m for m in st.session_state.selected_metrics 
-                        if not (m['name'] == metric['name'] and m['category'] == metric['category'])
-                    ]
-                else:
-                    st.session_state.selected_metrics.append(metric)
-                
-                # Atualização UI
-                st.rerun()
+                width="stretch",
+                on_click=catalog.toggle,
+                args=(metric,),
+            )
+    
+    # Data do exame atual, convertida uma única vez por renderização
+    current_date_label = st.session_state.patient_info['collectionDate']
+    current_date = pd.Timestamp(parse_collection_date(current_date_label))
     
     # Função para preparar dados para os gráficos
     def prepare_graph_data(metric_name, metric_category):
-        data = []
-        
-        # Dados históricos
-        for exam in st.session_state.exam_history:
-            if metric_category in exam['data']:
-                item = next((item for item in exam['data'][metric_category] if item['name'] == metric_name), None)
-                if item and item.get('numericValue') is not None:
-                    data.append({
-                        "date": exam['date'],
-                        "value": item['numericValue']
-                    })
-        
-        # Dados atuais
+        # Dados históricos (consulta indexada por analito) mais o valor atual
+        current_value = None
         if st.session_state.current_exam and metric_category in st.session_state.current_exam:
             current_item = next((item for item in st.session_state.current_exam[metric_category] 
                              if item['name'] == metric_name), None)
-            if current_item and current_item.get('numericValue') is not None:
-                # Verificar se já existe um ponto com esta data
-                if not any(point['date'] == st.session_state.patient_info['collectionDate'] for point in data):
-                    data.append({
-                        "date": st.session_state.patient_info['collectionDate'],
-                        "value": current_item['numericValue']
-                    })
-        
-        # Ordenar por data
-        data.sort(key=lambda x: datetime.datetime.strptime(x['date'], '%d/%m/%Y'))
+            if current_item:
+                # Na unidade canônica, como os valores do histórico
+                current_value, _unit = normalize_value(
+                    metric_name, current_item.get('numericValue'), current_item.get('unit')
+                )
         
-        return data
+        return st.session_state.exam_history.trend(
+            metric_category, metric_name, current_value, current_date, current_date_label
+        )
     
     # Exibir gráficos para métricas selecionadas
-    if st.session_state.selected_metrics:
-        for metric in st.session_state.selected_metrics:
-            data = prepare_graph_data(metric['name'], metric['category'])
-            
-            if len(data) < 2:
-                st.warning(f"Dados insuficientes para gerar gráfico de {metric['name']} (mínimo 2 pontos).")
-                continue
-            
-            # Criar DataFrame para plotly
-            df = pd.DataFrame(data)
-            
-            # Criar gráfico com plotly
-            fig = px.line(
-                df, 
-                x='date', 
-                y='value', 
-                markers=True,
-                title=f"{metric['name']} ({metric['unit']})",
-                template="simple_white"
-            )
-            
-            fig.update_layout(
-                xaxis_title="Data",
-                yaxis_title=f"Valor ({metric['unit']})",
-                height=400,
-                margin=dict(l=20, r=20, t=40, b=20),
-            )
-            
-            st.plotly_chart(fig, use_container_width=True)
-    else:
-        st.info("Selecione parâmetros acima para visualizar gráficos.")
-# Função para gerar documento Word
-def generate_word_report(patient_info, exam_data):
-    # Criar um novo documento
-    doc = Document()
-    
-    # Configurar estilo do documento
-    style = doc.styles['Normal']
-    style.font.name = 'Arial'
-    style.font.size = Pt(11)
-    
-    # Adicionar cabeçalho
-    header = doc.add_heading('RELATÓRIO DE EXAMES MÉDICOS', level=1)
-    header.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    
-    # Informações do paciente
-    doc.add_paragraph()
-    doc.add_paragraph(f"Paciente: {patient_info['name']}")
-    doc.add_paragraph(f"Data da coleta: {patient_info['collectionDate']}")
-    doc.add_paragraph()
-    
-    # Adicionar linha horizontal
-    doc.add_paragraph().add_run('_' * 80).bold = True
-    
-    # Função para adicionar uma seção de exames
-    def add_exam_section(title, items):
-        if not items:
-            return
-            
-        doc.add_heading(title, level=2)
+    selected_metrics = catalog.selected_metrics()
+    if selected_metrics:
+        chart_mode = st.radio(
+            "Modo de exibição", ["Combinado", "Individual"], horizontal=True, key="chart_mode"
+        )
         
-        # Adicionar tabela
-        table = doc.add_table(rows=1, cols=2)
-        table.style = 'Table Grid'
+        series = []
+        with perf.stage("graph_data", items=len(selected_metrics)):
+            for metric in selected_metrics:
+                df = prepare_graph_data(metric['name'], metric['category'])
+                
+                if len(df) < 2:
+                    st.warning(f"Dados insuficientes para gerar gráfico de {metric['name']} (mínimo 2 pontos).")
+                    continue
+                series.append((metric, df))
         
-        # Cabeçalhos da tabela
-        header_cells = table.rows[0].cells
-        header_cells[0].text = "Exame"
-        header_cells[1].text = "Resultado"
+        if series and chart_mode == "Combinado":
+            point_budget = st.number_input(
+                "Máximo de pontos por série", min_value=50, max_value=5000,
+                value=DEFAULT_POINT_BUDGET, step=50, key="chart_point_budget"
+            )
+            # Um único figure WebGL com painéis por métrica (em cache)
+            with perf.stage("graph_figure", items=len(series)):
+                figure = cached_trend_figure(st.session_state.patient_info['name'], series, int(point_budget))
+                st.plotly_chart(figure, width="stretch")
         
-        # Formatar cabeçalhos
-        for cell in header_cells:
-            cell.paragraphs[0].runs[0].bold = True
-            
-        # Adicionar resultados
-        for item in items:
-            row_cells = table.add_row().cells
-            row_cells[0].text = item['name']
+        if chart_mode == "Individual":
+            import plotly.express as px
             
-            # Adicionar valor com formatação para anormais
-            result_paragraph = row_cells[1].paragraphs[0]
-            result_run = result_paragraph.add_run(item['value'])
-            
-            if item.get('isAbnormal', False):
-                result_run.bold = True
-                result_run.font.color.rgb = RGBColor(192, 0, 0)  # Vermelho
+            for metric, df in series:
+                with perf.stage("graph_figure", items=1):
+                    # Criar gráfico com plotly
+                    fig = px.line(
+                        df, 
+                        x='date', 
+                        y='value', 
+                        markers=True,
+                        title=f"{metric['name']} ({metric['unit']})",
+                        template="simple_white"
+                    )
+                
+                    fig.update_layout(
+                        xaxis_title="Data",
+                        yaxis_title=f"Valor ({metric['unit']})",
+                        height=400,
+                        margin=dict(l=20, r=20, t=40, b=20),
+                    )
+                    fig.update_xaxes(tickformat="%d/%m/%Y")
                 
-            # Adicionar nota se for calculado
-            if item.get('isCalculated', False):
-                calc_run = result_paragraph.add_run(" (calculado)")
-                calc_run.italic = True
-                calc_run.font.size = Pt(9)
-    
-        doc.add_paragraph()
-    
-    # Adicionar cada seção de exames
-    add_exam_section("Hemograma", exam_data['Hemograma'])
-    add_exam_section("Bioquímica", exam_data['Bioquímica'])
-    add_exam_section("Hormonais", exam_data['Hormonais'])
-    add_exam_section("Outros Exames", exam_data['Outros'])
-    
-    # Adicionar exames de imagem
-    if exam_data['Imagem']:
-        doc.add_heading("Exames de Imagem", level=2)
-        for item in exam_data['Imagem']:
-            p = doc.add_paragraph(style='List Bullet')
-            p.add_run(f"{item['name']}: ").bold = True
-            p.add_run(item['value'])
-    
-    # Adicionar rodapé
-    doc.add_paragraph()
-    footer = doc.add_paragraph("Relatório gerado automaticamente pelo Processador de Exames Médicos")
-    footer.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    
-    # Salvar documento em memória
-    docx_stream = io.BytesIO()
-    doc.save(docx_stream)
-    docx_stream.seek(0)
-    
-    return docx_stream
-# Função para gerar PDF para download
-def create_download_link(content, filename):
-    b64 = base64.b64encode(content.encode()).decode()
-    href = f'<a href="data:file/txt;base64,{b64}" download="{filename}">Baixar Relatório</a>'
-    return href
+                    st.plotly_chart(fig, width="stretch")
+    else:
+        st.info("Selecione parâmetros acima para visualizar gráficos.")
+
+COHORT_PAGE_SIZE = 50
+
+# Resumo por paciente de um analito, recalculado só quando o banco muda
+@st.cache_data(max_entries=32, show_spinner=False)
+def load_cohort_summary(analyte, data_version):
+    from processador import cohort
+    with perf.stage("cohort_summary") as stage:
+        summary = cohort.patient_summary(cohort.results_frame(get_repository().cohort_rows(analyte)))
+        stage.items = len(summary)
+    return summary
+
+# Função para exibir a análise de coorte (todos os pacientes salvos)
+def show_cohort():
+    repository = get_repository()
+    analytes = repository.analytes()
+    if not analytes:
+        st.info("Nenhum exame salvo para análise de coorte.")
+        return
+
+    st.subheader("Análise de Coorte")
+
+    patients_by_analyte = dict(analytes)
+    analyte = st.selectbox(
+        "Analito", list(patients_by_analyte), index=None, placeholder="Selecione um analito",
+        format_func=lambda name: f"{name} ({patients_by_analyte[name]} pacientes)", key="cohort_analyte"
+    )
+    if analyte is None:
+        return
+
+    from processador import cohort
+
+    summary = load_cohort_summary(analyte, repository.data_version())
+
+    # Filtros aplicados no servidor; a tabela recebe só a página atual
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        status = st.selectbox("Situação", cohort.STATUSES, index=None, placeholder="Todas", key="cohort_status")
+    with col2:
+        search = st.text_input("Paciente contém", key="cohort_search")
+    with col3:
+        rising_only = st.checkbox("Somente em alta", key="cohort_rising")
+        min_delta = st.number_input("Variação mínima", value=0.0, key="cohort_min_delta") if rising_only else 0.0
+
+    filtered = cohort.filter_summary(summary, status, rising_only, min_delta, search.strip())
+
+    stats, histogram = cohort.distribution(filtered)
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Pacientes", len(filtered))
+    col2.metric("Fora da referência", int(filtered['status'].isin([cohort.STATUS_BELOW, cohort.STATUS_ABOVE]).sum()))
+    col3.metric("Mediana", f"{stats['median']:.4g}" if stats['count'] else "-")
+    col4.metric("P5–P95", f"{stats['p5']:.4g}–{stats['p95']:.4g}" if stats['count'] else "-")
+    if stats['count']:
+        st.bar_chart(histogram, x="faixa", y="pacientes")
+
+    page_frame, page_count = cohort.paginate(filtered, 1, COHORT_PAGE_SIZE)
+    if page_count > 1:
+        page = st.number_input(f"Página (de {page_count})", min_value=1, max_value=page_count, value=1, step=1, key="cohort_page")
+        page_frame, _ = cohort.paginate(filtered, page, COHORT_PAGE_SIZE)
+    st.dataframe(page_frame, hide_index=True, width="stretch")
+
+# Bytes do Word gerados só no clique (em outra thread) e compartilhados entre sessões
+def word_report_download(patient_info, exam_data):
+    def build():
+        with perf.stage("word_export"):
+            return word_report_bytes(patient_info, exam_data)
+    return build
+
+# Botões de exportação do exame atual (fragmento: não reexecutam o app)
+@st.fragment
+def show_export_buttons():
+    patient_info = st.session_state.patient_info
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        report_text = f"RELATÓRIO DE EXAMES\n\nPaciente: {patient_info['name']}\nData: {patient_info['collectionDate']}\n\n"
+        # Código para gerar conteúdo texto do relatório
+        st.download_button("Exportar como Texto", report_text, file_name="relatorio_exame.txt",
+                           mime="text/plain", key="export_text", on_click="ignore")
+            
+    with col2:
+        st.download_button(
+            "Exportar como Word",
+            word_report_download(patient_info, st.session_state.current_exam),
+            file_name=f"relatorio_exame_{patient_info['collectionDate'].replace('/', '-')}.docx",
+            mime=DOCX_MIME, key="export_word", on_click="ignore",
+        )
+
+# "Zerar medições" só desta sessão: guarda os totais atuais como linha de base
+def reset_perf_baseline():
+    st.session_state.perf_baseline = perf.totals()
+
+# Etapas desta execução (desta sessão) marcadas com um id próprio, para o
+# painel não misturar execuções simultâneas de outras sessões
+run_id = uuid.uuid4().hex
+perf.set_context(run_id)
 
 # Interface principal
 with st.sidebar:
     st.header("Opções")
     
     # Upload de arquivo
-    uploaded_file = st.file_uploader("Faça upload do PDF do exame", type=["pdf", "txt"])
+    uploaded_files = st.file_uploader(
+        "Faça upload dos PDFs de exame", type=["pdf", "txt"], accept_multiple_files=True
+    )
     
     # Botão para carregar dados de exemplo
     if st.button("Carregar Dados de Exemplo"):
-        load_sample_data()
+        with perf.stage("sample_load"):
+            load_sample_data()
+    
+    # Pacientes com histórico salvo no banco
+    saved_patients = get_repository().patients()
+    if saved_patients:
+        selected_patient = st.selectbox("Pacientes salvos", saved_patients)
+        if st.button("Carregar Histórico Salvo"):
+            load_persisted_patient(selected_patient)
     
     # Informações do paciente (se disponíveis)
     if st.session_state.patient_info and st.session_state.patient_info["name"]:
@@ -719,76 +533,26 @@ with st.sidebar:
         st.subheader("Dados do Paciente")
         st.markdown(f"**Nome:** {st.session_state.patient_info['name']}")
         st.markdown(f"**Data da Coleta:** {st.session_state.patient_info['collectionDate']}")
+    
+    # Medição por etapa: ligada só pelo ambiente (PROCESSADOR_PERF=1), pois
+    # vale para o processo inteiro; o toggle só mostra o painel desta sessão
+    st.markdown("---")
+    show_perf = st.toggle("Desempenho", key="perf_panel", disabled=not perf.enabled,
+                          help=None if perf.enabled else "Medição desligada: inicie com PROCESSADOR_PERF=1")
+    perf_panel = st.container()
 
-# Processar arquivo enviado
-# Processar arquivo enviado
-if uploaded_file is not None:
-    try:
-        # Verificar tipo de arquivo
-        if uploaded_file.name.endswith('.pdf'):
-            # Processar arquivo PDF
-            import PyPDF2
-            from io import BytesIO
-            
-            pdf_reader = PyPDF2.PdfReader(BytesIO(uploaded_file.getvalue()))
-            text_content = ""
-            for page in pdf_reader.pages:
-                text_content += page.extract_text()
-        else:
-            # Processar arquivo de texto
-            text_content = StringIO(uploaded_file.getvalue().decode("utf-8")).read()
-        
-        patient_info, exam_data = process_pdf_text(text_content)
-        
-        # Atualizar o estado da sessão
-        st.session_state.patient_info = patient_info
-        st.session_state.current_exam = exam_data
-        
-        # Adicionar ao histórico se for um novo exame
-        if patient_info["collectionDate"] and not any(exam["date"] == patient_info["collectionDate"] for exam in st.session_state.exam_history):
-            new_exam = {
-                "date": patient_info["collectionDate"],
-                "patient_info": patient_info,
-                "data": exam_data
-            }
-            
-            # Inserir mantendo ordem cronológica (mais recente primeiro)
-            st.session_state.exam_history = sorted(
-                st.session_state.exam_history + [new_exam],
-                key=lambda x: datetime.datetime.strptime(x["date"], "%d/%m/%Y"),
-                reverse=True
-            )
-        
-        st.success("Arquivo processado com sucesso!")
-        # Remover esta linha: st.rerun()
-        
-    except Exception as e:
-        st.error(f"Erro ao processar o arquivo: {str(e)}")
+# Processar arquivos enviados
+if uploaded_files:
+    ingest_uploaded_files(uploaded_files)
 
 # Criar abas
-tabs = st.tabs(["Exame Atual", "Histórico", "Gráficos"])
+tabs = st.tabs(["Exame Atual", "Histórico", "Gráficos", "Coorte"])
 
 # Aba de Exame Atual
 with tabs[0]:
     if st.session_state.current_exam:
         # Botões para exportação
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            if st.button("Exportar como Texto", key="export_text"):
-                report_text = f"RELATÓRIO DE EXAMES\n\nPaciente: {st.session_state.patient_info['name']}\nData: {st.session_state.patient_info['collectionDate']}\n\n"
-                # Código para gerar conteúdo texto do relatório
-                st.markdown(create_download_link(report_text, "relatorio_exame.txt"), unsafe_allow_html=True)
-                
-        with col2:
-            if st.button("Exportar como Word", key="export_word"):
-                # Gerar documento Word
-                docx_file = generate_word_report(st.session_state.patient_info, st.session_state.current_exam)
-                
-                # Converter para base64 para download
-                b64 = base64.b64encode(docx_file.getvalue()).decode()
-                href = f'<a href="data:application/vnd.openxmlformats-officedocument.wordprocessingml.document;base64,{b64}" download="relatorio_exame_{st.session_state.patient_info["collectionDate"].replace("/", "-")}.docx">Baixar Relatório Word</a>'
-                st.markdown(href, unsafe_allow_html=True)
+        show_export_buttons()
         
         display_exam_results(st.session_state.current_exam)
     else:
@@ -802,6 +566,53 @@ with tabs[1]:
 with tabs[2]:
     show_graphs()
 
+# Aba de Coorte
+with tabs[3]:
+    show_cohort()
+
+# Painel de desempenho (etapas medidas nesta renderização e totais do processo)
+if perf.enabled and show_perf:
+    with perf_panel:
+        with st.expander("Etapas desta execução", expanded=True):
+            stages = perf.recent(context=run_id)
+            if stages:
+                rows = ["| Etapa | Parede (ms) | CPU (ms) | Pico (KiB) | Itens |", "|---|---:|---:|---:|---:|"]
+                for entry in stages:
+                    peak = f"{entry.peak_bytes / 1024:,.0f}" if entry.peak_bytes is not None else "-"
+                    items = entry.items if entry.items is not None else "-"
+                    rows.append(f"| {entry.name} | {entry.wall_s * 1000:,.1f} | {entry.cpu_s * 1000:,.1f} | {peak} | {items} |")
+                st.markdown("\n".join(rows))
+            else:
+                st.caption("Nenhuma etapa medida nesta execução.")
+            if not perf.track_memory:
+                st.caption("Pico de memória: inicie com PROCESSADOR_PERF_MEMORY=1.")
+            cache = st.session_state.parse_cache.stats()
+            st.caption(
+                f"Cache de uploads: {cache['entries']}/{cache['max_entries']} arquivos, "
+                f"{cache['hits']} acertos, {cache['misses']} faltas, {cache['evictions']} descartes."
+            )
+        
+        with st.expander("Totais do processo"):
+            # "Zerar" guarda a linha de base desta sessão; os totais do processo não mudam
+            baseline = st.session_state.get("perf_baseline", {})
+            shown = False
+            for name, totals in sorted(perf.totals().items()):
+                base = baseline.get(name, {})
+                calls = totals["calls"] - base.get("calls", 0)
+                if calls <= 0:
+                    continue
+                wall_ms = (totals["wall_s"] - base.get("wall_s", 0.0)) * 1000
+                items = totals["items"] - base.get("items", 0)
+                st.markdown(f"**{name}**: {calls}× — {wall_ms:,.0f} ms ({wall_ms / calls:,.1f} ms/exec.), {items} itens")
+                shown = True
+            if not shown:
+                st.caption("Nenhuma etapa medida desde que os totais foram zerados.")
+            st.button("Zerar medições", key="perf_reset", on_click=reset_perf_baseline)
+
+# Arquivo para o coletor textfile do Prometheus (PROCESSADOR_PERF_PROM)
+if perf.enabled:
+    perf.write_prometheus()
+
 # Adicionar CSS customizado
 st.markdown("""
 <style>
@@ -0,0 +1,134 @@
+"""Tempo e validação dos motores de extração de PDF.
+
+Para cada motor instalado, extrai cada PDF do corpus, lê o laudo com
+``parse_report_text`` (o núcleo de ``process_pdf_text``) e compara com a
+referência: o texto de origem, nos PDFs sintéticos, ou o resultado do
+PyPDF2, nos PDFs de ``--corpus``. Indica o motor mais rápido que leu todos
+os laudos igual à referência — o valor para ``PROCESSADOR_PDF_BACKEND``.
+
+Uso:
+    python benchmarks/bench_extraction.py [--corpus laudos/] [--synthetic 6]
+        [--repeat 3] [--json resultado.json]
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic import generate_report_pages, write_pdf  # noqa: E402
+
+from processador.extraction import DEFAULT_BACKEND, available_backends, extract_pdf_text  # noqa: E402
+from processador.parsing import parse_report_text  # noqa: E402
+
+
+def build_corpus(corpus_dir, synthetic_count):
+    """``[(nome, bytes do PDF, texto de origem ou None)]``."""
+    corpus = []
+    for index in range(synthetic_count):
+        pages = generate_report_pages(
+            analytes=20 + 20 * index, image_findings=index % 5, pages=1 + 2 * index, seed=index,
+        )
+        corpus.append((f"sintetico_{index:02d}.pdf", write_pdf(pages), "\n".join(pages)))
+    if corpus_dir:
+        for path in sorted(glob.glob(os.path.join(corpus_dir, "**", "*.pdf"), recursive=True)):
+            with open(path, "rb") as handle:
+                corpus.append((os.path.relpath(path, corpus_dir), handle.read(), None))
+    return corpus
+
+
+def _extract(data, backend, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        text = extract_pdf_text(data, workers=1, backend=backend)
+        best = min(best, time.perf_counter() - start)
+    return text, best
+
+
+def reference_results(corpus):
+    """Laudo esperado de cada PDF; arquivos que o motor padrão não abre ficam de fora."""
+    references = {}
+    for name, data, source in corpus:
+        if source is not None:
+            references[name] = parse_report_text(source)
+            continue
+        try:
+            references[name] = parse_report_text(extract_pdf_text(data, workers=1, backend=DEFAULT_BACKEND))
+        except Exception as e:
+            print(f"Ignorado (o motor padrão não lê): {name}: {type(e).__name__}: {e}")
+    return references
+
+
+def run(corpus, backends, repeat):
+    references = reference_results(corpus)
+    corpus = [entry for entry in corpus if entry[0] in references]
+
+    results = {}
+    for backend in backends:
+        total = 0.0
+        mismatches = []
+        errors = []
+        for name, data, _source in corpus:
+            try:
+                text, elapsed = _extract(data, backend, repeat)
+            except Exception as e:
+                errors.append(f"{name}: {type(e).__name__}: {e}")
+                continue
+            total += elapsed
+            if parse_report_text(text) != references[name]:
+                mismatches.append(name)
+        results[backend] = {
+            "seconds": total,
+            "files": len(corpus),
+            "mismatches": mismatches,
+            "errors": errors,
+            "valid": not mismatches and not errors,
+        }
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", help="diretório com PDFs reais (opcional)")
+    parser.add_argument("--synthetic", type=int, default=6, help="quantos PDFs sintéticos gerar")
+    parser.add_argument("--backends", nargs="*", help="motores a testar (padrão: todos os instalados)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", help="grava o resultado neste arquivo")
+    args = parser.parse_args(argv)
+
+    corpus = build_corpus(args.corpus, args.synthetic)
+    if not corpus:
+        print("Corpus vazio")
+        return 1
+    backends = args.backends or available_backends()
+    results = run(corpus, backends, args.repeat)
+
+    baseline = results.get(DEFAULT_BACKEND, {}).get("seconds")
+    files = next(iter(results.values()))["files"] if results else 0
+    print(f"Corpus: {files} PDFs")
+    for backend, result in results.items():
+        speedup = f"{baseline / result['seconds']:5.2f}x" if baseline and result["seconds"] else "    -"
+        state = "ok" if result["valid"] else f"{len(result['mismatches'])} divergentes, {len(result['errors'])} erros"
+        print(f"  {backend:10s} {result['seconds'] * 1000:10.1f} ms  {speedup}  {state}")
+        for name in result["mismatches"][:5]:
+            print(f"      divergente: {name}")
+        for error in result["errors"][:5]:
+            print(f"      erro: {error}")
+
+    valid = [backend for backend, result in results.items() if result["valid"]]
+    recommended = min(valid, key=lambda backend: results[backend]["seconds"]) if valid else None
+    print(f"Recomendado: PROCESSADOR_PDF_BACKEND={recommended}" if recommended else "Nenhum motor válido")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as handle:
+            json.dump({"files": files, "recommended": recommended, "backends": results}, handle, indent=2)
+    return 0 if recommended else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
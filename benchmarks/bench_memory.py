@@ -0,0 +1,80 @@
+"""Memória retida por sessão: histórico com dicts versus ``ResultItem``.
+
+Monta o histórico de uma sessão (``--history`` laudos sintéticos do mesmo
+paciente) de duas formas — com a implementação original, um dict por
+analito, e com o motor atual, que guarda ``ResultItem`` compactos com
+nomes, unidades e referências internalizados — e mede com ``tracemalloc``
+quanto cada uma mantém alocado.
+
+Uso:
+    python benchmarks/bench_memory.py [--history 60] [--analytes 40] [--sessions 20]
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_parser import legacy_process_pdf_text  # noqa: E402
+from synthetic import generate_history  # noqa: E402
+
+from processador.history_store import HistoryStore, make_exam_record  # noqa: E402
+from processador.parsing import parse_report_text  # noqa: E402
+
+
+def legacy_session(reports):
+    exams = []
+    for report in reports:
+        patient_info, exam_data = legacy_process_pdf_text(report)
+        exams.append({"date": patient_info["collectionDate"], "patient_info": patient_info, "data": exam_data})
+    return exams
+
+
+def compact_session(reports):
+    return HistoryStore.from_exams(make_exam_record(*parse_report_text(report)) for report in reports).exams
+
+
+def retained_bytes(build, sessions):
+    """Bytes ainda alocados depois de montar ``len(sessions)`` históricos."""
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    kept = [build(reports) for reports in sessions]
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    item_count = sum(len(items) for exams in kept for exam in exams for items in exam["data"].values())
+    del kept
+    return retained, item_count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--history", type=int, default=60, help="laudos por sessão")
+    parser.add_argument("--analytes", type=int, default=40)
+    parser.add_argument("--sessions", type=int, default=20, help="sessões simultâneas (pacientes diferentes)")
+    args = parser.parse_args(argv)
+
+    sessions = [generate_history(args.history, seed=seed, analytes=args.analytes) for seed in range(args.sessions)]
+
+    # Aquecimento: imports sob demanda (NumPy do eGFR) e caches de referência
+    # não podem entrar na conta
+    for build in (legacy_session, compact_session):
+        build(sessions[0][:2])
+
+    legacy, items = retained_bytes(legacy_session, sessions)
+    compact, compact_items = retained_bytes(compact_session, sessions)
+    assert items == compact_items
+
+    print(f"{args.sessions} sessões x {args.history} laudos x {args.analytes} analitos ({items:,} itens)")
+    for label, total in (("dicts (original)", legacy), ("ResultItem", compact)):
+        print(f"  {label:18s} {total / args.sessions / 1024:10,.0f} KiB/sessão  {total / items:6.0f} B/item")
+    print(f"  redução: {1 - compact / legacy:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,264 @@
+"""Verificação dourada e throughput do motor de leitura de laudos.
+
+Compara ``parse_report_text`` com a implementação original de
+``process_pdf_text`` (mantida aqui como oráculo) em um conjunto de laudos e
+mede a vazão de ambas em linhas por segundo. A leitura de número e unidade
+dos valores mudou de propósito (``processador.values``: "192.000/µL" era
+lido como 192,0); o oráculo é comparado já com essa leitura. O oráculo
+avalia ``isAbnormal`` com o ``is_abnormal`` original; as flags que mudaram
+de propósito estão listadas em ``INTENDED_FLAG_CHANGES``.
+
+Uso:
+    python benchmarks/bench_parser.py [--copies 200] [--repeat 5]
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from processador.clinical import calculate_ckd_epi  # noqa: E402
+from processador.parsing import parse_report_chunks, parse_report_text  # noqa: E402
+from processador.sample_data import SAMPLE_REPORT_TEXT  # noqa: E402
+from processador.values import parse_value_text  # noqa: E402
+
+
+# Implementação original (app.py antes do motor compilado), sem o st.error
+def legacy_is_abnormal(value, reference):
+    if not reference:
+        return False
+    ref_match = re.findall(r'[\d,.]+', reference)
+    if not ref_match or len(ref_match) < 2:
+        return False
+    min_ref = float(ref_match[0].replace(',', '.'))
+    max_ref = float(ref_match[1].replace(',', '.'))
+    val_match = re.search(r'[\d,.]+', str(value))
+    if not val_match:
+        return False
+    val = float(val_match.group().replace(',', '.'))
+    return val < min_ref or val > max_ref
+
+
+def legacy_process_pdf_text(text):
+    categories = {
+        'Hemograma': [],
+        'Bioquímica': [],
+        'Hormonais': [],
+        'Outros': [],
+        'Imagem': []
+    }
+    name_match = re.search(r'Nome:\s*(.*)', text)
+    date_match = re.search(r'Data da Coleta:\s*(.*)', text)
+    patient_info = {
+        "name": name_match.group(1).strip() if name_match else "",
+        "collectionDate": date_match.group(1).strip() if date_match else ""
+    }
+    lines = text.split('\n')
+    current_category = 'Outros'
+    in_image_section = False
+    for line in lines:
+        line = line.strip()
+        if 'EXAMES DE IMAGEM:' in line:
+            in_image_section = True
+            continue
+        if 'Hemograma:' in line:
+            current_category = 'Hemograma'
+            continue
+        elif any(keyword in line for keyword in [
+            'Proteínas Totais', 'Bilirrubinas:', 'Ureia:', 'Creatinina:',
+            'Cálcio:', 'Potássio:', 'Fósforo:', 'Bicarbonato:',
+            'Ferro Sérico:', 'Fosfatase Alcalina:'
+        ]):
+            current_category = 'Bioquímica'
+        elif any(keyword in line for keyword in [
+            'Testosterona', 'PSA', 'Paratormônio'
+        ]):
+            current_category = 'Hormonais'
+        result_match = re.search(r'○\s*(.*?):\s*(.*?)\s*\(Referência:\s*(.*?)\)', line)
+        simple_result_match = re.search(r'●\s*(.*?):\s*(.*?)\s*\(Referência:\s*(.*?)\)', line)
+        if result_match or simple_result_match:
+            match = result_match or simple_result_match
+            name = match.group(1).strip()
+            value = match.group(2).strip()
+            reference = match.group(3).strip()
+            numeric_value = None
+            if value:
+                num_match = re.search(r'[\d,.]+', value)
+                if num_match:
+                    numeric_value = float(num_match.group().replace(',', '.'))
+            unit = re.sub(r'[\d,.\s]+', '', value).strip() if value else ""
+            categories[current_category].append({
+                "name": name,
+                "value": value,
+                "reference": reference,
+                "numericValue": numeric_value,
+                "unit": unit,
+                "isAbnormal": legacy_is_abnormal(value, reference)
+            })
+        elif in_image_section:
+            image_finding_match = re.search(r'○\s*(.*?):\s*(.*)', line)
+            if image_finding_match:
+                categories['Imagem'].append({
+                    "name": image_finding_match.group(1).strip(),
+                    "value": image_finding_match.group(2).strip(),
+                    "isAbnormal": True
+                })
+    has_creatinine = any(item["name"] == "Creatinina" for item in categories['Bioquímica'])
+    has_egfr = any(item["name"] == "Estimativa do Ritmo de Filtração Glomerular" for item in categories['Bioquímica'])
+    if has_creatinine and not has_egfr:
+        creatinine_item = next((item for item in categories['Bioquímica'] if item["name"] == "Creatinina"), None)
+        if creatinine_item:
+            cr_value = float(re.search(r'[\d,.]+', creatinine_item["value"]).group().replace(',', '.'))
+            calculated_egfr = calculate_ckd_epi(cr_value, 65, False, False)
+            categories['Bioquímica'].append({
+                "name": "Estimativa do Ritmo de Filtração Glomerular (CKD-EPI)",
+                "value": f"{calculated_egfr} mL/min/1,73m²",
+                "numericValue": calculated_egfr,
+                "unit": "mL/min/1,73m²",
+                "reference": "> 90 mL/min/1,73m²",
+                "isAbnormal": calculated_egfr < 90,
+                "isCalculated": True
+            })
+    return patient_info, categories
+
+
+def _without_egfr(text):
+    return '\n'.join(
+        line for line in text.split('\n')
+        if 'Estimativa do Ritmo de Filtração Glomerular' not in line
+    )
+
+
+GOLDEN_CASES = {
+    "laudo de exemplo": SAMPLE_REPORT_TEXT,
+    "eGFR calculado": _without_egfr(SAMPLE_REPORT_TEXT),
+    "sem cabeçalho": "○ Hemoglobina: 11,4 g/dL (Referência: 13,0 a 17,0 g/dL)",
+    "marcadores misturados": (
+        "● PSA Total e Livre: ○ PSA Livre: 0,14 ng/mL (Referência: 0,0 a 0,5 ng/mL)\n"
+        "● Ureia: 40 mg/dL (Referência: 12,8-42,8 mg/dL) Testosterona\n"
+        "○ Testosterona Total: 300 ng/dL (Referência: 220,91 a 715,81 ng/dL) Cálcio:\n"
+    ),
+    "imagem com resultados": (
+        "Data da Coleta: 01/02/2024\n"
+        "EXAMES DE IMAGEM:\n"
+        "○ Rins: normais\n"
+        "○ Creatinina: 1,0 mg/dL (Referência: 0,5-1,00 mg/dL)\n"
+        "Texto livre sem marcador\n"
+        "○ Fígado: sem alterações\n"
+    ),
+    "comparadores e milhar": (
+        "Hemograma:\n"
+        "○ Plaquetas: 192.000/µL (Referência: 150 a 400 mil/µL)\n"
+        "○ Leucócitos: 5,3 mil/µL (Referência: 4000 a 10000/µL)\n"
+        "● PSA Total: < 0,05 ng/mL (Referência: 0,0 a 4,0 ng/mL)\n"
+        "● Ritmo de Filtração: > 90 mL/min/1.73 m2 (Referência: > 90 mL/min/1,73m²)\n"
+    ),
+    "referências por rótulo": (
+        "● Creatinina: 1,1 mg/dL (Referência: Adultos: 0,5-1,00 mg/dL, Homem > 60 anos: 0,6-1,20 mg/dL)\n"
+        "● Colesterol Total: 250 mg/dL (Referência: Inferior a 200 mg/dL)\n"
+    ),
+    "valores negativos": (
+        "● Excesso de Bases: -1,5 mEq/L (Referência: -2,0 a +2,0 mEq/L)\n"
+        "● Base Excess: −3,0 mmol/L (Referência: -2 a 2 mmol/L)\n"
+    ),
+    "nome na linha seguinte": "Nome:\n\n  Maria Souza\nData da Coleta: 02/03/2024\n",
+    "vazio": "",
+}
+
+
+# Flags que mudaram de propósito com as referências compiladas
+# (processador.reference_ranges): (caso, analito) -> (original, atual, motivo).
+# Qualquer outra diferença de ``isAbnormal`` é regressão.
+INTENDED_FLAG_CHANGES = {
+    ("laudo de exemplo", "Estimativa do Ritmo de Filtração Glomerular"): (
+        False, True, "\"> 90\" é limite inferior; o original lia a faixa 18 a 90 da idade"),
+    ("comparadores e milhar", "Leucócitos"): (
+        True, False, "\"5,3 mil\" vale 5300; o original lia 5,3"),
+    ("comparadores e milhar", "Ritmo de Filtração"): (
+        True, False, "\"> 90\" contra \"> 90\" é normal; o original lia a faixa 90 a 1,73"),
+    ("referências por rótulo", "Colesterol Total"): (
+        False, True, "\"Inferior a 200\" é limite superior; o original exigia dois números"),
+    ("valores negativos", "Excesso de Bases"): (
+        True, False, "-1,5 está entre -2,0 e +2,0; o original ignorava os sinais"),
+}
+
+
+def _with_intended_flags(label, result):
+    """Aplica ``INTENDED_FLAG_CHANGES`` ao resultado do oráculo, conferindo a flag original."""
+    for items in result[1].values():
+        for item in items:
+            change = INTENDED_FLAG_CHANGES.get((label, item["name"]))
+            if change is None:
+                continue
+            original, current, reason = change
+            if item["isAbnormal"] != original:
+                raise AssertionError(f"{label}/{item['name']}: flag original não é {original} ({reason})")
+            item["isAbnormal"] = current
+    return result
+
+
+def _split(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)] or [""]
+
+
+def _with_value_parsing(result):
+    """Resultado do oráculo com número, unidade e comparador lidos por ``parse_value_text``."""
+    for items in result[1].values():
+        for item in items:
+            if "reference" in item and not item.get("isCalculated"):
+                parsed = parse_value_text(item["value"])
+                item["numericValue"] = parsed.number
+                item["unit"] = parsed.unit
+                if parsed.comparator:
+                    item["comparator"] = parsed.comparator
+    return result
+
+
+def check_golden():
+    failures = []
+    for label, text in GOLDEN_CASES.items():
+        expected = _with_intended_flags(label, _with_value_parsing(legacy_process_pdf_text(text)))
+        if parse_report_text(text) != expected:
+            failures.append(label)
+        # Leitura incremental (páginas cortando linhas ao meio) deve coincidir
+        elif any(parse_report_chunks(_split(text, size)) != expected for size in (1, 7, 64)):
+            failures.append(label + " (incremental)")
+    return failures
+
+
+def _throughput(func, text, repeat):
+    line_count = text.count('\n') + 1
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(text)
+        best = min(best, time.perf_counter() - start)
+    return line_count / best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--copies", type=int, default=200,
+                        help="quantas cópias do laudo de exemplo concatenar")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    failures = check_golden()
+    if failures:
+        print("Divergência com a implementação original: " + ", ".join(failures))
+        return 1
+    print(f"Golden: {len(GOLDEN_CASES)} casos idênticos à implementação original")
+
+    text = "\n".join([SAMPLE_REPORT_TEXT] * args.copies)
+    legacy = _throughput(legacy_process_pdf_text, text, args.repeat)
+    current = _throughput(parse_report_text, text, args.repeat)
+    print(f"original:  {legacy:12,.0f} linhas/s")
+    print(f"compilado: {current:12,.0f} linhas/s ({current / legacy:.2f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
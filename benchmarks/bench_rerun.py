@@ -0,0 +1,148 @@
+"""Latência de rerun do app ao selecionar uma métrica na aba de gráficos.
+
+Carrega um histórico sintético grande na sessão (``--history`` laudos),
+seleciona algumas métricas e mede, com o ``AppTest`` do Streamlit, quanto
+leva cada clique em um botão de métrica:
+
+* ``app``: o script inteiro é reexecutado (o comportamento antes dos
+  fragmentos, quando o clique chamava ``st.rerun()`` e o app rodava duas
+  vezes);
+* ``fragmento``: só o fragmento dos gráficos é reexecutado, como faz o
+  servidor quando o widget está dentro de um ``st.fragment``.
+
+O ``AppTest`` sempre reexecuta o app inteiro; o modo ``fragmento`` envia a
+mesma requisição de rerun que o navegador envia (``fragment_id_queue``).
+Para medir a versão anterior do app, passe o arquivo com ``--script``
+(por exemplo, ``git show <commit>:app.py > /tmp/app_antes.py``).
+
+Uso:
+    python benchmarks/bench_rerun.py [--history 200] [--analytes 60] [--repeat 5]
+        [--script app.py]
+"""
+
+import argparse
+import dataclasses
+import os
+import statistics
+import sys
+import tempfile
+import time
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from synthetic import generate_history  # noqa: E402
+
+from processador.history_store import HistoryStore, make_exam_record  # noqa: E402
+from processador.parsing import parse_report_text  # noqa: E402
+
+SELECTED = [("Bioquímica", "Creatinina"), ("Hemograma", "Hemoglobina"), ("Bioquímica", "Ureia")]
+
+
+def build_history(depth, analytes):
+    exams = [make_exam_record(*parse_report_text(report)) for report in generate_history(depth, analytes=analytes)]
+    return HistoryStore.from_exams(exams), exams[-1]
+
+
+def start_app(script, history, latest):
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(script, default_timeout=120)
+    app.run()
+    state = app.session_state
+    state["exam_history"] = history
+    state["current_exam"] = latest["data"]
+    state["patient_info"] = latest["patient_info"]
+    catalog = state["metric_catalog"]
+    catalog.reset_history(history.metric_keys)
+    catalog.set_current(latest["data"])
+    catalog.set_selection([m for m in catalog.available_metrics() if (m["category"], m["name"]) in SELECTED])
+    app.run()
+    if app.exception:
+        raise RuntimeError(app.exception[0].value)
+    return app
+
+
+def metric_button(app):
+    return next(button for button in app.button if button.key and button.key.startswith("metric_"))
+
+
+def _fragment_ids(app):
+    storage = app._fragment_storage
+    return list(getattr(storage, "_fragments", {}))
+
+
+def fragment_rerun(app, fragment_id):
+    """``app.run()`` como um rerun do fragmento ``fragment_id``."""
+    from streamlit.testing.v1 import local_script_runner
+
+    original = local_script_runner.RerunData
+
+    def scoped(**kwargs):
+        return dataclasses.replace(original(**kwargs), fragment_id_queue=[fragment_id])
+
+    with mock.patch.object(local_script_runner, "RerunData", scoped):
+        return app.run()
+
+
+def graphs_fragment(app):
+    """Id do fragmento que desenha os botões de métrica (ou ``None`` sem fragmentos)."""
+    key = metric_button(app).key
+    for fragment_id in _fragment_ids(app):
+        tree = fragment_rerun(app, fragment_id)
+        found = any(button.key == key for button in tree.button)
+        app.run()
+        if found:
+            return fragment_id
+    return None
+
+
+def measure(app, repeat, fragment_id=None):
+    timings = []
+    for _ in range(repeat):
+        metric_button(app).click()
+        start = time.perf_counter()
+        if fragment_id is None:
+            app.run()
+        else:
+            fragment_rerun(app, fragment_id)
+        timings.append(time.perf_counter() - start)
+        if app.exception:
+            raise RuntimeError(app.exception[0].value)
+        if fragment_id is not None:
+            # Árvore completa de novo para o próximo clique
+            app.run()
+    return timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--history", type=int, default=200, help="laudos no histórico da sessão")
+    parser.add_argument("--analytes", type=int, default=60)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--script", default=os.path.join(ROOT, "app.py"), help="app a medir")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        # Banco vazio e descartável: a medição não toca nos exames salvos
+        os.environ["PROCESSADOR_DB_PATH"] = os.path.join(directory, "exames.sqlite3")
+        history, latest = build_history(args.history, args.analytes)
+        app = start_app(os.path.abspath(args.script), history, latest)
+
+        results = {"app": measure(app, args.repeat)}
+        fragment_id = graphs_fragment(app)
+        if fragment_id is not None:
+            results["fragmento"] = measure(app, args.repeat, fragment_id)
+
+    print(f"{args.script}: {args.history} laudos x {args.analytes} analitos, "
+          f"{len(SELECTED)} métricas selecionadas")
+    for label, timings in results.items():
+        print(f"  {label:10s} mediana {statistics.median(timings) * 1000:8.1f} ms   mín {min(timings) * 1000:8.1f} ms")
+    if fragment_id is None:
+        print("  (sem fragmento nos gráficos: todo clique reexecuta o app)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+"""Carga no serviço HTTP local (``processador.service``), só em localhost.
+
+Sobe o serviço em um subprocesso (porta livre), dispara pedidos
+simultâneos com ``http.client`` (uma conexão keep-alive por cliente) e
+mede vazão e latência de cada rota:
+
+* ``parse-texto`` e ``parse-pdf``: laudos sintéticos, texto e PDF;
+* ``egfr``: um paciente por pedido, e uma coorte inteira em um pedido;
+* ``report``: relatórios Word de laudos diferentes;
+* ``sobrecarga``: um segundo serviço com ``--queue-limit`` pequeno, para
+  confirmar que o excesso recebe 429 em vez de enfileirar.
+
+No fim, mostra quantos pedidos viajaram por tarefa do pool (``/metrics``).
+
+Uso:
+    python benchmarks/bench_service.py [--workers 4] [--clients 16] [--requests 200]
+"""
+
+import argparse
+import http.client
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from synthetic import generate_report, generate_report_pages, write_pdf  # noqa: E402
+
+
+def start_service(*options):
+    """Subprocesso do serviço em uma porta livre; devolve ``(processo, porta)``."""
+    process = subprocess.Popen(
+        [sys.executable, "-m", "processador.service", "--port", "0", *options],
+        cwd=ROOT, stdout=subprocess.PIPE, text=True,
+    )
+    line = process.stdout.readline()
+    match = re.search(r":(\d+) ", line)
+    if not match:
+        process.kill()
+        raise RuntimeError(f"serviço não iniciou: {line!r}")
+    return process, int(match.group(1))
+
+
+def stop_service(process):
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+class Client:
+    """Cliente HTTP mínimo com conexão keep-alive."""
+
+    def __init__(self, port):
+        self.connection = http.client.HTTPConnection("127.0.0.1", port, timeout=120)
+
+    def request(self, method, path, body=None, content_type="application/json"):
+        if isinstance(body, (dict, list)):
+            body = json.dumps(body).encode("utf-8")
+        headers = {"Content-Type": content_type} if body is not None else {}
+        self.connection.request(method, path, body=body, headers=headers)
+        response = self.connection.getresponse()
+        return response.status, response.read()
+
+    def close(self):
+        self.connection.close()
+
+
+def run_load(port, jobs, clients):
+    """Executa ``[(método, rota, corpo, tipo)]`` com ``clients`` conexões; devolve
+    ``(segundos, latências, contagem de status)``."""
+    def worker(chunk):
+        client = Client(port)
+        results = []
+        try:
+            for method, path, body, content_type in chunk:
+                start = time.perf_counter()
+                status, _data = client.request(method, path, body, content_type)
+                results.append((status, time.perf_counter() - start))
+        finally:
+            client.close()
+        return results
+
+    chunks = [jobs[index::clients] for index in range(clients)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        results = [entry for chunk in executor.map(worker, chunks) for entry in chunk]
+    elapsed = time.perf_counter() - start
+    return elapsed, [latency for _status, latency in results], Counter(status for status, _latency in results)
+
+
+def report_line(label, elapsed, latencies, statuses):
+    latencies = sorted(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1] if latencies else 0.0
+    print(f"  {label:14s} {len(latencies) / elapsed:9,.1f} pedidos/s   p50 {statistics.median(latencies) * 1000:7.1f} ms"
+          f"   p95 {p95 * 1000:7.1f} ms   {dict(sorted(statuses.items()))}")
+
+
+def batch_ratio(port):
+    _status, text = Client(port).request("GET", "/metrics")
+    counts = {}
+    for name, kind, value in re.findall(r'processador_service_(batches|batch_items)_total\{kind="(\w+)"\} (\d+)',
+                                        text.decode()):
+        counts[(name, kind)] = int(value)
+    return {
+        kind: counts.get(("batch_items", kind), 0) / counts[("batches", kind)]
+        for name, kind in counts if name == "batches" and counts[("batches", kind)]
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=min(4, os.cpu_count() or 1))
+    parser.add_argument("--clients", type=int, default=16, help="conexões simultâneas")
+    parser.add_argument("--requests", type=int, default=200, help="pedidos por rota")
+    parser.add_argument("--analytes", type=int, default=40)
+    args = parser.parse_args(argv)
+
+    texts = [generate_report(analytes=args.analytes, seed=seed).encode("utf-8") for seed in range(args.requests)]
+    pdfs = [write_pdf(generate_report_pages(analytes=args.analytes, seed=seed)) for seed in range(args.requests // 4)]
+    cohort = {"creatinine": [0.6 + (index % 40) / 10 for index in range(10000)],
+              "age": [30 + index % 60 for index in range(10000)],
+              "sex": ["F" if index % 2 else "M" for index in range(10000)]}
+
+    process, port = start_service("--workers", str(args.workers))
+    try:
+        # Aquecimento: imports e primeiros processos do pool
+        run_load(port, [("POST", "/parse", texts[0], "text/plain")] * args.workers * 2, args.workers)
+        run_load(port, [("POST", "/report", {"text": texts[0].decode()}, "application/json")], 1)
+
+        scenarios = [
+            ("parse-texto", [("POST", "/parse", text, "text/plain") for text in texts]),
+            ("parse-pdf", [("POST", "/parse", pdf, "application/pdf") for pdf in pdfs]),
+            ("egfr", [("POST", "/egfr", {"creatinine": 0.5 + index / 100, "age": 60, "sex": "M"}, "application/json")
+                      for index in range(args.requests)]),
+            ("egfr-coorte", [("POST", "/egfr", cohort, "application/json")] * 4),
+            ("report", [("POST", "/report", {"text": text.decode()}, "application/json")
+                        for text in texts[1:1 + args.requests // 4]]),
+        ]
+        print(f"serviço com {args.workers} processos, {args.clients} clientes simultâneos")
+        for label, jobs in scenarios:
+            report_line(label, *run_load(port, jobs, args.clients))
+        print(f"  pedidos por tarefa do pool: "
+              + ", ".join(f"{kind} {ratio:.1f}" for kind, ratio in batch_ratio(port).items()))
+    finally:
+        stop_service(process)
+
+    # Sobrecarga: fila curta e o dobro de clientes
+    process, port = start_service("--workers", "1", "--queue-limit", "4", "--max-batch", "2")
+    try:
+        jobs = [("POST", "/parse", text, "text/plain") for text in texts]
+        elapsed, latencies, statuses = run_load(port, jobs, args.clients * 2)
+        report_line("sobrecarga", elapsed, latencies, statuses)
+        if not statuses.get(429):
+            print("  (nenhum 429: aumente --clients ou --requests)")
+    finally:
+        stop_service(process)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
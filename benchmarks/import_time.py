@@ -0,0 +1,103 @@
+"""Orçamento de tempo de importação na partida do app.
+
+Lê os imports de nível de módulo de ``app.py``, importa todos em um
+processo novo com ``python -X importtime`` e compara o total com o
+orçamento em ``benchmarks/import_budget.json``. Também falha se algum
+módulo pesado, que deveria ser carregado sob demanda, entrar na partida.
+
+Uso:
+    python benchmarks/import_time.py [--runs 5] [--top 15]
+"""
+
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT, "app.py")
+BUDGET_PATH = os.path.join(ROOT, "benchmarks", "import_budget.json")
+
+
+def startup_imports(path=APP_PATH):
+    """Módulos importados no nível de módulo do script (fora de funções)."""
+    with open(path, encoding="utf-8") as handle:
+        tree = ast.parse(handle.read())
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            modules.append(node.module)
+    return list(dict.fromkeys(modules))
+
+
+def measure(modules):
+    """Executa os imports em um processo novo; devolve ``{módulo: µs cumulativos}``
+    para os módulos de topo e o conjunto de todos os módulos carregados."""
+    code = "; ".join(f"import {module}" for module in modules)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    cumulative = {}
+    loaded = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, _, rest = line.partition(":")
+        _self_us, cumulative_us, name = (part for part in rest.split("|"))
+        depth = len(name) - len(name.lstrip())
+        name = name.strip()
+        loaded.add(name)
+        if depth == 1:
+            cumulative[name] = cumulative.get(name, 0) + int(cumulative_us)
+    return cumulative, loaded
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="execuções (vale a mediana)")
+    parser.add_argument("--top", type=int, default=15, help="quantos módulos listar")
+    parser.add_argument("--json", help="grava o resultado neste arquivo")
+    args = parser.parse_args(argv)
+
+    with open(BUDGET_PATH, encoding="utf-8") as handle:
+        budget = json.load(handle)
+
+    modules = startup_imports()
+    totals = []
+    for _ in range(args.runs):
+        cumulative, loaded = measure(modules)
+        totals.append((sum(cumulative.values()), cumulative))
+    totals.sort(key=lambda total: total[0])
+    total_us, cumulative = totals[len(totals) // 2]
+
+    print(f"Imports de partida: {', '.join(modules)}")
+    for name, micros in sorted(cumulative.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {micros / 1000:8.1f} ms  {name}")
+
+    total_ms = total_us / 1000
+    budget_ms = budget["startup_budget_ms"]
+    print(f"Total (mediana de {args.runs}): {total_ms:.1f} ms — orçamento {budget_ms} ms")
+
+    leaked = sorted(
+        module for module in budget["lazy_modules"]
+        if module in loaded
+    )
+    if leaked:
+        print("Módulos que deveriam ser importados sob demanda: " + ", ".join(leaked))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as handle:
+            json.dump({"total_ms": total_ms, "budget_ms": budget_ms, "leaked": leaked,
+                       "modules": {name: micros / 1000 for name, micros in cumulative.items()}},
+                      handle, indent=2)
+
+    return 1 if leaked or total_ms > budget_ms else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+"""Suíte de benchmarks do pipeline sobre laudos sintéticos.
+
+Cobre leitura do laudo (``parse_report_text``, o núcleo de
+``process_pdf_text``), leitura colunar dos valores (``parse_values``),
+``is_abnormal``, ``calculate_ckd_epi`` (e a versão vetorizada),
+``generate_word_report``, preparação das séries dos gráficos e extração
+de texto de PDF. O resultado vai para um JSON com o commit e o
+ambiente; ``--compare`` confronta com uma execução anterior e falha se
+algum caso ficou mais lento que a tolerância.
+
+Uso:
+    python benchmarks/run_suite.py [--analytes 60] [--pages 8] [--history 24]
+        [--repeat 5] [-o resultado.json] [--compare base.json --tolerance 0.15]
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from synthetic import generate_history, generate_report_pages, write_pdf  # noqa: E402
+
+from processador.clinical import calculate_ckd_epi, is_abnormal  # noqa: E402
+from processador.egfr import compute_egfr  # noqa: E402
+from processador.export import generate_word_report  # noqa: E402
+from processador.extraction import extract_pdf_text  # noqa: E402
+from processador.history_store import HistoryStore, make_exam_record, parse_collection_date  # noqa: E402
+from processador.parsing import parse_report_text  # noqa: E402
+from processador.values import parse_value_text, parse_values  # noqa: E402
+
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+GRAPH_METRICS = [("Hemograma", "Hemoglobina"), ("Bioquímica", "Creatinina"),
+                 ("Bioquímica", "Ureia"), ("Bioquímica", "Potássio"), ("Hemograma", "Plaquetas")]
+
+
+def _git_commit():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT,
+                                    capture_output=True, text=True, check=True).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+    return commit, dirty
+
+
+def build_cases(args):
+    """``{nome: (função, unidades por chamada, unidade)}`` para os dados gerados."""
+    pages = generate_report_pages(args.analytes, args.images, args.pages, seed=1)
+    text = "\n".join(pages)
+    pdf = write_pdf(pages)
+    patient_info, exam_data = parse_report_text(text)
+    if parse_report_text(extract_pdf_text(pdf)) != (patient_info, exam_data):
+        raise SystemExit("O texto extraído do PDF sintético não reproduz o laudo gerado")
+    pairs = [(item["value"], item["reference"])
+             for items in exam_data.values() for item in items if item.get("reference")]
+
+    creatinine = [0.4 + (index % 500) / 100 for index in range(args.cohort)]
+    ages = [18 + index % 80 for index in range(args.cohort)]
+    sexes = [index % 2 == 0 for index in range(args.cohort)]
+
+    history = [make_exam_record(*parse_report_text(report))
+               for report in generate_history(args.history, seed=1, analytes=args.analytes)[:-1]]
+    values = [item["value"] for exam in history for items in exam["data"].values() for item in items]
+    for value, number, comparator, unit in zip(values, *parse_values(values)):
+        # NaN != NaN: sem número, a coluna tem NaN e o valor isolado, None
+        if parse_value_text(value) != (number if number == number else None, comparator, unit):
+            raise SystemExit(f"parse_values diverge de parse_value_text em {value!r}")
+
+    current_label = patient_info["collectionDate"]
+    current_date = parse_collection_date(current_label)
+    warm_store = HistoryStore.from_exams(history)
+    warm_store.frame  # noqa: B018 (consolida a tabela antes de medir)
+
+    def graph_series(store):
+        for category, name in GRAPH_METRICS:
+            current = next((item for item in exam_data.get(category, []) if item["name"] == name), None)
+            store.trend(category, name, current and current.get("numericValue"), current_date, current_label)
+
+    return {
+        "parse_report_text": (lambda: parse_report_text(text), text.count("\n") + 1, "linhas"),
+        "is_abnormal": (lambda: [is_abnormal(value, reference) for value, reference in pairs], len(pairs), "chamadas"),
+        "calculate_ckd_epi": (
+            lambda: [calculate_ckd_epi(cr, age, female) for cr, age, female in zip(creatinine, ages, sexes)],
+            args.cohort, "pacientes"),
+        "compute_egfr": (lambda: compute_egfr(creatinine, ages, sexes), args.cohort, "pacientes"),
+        "generate_word_report": (lambda: generate_word_report(patient_info, exam_data), 1, "documentos"),
+        "parse_values": (lambda: parse_values(values), len(values), "valores"),
+        "graph_prep_cold": (lambda: graph_series(HistoryStore.from_exams(history)), len(GRAPH_METRICS), "séries"),
+        "graph_prep_warm": (lambda: graph_series(warm_store), len(GRAPH_METRICS), "séries"),
+        "pdf_extraction": (lambda: extract_pdf_text(pdf), len(pages), "páginas"),
+    }
+
+
+def measure(func, repeat, min_sample_s=0.05):
+    """Tempos por chamada; casos rápidos são repetidos em laço até cada
+    amostra durar ``min_sample_s``, como o ``timeit``."""
+    func()  # aquecimento (imports sob demanda, caches de referência)
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_sample_s:
+            break
+        number *= 2 if elapsed else 10
+
+    timings = [elapsed / number]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - start) / number)
+    return timings, number
+
+
+def compare(results, baseline, tolerance):
+    """Imprime a razão dos melhores tempos (menos sensíveis a ruído da
+    máquina que a mediana) e devolve os casos que regrediram."""
+    regressions = []
+    for name, current in results["benchmarks"].items():
+        previous = baseline.get("benchmarks", {}).get(name)
+        if not previous:
+            continue
+        ratio = current["min_s"] / previous["min_s"]
+        marker = ""
+        if ratio > 1 + tolerance:
+            regressions.append(name)
+            marker = "  <- regressão"
+        print(f"  {name:22s} {ratio:6.2f}x{marker}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--analytes", type=int, default=60)
+    parser.add_argument("--images", type=int, default=4)
+    parser.add_argument("--pages", type=int, default=8)
+    parser.add_argument("--history", type=int, default=24, help="exames no histórico")
+    parser.add_argument("--cohort", type=int, default=20000, help="pacientes no cálculo de eGFR")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", nargs="*", help="executa só estes casos")
+    parser.add_argument("-o", "--output", help="arquivo JSON (padrão: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", help="JSON de uma execução anterior")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="regressão aceitável no melhor tempo")
+    args = parser.parse_args(argv)
+
+    commit, dirty = _git_commit()
+    results = {
+        "commit": commit,
+        "dirty": dirty,
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": {key: value for key, value in vars(args).items()
+                       if key not in ("output", "compare", "tolerance", "only")},
+        "benchmarks": {},
+    }
+
+    for name, (func, units, unit) in build_cases(args).items():
+        if args.only and name not in args.only:
+            continue
+        timings, number = measure(func, args.repeat)
+        median = statistics.median(timings)
+        results["benchmarks"][name] = {
+            "min_s": min(timings),
+            "median_s": median,
+            "mean_s": statistics.fmean(timings),
+            "repeat": args.repeat,
+            "number": number,
+            "units": units,
+            "unit": unit,
+            "throughput": units / median,
+        }
+        print(f"{name:22s} {median * 1000:10.2f} ms  {units / median:14,.0f} {unit}/s")
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{(commit or 'local')[:12]}{'-dirty' if dirty else ''}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as handle:
+        json.dump(results, handle, indent=2, ensure_ascii=False)
+    print(f"Resultado gravado em {output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as handle:
+            baseline = json.load(handle)
+        print(f"Comparação com {baseline.get('commit') or args.compare} (melhor tempo atual / anterior):")
+        if compare(results, baseline, args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
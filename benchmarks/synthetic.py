@@ -0,0 +1,240 @@
+"""Gerador de laudos sintéticos no formato ●/○ dos laudos reais.
+
+Produz texto (e PDF) de tamanho configurável — número de analitos, achados
+de imagem, páginas e profundidade de histórico — de forma determinística a
+partir de uma semente. Os valores são sorteados em torno das faixas de
+referência, com uma fração fora delas.
+
+Uso:
+    python benchmarks/synthetic.py --analytes 60 --pages 3 -o laudo.pdf
+"""
+
+import argparse
+import datetime
+import random
+import zlib
+
+# (grupo, nome, unidade, mínimo, máximo, casas decimais, texto da referência)
+# Grupos com cabeçalho "● Grupo:" viram itens "○"; grupo None gera "●".
+ANALYTES = [
+    ("Hemograma", "Hemoglobina", "g/dL", 13.0, 17.0, 1, "13,0 a 17,0 g/dL"),
+    ("Hemograma", "VCM", "fL", 83.0, 101.0, 1, "83,0 a 101,0 fL"),
+    ("Hemograma", "HCM", "pg", 27.0, 32.0, 1, "27,0 a 32,0 pg"),
+    ("Hemograma", "Leucócitos", "/µL", 4000, 10000, 0, "4000 a 10000/µL"),
+    ("Hemograma", "Plaquetas", "/µL", 150000, 400000, 0, "150 a 400 mil/µL"),
+    (None, "Ferro Sérico", "µg/dL", 65, 175, 0, "Mulheres: 50-170 µg/dL, Homens: 65-175 µg/dL"),
+    (None, "Ferritina", "ng/mL", 21.81, 274.66, 0, "Homens: 21,81-274,66 ng/mL, Mulheres: 4,63-204,00 ng/mL"),
+    ("Proteínas Totais e Fracionadas", "Proteínas Totais", "g/dL", 6.4, 8.3, 1, "6,4-8,3 g/dL"),
+    ("Proteínas Totais e Fracionadas", "Albumina", "g/dL", 3.5, 5.0, 1, "3,5-5,0 g/dL"),
+    ("Bilirrubinas", "Total", "mg/dL", 0.2, 1.2, 2, "Adulto: 0,2 a 1,2 mg/dL"),
+    ("Bilirrubinas", "Direta", "mg/dL", 0.0, 0.5, 2, "Adulto: 0,0 a 0,5 mg/dL"),
+    (None, "Fosfatase Alcalina", "U/L", 50, 116, 0, "22 a 79 anos, Homens: 50-116 U/L"),
+    (None, "Ureia", "mg/dL", 12.8, 42.8, 2, "Adultos: 12,8-42,8 mg/dL, Adultos > 60 anos: 17,1-49,2 mg/dL"),
+    (None, "Creatinina", "mg/dL", 0.5, 1.2, 2, "Adultos: 0,5-1,00 mg/dL, Homem > 60 anos: 0,6-1,20 mg/dL"),
+    (None, "Cálcio", "mg/dL", 8.4, 10.2, 1, "Adulto: 8,4 a 10,2 mg/dL, Homem > 60 anos: 8,8 a 10,0 mg/dL"),
+    (None, "Potássio", "mmol/L", 3.5, 5.1, 2, "3,5 a 5,1 mmol/L"),
+    (None, "Fósforo", "mg/dL", 2.5, 4.5, 1, "Adultos: 2,5-4,5 mg/dL"),
+    (None, "Bicarbonato", "mEq/L", 20, 32, 0, "20 a 32 mEq/L"),
+    (None, "Paratormônio PTH Intacto", "pg/mL", 15, 68.3, 1, "15 a 68,3 pg/mL"),
+    (None, "Testosterona Total", "ng/dL", 220.91, 715.81, 2, "Homens > 50 anos: 220,91 a 715,81 ng/dL"),
+    ("PSA Total e Livre", "PSA Livre", "ng/mL", 0.0, 0.5, 2, "0,0 a 0,5 ng/mL"),
+    ("PSA Total e Livre", "PSA Total", "ng/mL", 0.0, 4.0, 2, "0,0 a 4,0 ng/mL"),
+]
+
+IMAGE_FINDINGS = [
+    ("Rins", "Sinais de nefropatia parenquimatosa crônica bilateral."),
+    ("Bexiga", "Pós-miccional de 66,7 mL. Sinais de bexiga de esforço."),
+    ("Fígado", "Dimensões normais, contornos regulares, ecotextura homogênea."),
+    ("Vesícula Biliar", "Normodistendida, paredes finas, sem cálculos."),
+    ("Baço", "Homogêneo, dimensões preservadas."),
+    ("Próstata", "Volume estimado de 32 cm³, contornos regulares."),
+]
+
+FIRST_NAMES = ["Nicomedes", "Maria", "José", "Ana", "Antônio", "Francisca", "João", "Conceição"]
+LAST_NAMES = ["Ferreira", "Souza", "Silva", "Oliveira", "Araújo", "Gonçalves", "Lima", "Barbosa"]
+
+
+def _format_number(value, decimals):
+    if decimals == 0:
+        value = int(round(value))
+        # Contagens grandes vêm com separador de milhar ("192.000/µL")
+        return f"{value:,}".replace(",", ".") if value >= 100000 else str(value)
+    return f"{value:.{decimals}f}".replace(".", ",")
+
+
+def _analyte_specs(count):
+    """``count`` analitos: o catálogo base e, além dele, analitos genéricos em "Outros"."""
+    specs = list(ANALYTES[:count])
+    for index in range(count - len(specs)):
+        specs.append((None, f"Marcador Sintético {index + 1:03d}", "U/L", 10, 40, 1, "10 a 40 U/L"))
+    return specs
+
+
+def _value_line(spec, rng, abnormal_rate, nested):
+    _group, name, unit, low, high, decimals, reference = spec
+    span = (high - low) or 1.0
+    if rng.random() < abnormal_rate:
+        value = rng.choice([low - rng.uniform(0.05, 0.4) * span, high + rng.uniform(0.05, 0.6) * span])
+    else:
+        value = rng.uniform(low, high)
+    value = max(value, 0.01 if decimals else 1)
+    separator = "" if unit.startswith("/") else " "
+    marker = "○" if nested else "●"
+    return f"{marker} {name}: {_format_number(value, decimals)}{separator}{unit} (Referência: {reference})"
+
+
+def patient_name(index):
+    rng = random.Random(index)
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {rng.choice(LAST_NAMES)} {index:04d}"
+
+
+def generate_report_pages(analytes=len(ANALYTES), image_findings=2, pages=1, seed=0,
+                          patient=None, collection_date=None, abnormal_rate=0.2):
+    """Laudo sintético dividido em ``pages`` páginas de texto.
+
+    As linhas de resultado são distribuídas pelas páginas; cabeçalhos de
+    grupo podem ficar no fim de uma página e os itens na seguinte, como
+    acontece nos PDFs reais.
+    """
+    rng = random.Random(seed)
+    collection_date = collection_date or datetime.date(2025, 2, 17)
+    lines = [
+        "Resultados de Exames para PEP",
+        "Dados do Paciente:",
+        f"● Nome: {patient or patient_name(seed)}",
+        f"● Data da Coleta: {collection_date.strftime('%d/%m/%Y')}",
+        "● Idade: 67 anos",
+        "● Sexo: Masculino",
+        "Resultados:",
+    ]
+    current_group = None
+    for spec in _analyte_specs(analytes):
+        group = spec[0]
+        if group and group != current_group:
+            lines.append(f"● {group}:")
+        current_group = group
+        lines.append(_value_line(spec, rng, abnormal_rate, nested=group is not None))
+
+    if image_findings:
+        lines.append("2. EXAMES DE IMAGEM:")
+        lines.append("Ultrassonografia de Abdome Total:")
+        for index in range(image_findings):
+            organ, finding = IMAGE_FINDINGS[index % len(IMAGE_FINDINGS)]
+            if index >= len(IMAGE_FINDINGS):
+                organ = f"{organ} ({index // len(IMAGE_FINDINGS) + 1})"
+            lines.append(f"○ {organ}: {finding}")
+
+    pages = max(1, min(pages, len(lines)))
+    per_page = -(-len(lines) // pages)
+    return ["\n".join(lines[start:start + per_page]) for start in range(0, len(lines), per_page)]
+
+
+def generate_report(**options):
+    """Laudo sintético como texto único (ver ``generate_report_pages``)."""
+    return "\n".join(generate_report_pages(**options))
+
+
+def generate_history(depth, interval_days=30, seed=0, patient=None, last_date=None, **options):
+    """``depth`` laudos do mesmo paciente, do mais antigo ao mais recente."""
+    patient = patient or patient_name(seed)
+    last_date = last_date or datetime.date(2025, 2, 17)
+    return [
+        generate_report(
+            seed=seed * 1000 + index, patient=patient,
+            collection_date=last_date - datetime.timedelta(days=interval_days * (depth - 1 - index)),
+            **options,
+        )
+        for index in range(depth)
+    ]
+
+
+def write_pdf(pages):
+    """PDF mínimo com uma página por texto, extraível pelo PyPDF2.
+
+    Caracteres fora do ASCII (acentos, ●, ○, µ) recebem códigos de um byte
+    a partir de 0x80, com um CMap ``ToUnicode`` para a extração; a aparência
+    desses glifos na tela não importa aqui.
+    """
+    codes = {}
+    for text in pages:
+        for char in text:
+            if ord(char) > 126 and char not in codes:
+                codes[char] = 0x80 + len(codes)
+    if len(codes) > 128:
+        raise ValueError("caracteres não ASCII demais para uma fonte de um byte")
+
+    cmap_entries = "\n".join(f"<{code:02X}> <{ord(char):04X}>" for char, code in codes.items())
+    cmap = (
+        "/CIDInit /ProcSet findresource begin 12 dict begin begincmap\n"
+        "/CMapName /Synthetic def /CMapType 2 def\n"
+        "1 begincodespacerange <00> <FF> endcodespacerange\n"
+        "1 beginbfrange <20> <7E> <0020> endbfrange\n"
+        f"{len(codes)} beginbfchar\n{cmap_entries}\nendbfchar\n"
+        "endcmap CMapName currentdict /CMap defineresource pop end end"
+    ).encode("ascii")
+
+    def encode(line):
+        raw = bytes(codes[char] if char in codes else ord(char) for char in line)
+        return raw.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+
+    objects = []
+
+    def add(body):
+        objects.append(body)
+        return len(objects)
+
+    catalog = add(None)
+    page_tree = add(None)
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /ToUnicode %d 0 R >>" % (len(objects) + 2))
+    cmap_stream = zlib.compress(cmap)
+    add(b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(cmap_stream) + cmap_stream + b"\nendstream")
+
+    page_ids = []
+    for text in pages:
+        content = b"BT /F1 9 Tf 11 TL 40 800 Td\n" + b"".join(
+            b"(" + encode(line) + b") Tj T*\n" for line in text.split("\n")
+        ) + b"ET"
+        content = zlib.compress(content)
+        stream = add(b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(content) + content + b"\nendstream")
+        page_ids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>" % (page_tree, font, stream)
+        ))
+
+    objects[catalog - 1] = b"<< /Type /Catalog /Pages %d 0 R >>" % page_tree
+    kids = b" ".join(b"%d 0 R" % page_id for page_id in page_ids)
+    objects[page_tree - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    output += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    output += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, catalog, xref)
+    return bytes(output)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--analytes", type=int, default=len(ANALYTES))
+    parser.add_argument("--images", type=int, default=2, help="achados de imagem")
+    parser.add_argument("--pages", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", required=True, help="arquivo .txt ou .pdf")
+    args = parser.parse_args(argv)
+
+    pages = generate_report_pages(args.analytes, args.images, args.pages, args.seed)
+    if args.output.endswith(".pdf"):
+        with open(args.output, "wb") as handle:
+            handle.write(write_pdf(pages))
+    else:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write("\n".join(pages))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1 @@
+"""Núcleo do Processador de Exames Médicos, independente do Streamlit."""
@@ -0,0 +1,190 @@
+"""Catálogo de analitos: nomes, sinônimos, categoria e unidade canônica.
+
+O catálogo vem de ``data/analytes.json`` (e, opcionalmente, de arquivos
+extras em ``PROCESSADOR_ANALYTE_CATALOG``, separados por ``os.pathsep``,
+que acrescentam ou substituem entradas pelo nome) e é carregado uma única
+vez, na importação. Cada entrada de ``analytes`` tem:
+
+* ``name`` e ``category``;
+* ``unit``, ``molar_mass`` e ``valence``: unidade canônica e dados da
+  conversão molar (ver ``processador.units``);
+* ``synonyms``: outras grafias do nome, usadas por ``canonical_name``;
+* ``keywords``: trechos que, aparecendo numa linha do laudo, ativam a
+  categoria (``"Ureia:"``, ``"Testosterona"``).
+
+``panels`` traz cabeçalhos de grupo (``"Bilirrubinas:"``) só com
+``category`` e ``keywords``. ``priority`` decide a categoria quando uma
+linha cita palavras-chave de mais de uma.
+
+As comparações ignoram acentos (``"Uréia:"`` casa com ``"Ureia:"``); as
+palavras-chave continuam sensíveis a maiúsculas, para que ``"PSA"`` não
+case dentro de outras palavras. Todas as palavras-chave são compiladas numa
+única expressão regular em forma de trie, com cada letra trocada pela classe
+de suas variantes acentuadas; a classificação de uma linha é uma só busca,
+sem normalizar a linha.
+"""
+
+import json
+import os
+import re
+import unicodedata
+from collections import namedtuple
+
+CATALOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "analytes.json")
+CATALOG_ENV = "PROCESSADOR_ANALYTE_CATALOG"
+
+# Categorias que o leitor de laudos conhece, na ordem de exibição
+CATEGORIES = ("Hemograma", "Bioquímica", "Hormonais", "Outros", "Imagem")
+
+AnalyteEntry = namedtuple(
+    "AnalyteEntry", ["name", "category", "unit", "molar_mass", "valence", "synonyms", "keywords"]
+)
+
+
+# Letras acentuadas do português -> letra base (um caractere por um)
+_ACCENTED = "áàâãéêíóôõúüçÁÀÂÃÉÊÍÓÔÕÚÜÇ"
+_ACCENTS = str.maketrans(_ACCENTED, unicodedata.normalize("NFD", _ACCENTED).encode("ascii", "ignore").decode())
+
+# Letra base -> ela e suas variantes acentuadas ("e" -> "eéê")
+_VARIANTS = {}
+for _accented, _base in zip(_ACCENTED, _ACCENTED.translate(_ACCENTS)):
+    _VARIANTS[_base] = _VARIANTS.get(_base, _base) + _accented
+
+
+def fold_accents(text):
+    return text.translate(_ACCENTS)
+
+
+def _name_key(name):
+    return " ".join(fold_accents(name).casefold().split())
+
+
+def trie_pattern(words, variants=None):
+    """Expressão regular equivalente a ``a|b|c...`` com prefixos comuns fatorados.
+
+    Em cada posição vence a palavra mais longa, como numa alternância
+    ordenada por tamanho, mas o motor testa um ramo por caractere.
+    ``variants`` lista os caracteres aceitos no lugar de cada um
+    (``{"e": "eéê"}``).
+    """
+    variants = variants or {}
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    # Na raiz, um ramo literal por variante (e não uma classe): assim o re
+    # conhece os primeiros caracteres possíveis e pula direto para eles
+    return "|".join(
+        re.escape(variant) + _node_pattern(child, variants)
+        for char, child in sorted(trie.items())
+        for variant in variants.get(char, char)
+    )
+
+
+def _node_pattern(node, variants):
+    branches = [
+        _char_pattern(char, variants) + _node_pattern(child, variants)
+        for char, child in sorted(node.items()) if char
+    ]
+    if not branches:
+        return ""
+    pattern = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+    if "" in node:
+        # Uma palavra termina aqui: o restante é opcional (guloso, o mais longo primeiro)
+        pattern = f"(?:{pattern})?"
+    return pattern
+
+
+def _char_pattern(char, variants):
+    chars = variants.get(char, char)
+    return re.escape(chars) if len(chars) == 1 else f"[{chars}]"
+
+
+def _entry(raw, source):
+    name, category = raw.get("name"), raw.get("category")
+    if not name or category not in CATEGORIES:
+        raise ValueError(f"{source}: entrada inválida no catálogo de analitos: {raw!r}")
+    return AnalyteEntry(
+        name=name,
+        category=category,
+        unit=raw.get("unit"),
+        molar_mass=raw.get("molar_mass"),
+        valence=raw.get("valence"),
+        synonyms=tuple(raw.get("synonyms", ())),
+        keywords=tuple(raw.get("keywords", ())),
+    )
+
+
+class AnalyteCatalog:
+    def __init__(self, analytes, panels=(), priority=CATEGORIES):
+        self.analytes = {entry.name: entry for entry in analytes}
+        self.panels = {entry.name: entry for entry in panels}
+        self.priority = tuple(priority)
+
+        self._names = {}
+        for entry in self.analytes.values():
+            for name in (entry.name, *entry.synonyms):
+                self._names.setdefault(_name_key(name), entry.name)
+
+        rank = {category: index for index, category in enumerate(self.priority)}
+        self._keywords = {}
+        for entry in (*self.analytes.values(), *self.panels.values()):
+            for keyword in entry.keywords:
+                folded = fold_accents(keyword)
+                known = self._keywords.get(folded)
+                if known is not None and known[1] != entry.category:
+                    raise ValueError(f"Palavra-chave {keyword!r} em duas categorias: {known[1]} e {entry.category}")
+                self._keywords[folded] = (rank.get(entry.category, len(rank)), entry.category)
+        # Sem palavras-chave, um padrão que nunca casa
+        self._keyword_re = re.compile(trie_pattern(self._keywords, _VARIANTS) or r"(?!)")
+
+    def __iter__(self):
+        return iter(self.analytes.values())
+
+    def __len__(self):
+        return len(self.analytes)
+
+    def classify(self, line):
+        """Categoria que a linha ativa pelas palavras-chave, ou None."""
+        best = None
+        for keyword in self._keyword_re.findall(line):
+            # O trecho casado vem com os acentos da linha
+            found = self._keywords.get(keyword) or self._keywords[fold_accents(keyword)]
+            if best is None or found[0] < best[0]:
+                best = found
+        return best and best[1]
+
+    def canonical_name(self, name):
+        """Nome do analito no catálogo para ``name`` ou um sinônimo (None se desconhecido)."""
+        return self._names.get(_name_key(name)) if name else None
+
+    def entry(self, name):
+        canonical = self.canonical_name(name)
+        return self.analytes.get(canonical) if canonical else None
+
+
+def _read(path):
+    with open(path, encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def load_catalog(paths=None):
+    """Carrega o catálogo padrão seguido de ``paths`` (por padrão, os de ``PROCESSADOR_ANALYTE_CATALOG``)."""
+    if paths is None:
+        paths = [path for path in os.environ.get(CATALOG_ENV, "").split(os.pathsep) if path]
+    analytes, panels, priority = {}, {}, CATEGORIES
+    for path in (CATALOG_PATH, *paths):
+        data = _read(path)
+        for raw in data.get("analytes", ()):
+            entry = _entry(raw, path)
+            analytes[entry.name] = entry
+        for raw in data.get("panels", ()):
+            entry = _entry(raw, path)
+            panels[entry.name] = entry
+        priority = data.get("priority", priority)
+    return AnalyteCatalog(analytes.values(), panels.values(), priority)
+
+
+catalog = load_catalog()
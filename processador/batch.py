@@ -0,0 +1,234 @@
+"""Processamento em lote de laudos, sem interface.
+
+Percorre arquivos e diretórios, distribui os laudos em um pool de processos
+e grava cada resultado assim que o lote correspondente termina. Falhas vão
+para um manifesto separado e não interrompem a execução. Com
+``--repository``, os exames também são gravados no banco SQLite da
+interface (``processador.repository``), de onde a aba de coorte lê; exames
+já salvos para o mesmo paciente e data são ignorados.
+
+Uso:
+    python -m processador.batch laudos/ --output resultados.jsonl --workers 8
+    python -m processador.batch laudos/ --output resultados.jsonl --repository
+"""
+
+import argparse
+import json
+import os
+import sys
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from processador.extraction import SUPPORTED_EXTENSIONS, iter_text_chunks
+from processador.parsing import parse_report_chunks
+from processador.records import json_default
+from processador.units import normalize
+
+
+def discover_files(inputs, recursive=True):
+    for path in inputs:
+        if os.path.isdir(path):
+            if recursive:
+                walker = os.walk(path)
+            else:
+                walker = [(path, [], os.listdir(path))]
+            for root, dirs, files in walker:
+                dirs.sort()
+                for name in sorted(files):
+                    if name.lower().endswith(SUPPORTED_EXTENSIONS):
+                        yield os.path.join(root, name)
+        else:
+            yield path
+
+
+def process_file(path):
+    with open(path, "rb") as handle:
+        data = handle.read()
+    # Já estamos em um processo do pool: páginas extraídas em sequência
+    patient_info, categories = parse_report_chunks(iter_text_chunks(data, path.lower(), workers=1))
+    return {"source": path, "patient_info": patient_info, "categories": categories}
+
+
+def process_chunk(paths):
+    # Executado nos processos filhos: cada arquivo falha de forma isolada
+    results = []
+    for path in paths:
+        try:
+            results.append((True, process_file(path)))
+        except Exception as e:
+            results.append((False, {
+                "source": path,
+                "error": f"{type(e).__name__}: {e}",
+                "traceback": traceback.format_exc(),
+            }))
+    return results
+
+
+def _chunks(items, size):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def flatten_record(record):
+    patient_info = record["patient_info"]
+    for category, items in record["categories"].items():
+        for item in items:
+            yield {
+                "source": record["source"],
+                "patient": patient_info["name"],
+                "collectionDate": patient_info["collectionDate"],
+                "category": category,
+                "name": item["name"],
+                "value": item["value"],
+                "reference": item.get("reference"),
+                "numericValue": item.get("numericValue"),
+                "comparator": item.get("comparator"),
+                "unit": item.get("unit"),
+                "isAbnormal": item.get("isAbnormal", False),
+                "isCalculated": item.get("isCalculated", False),
+            }
+
+
+class JsonlWriter:
+    def __init__(self, path):
+        self._handle = open(path, "w", encoding="utf-8")
+
+    def write(self, records):
+        for record in records:
+            self._handle.write(json.dumps(record, ensure_ascii=False, default=json_default) + "\n")
+        self._handle.flush()
+
+    def close(self):
+        self._handle.close()
+
+
+class ParquetWriter:
+    # Formato longo: uma linha por analito
+    def __init__(self, path):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise SystemExit("Saída Parquet requer o pacote pyarrow (pip install pyarrow).")
+        self._pa = pa
+        self._schema = pa.schema([
+            ("source", pa.string()),
+            ("patient", pa.string()),
+            ("collectionDate", pa.string()),
+            ("category", pa.string()),
+            ("name", pa.string()),
+            ("value", pa.string()),
+            ("reference", pa.string()),
+            ("numericValue", pa.float64()),
+            ("comparator", pa.string()),
+            ("unit", pa.string()),
+            ("isAbnormal", pa.bool_()),
+            ("isCalculated", pa.bool_()),
+            ("canonicalValue", pa.float64()),
+            ("canonicalUnit", pa.string()),
+        ])
+        self._writer = pq.ParquetWriter(path, self._schema)
+
+    def write(self, records):
+        rows = [row for record in records for row in flatten_record(record)]
+        if rows:
+            table = self._pa.Table.from_pylist(rows, schema=self._schema)
+            # Valor na unidade canônica do analito, convertido para o lote inteiro de uma vez
+            converted = normalize(
+                table.column("name").to_pylist(),
+                table.column("numericValue").to_numpy(zero_copy_only=False),
+                table.column("unit").to_pylist(),
+            )
+            for name, column in (("canonicalValue", converted.value), ("canonicalUnit", converted.unit)):
+                index = self._schema.get_field_index(name)
+                table = table.set_column(index, self._schema.field(index),
+                                         self._pa.array(column, type=self._schema.field(index).type, from_pandas=True))
+            self._writer.write_table(table)
+
+    def close(self):
+        self._writer.close()
+
+
+def open_writer(path, output_format=None):
+    output_format = output_format or ("parquet" if path.endswith(".parquet") else "jsonl")
+    if output_format == "parquet":
+        return ParquetWriter(path)
+    return JsonlWriter(path)
+
+
+def run_batch(paths, writer, failures, workers=None, chunk_size=16, repository=None):
+    """Processa ``paths`` no pool e devolve ``(sucessos, falhas)``.
+
+    Com ``repository`` (um ``ExamRepository``), cada exame lido também é gravado no banco.
+    """
+    ok_count = 0
+    failed_count = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(process_chunk, chunk): chunk
+                   for chunk in _chunks(paths, chunk_size)}
+        for future in as_completed(futures):
+            try:
+                results = future.result()
+            except Exception as e:
+                # Processo filho morreu: todo o lote entra no manifesto
+                results = [(False, {"source": path, "error": f"{type(e).__name__}: {e}"})
+                           for path in futures[future]]
+            done = [record for ok, record in results if ok]
+            errors = [record for ok, record in results if not ok]
+            writer.write(done)
+            failures.write(errors)
+            if repository is not None:
+                for record in done:
+                    repository.save_exam(record["patient_info"], record["categories"])
+            ok_count += len(done)
+            failed_count += len(errors)
+    return ok_count, failed_count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Processa laudos em lote, sem a interface Streamlit.")
+    parser.add_argument("inputs", nargs="+", help="arquivos ou diretórios com laudos (.pdf/.txt)")
+    parser.add_argument("-o", "--output", required=True, help="arquivo de saída (.jsonl ou .parquet)")
+    parser.add_argument("--format", choices=["jsonl", "parquet"], help="formato de saída (padrão: pela extensão)")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count(), help="número de processos")
+    parser.add_argument("--chunk-size", type=int, default=16, help="arquivos por tarefa enviada ao pool")
+    parser.add_argument("--failures", help="manifesto de falhas (padrão: <output>.failures.jsonl)")
+    parser.add_argument("--no-recursive", action="store_true", help="não descer em subdiretórios")
+    parser.add_argument("--repository", nargs="?", const="", metavar="CAMINHO",
+                        help="grava os exames também no banco SQLite (padrão: o da interface, PROCESSADOR_DB_PATH)")
+    args = parser.parse_args(argv)
+
+    if args.workers < 1 or args.chunk_size < 1:
+        parser.error("--workers e --chunk-size devem ser positivos")
+
+    paths = list(discover_files(args.inputs, recursive=not args.no_recursive))
+    failures_path = args.failures or args.output + ".failures.jsonl"
+
+    repository = None
+    if args.repository is not None:
+        from processador.repository import DEFAULT_DB_PATH, ExamRepository
+
+        repository = ExamRepository(args.repository or DEFAULT_DB_PATH)
+
+    writer = open_writer(args.output, args.format)
+    failures = JsonlWriter(failures_path)
+    try:
+        ok_count, failed_count = run_batch(paths, writer, failures, args.workers, args.chunk_size, repository)
+    finally:
+        writer.close()
+        failures.close()
+        if repository is not None:
+            repository.close()
+
+    print(f"{ok_count} laudos processados, {failed_count} falhas (ver {failures_path})", file=sys.stderr)
+    return 1 if failed_count else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+"""Gráfico de tendência combinado: um único figure com subplots por métrica.
+
+Os traços usam WebGL (``Scattergl``) sobre eixos de data reais. Séries
+longas são reduzidas no servidor com LTTB (Largest-Triangle-Three-Buckets)
+até o orçamento de pontos, e a especificação do figure fica em cache por
+paciente, conjunto de métricas e conteúdo das séries.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+DEFAULT_POINT_BUDGET = 500
+PANEL_HEIGHT = 260
+CACHE_MAX_ENTRIES = 64
+
+_figure_cache = OrderedDict()
+# O cache é do processo, compartilhado pelas sessões (uma thread por sessão)
+_figure_lock = threading.Lock()
+
+
+def lttb(x, y, threshold):
+    """Índices dos pontos mantidos pelo LTTB (sempre inclui o primeiro e o último).
+
+    ``x`` e ``y`` são arrays numéricos do mesmo tamanho, com ``x`` crescente.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    # Pontos internos divididos em (threshold - 2) baldes
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        # Média do próximo balde (ou o último ponto) como terceiro vértice
+        if bucket + 2 < len(edges):
+            next_start, next_end = edges[bucket + 1], edges[bucket + 2]
+            avg_x = x[next_start:next_end].mean()
+            avg_y = y[next_start:next_end].mean()
+        else:
+            avg_x, avg_y = x[n - 1], y[n - 1]
+
+        ax, ay = x[previous], y[previous]
+        areas = np.abs(
+            (ax - avg_x) * (y[start:end] - ay) - (ax - x[start:end]) * (avg_y - ay)
+        )
+        previous = start + int(np.argmax(areas))
+        selected[bucket + 1] = previous
+    return selected
+
+
+def downsample(frame, point_budget):
+    """Reduz um DataFrame ``(date, value)`` ordenado por data ao orçamento de pontos."""
+    if len(frame) <= point_budget:
+        return frame
+    x = frame["date"].to_numpy(dtype="datetime64[ns]").astype(np.int64)
+    keep = lttb(x, frame["value"].to_numpy(dtype=np.float64), point_budget)
+    return frame.iloc[keep]
+
+
+def _series_digest(series):
+    digest = hashlib.sha1()
+    for metric, frame in series:
+        digest.update(f"{metric['category']}|{metric['name']}|{len(frame)}".encode("utf-8"))
+        digest.update(frame["date"].to_numpy(dtype="datetime64[ns]").tobytes())
+        digest.update(frame["value"].to_numpy(dtype=np.float64).tobytes())
+    return digest.hexdigest()
+
+
+def build_trend_figure(series, point_budget=DEFAULT_POINT_BUDGET):
+    """Figure plotly (como dict) com um painel por métrica e eixo x compartilhado.
+
+    ``series`` é uma lista de ``(metric, frame)``, com ``frame`` contendo as
+    colunas ``date`` (datetime) e ``value``.
+    """
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    titles = [f"{metric['name']} ({metric['unit']})" for metric, _ in series]
+    fig = make_subplots(
+        rows=len(series), cols=1, shared_xaxes=True,
+        subplot_titles=titles, vertical_spacing=min(0.08, 0.3 / max(len(series), 1)),
+    )
+    for row, (metric, frame) in enumerate(series, start=1):
+        reduced = downsample(frame, point_budget)
+        fig.add_trace(
+            go.Scattergl(
+                x=reduced["date"], y=reduced["value"], mode="lines+markers",
+                name=metric['name'], showlegend=False,
+                hovertemplate="%{x|%d/%m/%Y}: %{y}<extra>" + metric['name'] + "</extra>",
+            ),
+            row=row, col=1,
+        )
+        fig.update_yaxes(title_text=metric['unit'], row=row, col=1)
+
+    fig.update_xaxes(type="date", tickformat="%d/%m/%Y")
+    fig.update_xaxes(title_text="Data", row=len(series), col=1)
+    fig.update_layout(
+        template="simple_white",
+        height=PANEL_HEIGHT * len(series) + 60,
+        margin=dict(l=20, r=20, t=40, b=20),
+    )
+    return fig.to_dict()
+
+
+def cached_trend_figure(patient, series, point_budget=DEFAULT_POINT_BUDGET):
+    """``build_trend_figure`` com cache LRU por (paciente, métricas, orçamento, dados)."""
+    key = (
+        patient,
+        tuple((metric['category'], metric['name']) for metric, _ in series),
+        point_budget,
+        _series_digest(series),
+    )
+    with _figure_lock:
+        figure = _figure_cache.get(key)
+        if figure is not None:
+            _figure_cache.move_to_end(key)
+            return figure
+
+    # Montado fora do lock; duas sessões podem montar o mesmo figure, sem prejuízo
+    figure = build_trend_figure(series, point_budget)
+    with _figure_lock:
+        _figure_cache[key] = figure
+        while len(_figure_cache) > CACHE_MAX_ENTRIES:
+            _figure_cache.popitem(last=False)
+    return figure
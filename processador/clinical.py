@@ -0,0 +1,56 @@
+"""Cálculos clínicos usados pelo processamento dos laudos."""
+
+from processador.reference_ranges import compile_reference
+from processador.values import parse_value_text
+
+# Equações CKD-EPI disponíveis (o cálculo vetorizado fica em processador.egfr)
+EQUATION_2009 = "2009"
+EQUATION_2021 = "2021"
+EQUATIONS = (EQUATION_2009, EQUATION_2021)
+
+# Idade e sexo usados quando o laudo não informa (valores históricos do app)
+DEFAULT_AGE = 65
+DEFAULT_IS_FEMALE = False
+
+
+# Função para calcular eGFR usando CKD-EPI
+def calculate_ckd_epi(creatinine, age, is_female=False, is_black=False):
+    cr = float(creatinine)
+    
+    if is_female:
+        if cr <= 0.7:
+            egfr = 144 * (cr / 0.7) ** -0.329 * 0.993 ** age
+        else:
+            egfr = 144 * (cr / 0.7) ** -1.209 * 0.993 ** age
+    else:
+        if cr <= 0.9:
+            egfr = 141 * (cr / 0.9) ** -0.411 * 0.993 ** age
+        else:
+            egfr = 141 * (cr / 0.9) ** -1.209 * 0.993 ** age
+    
+    # Ajuste para raça negra
+    if is_black:
+        egfr *= 1.159
+    
+    return round(egfr)
+
+
+# Verificar se um resultado está fora do intervalo de referência
+def is_abnormal(value, reference, age=None, is_female=None):
+    if not reference:
+        return False
+    
+    # Referência compilada uma única vez por texto distinto
+    return compile_reference(reference).is_abnormal(parse_value_text(value).number, age, is_female)
+
+
+def parse_sex(value):
+    """Converte o sexo informado no laudo em ``is_female`` (None se desconhecido)."""
+    if not value:
+        return None
+    normalized = value.strip().lower()
+    if normalized.startswith(("f", "mulher")):
+        return True
+    if normalized.startswith(("m", "homem")):
+        return False
+    return None
@@ -0,0 +1,138 @@
+"""Análises de coorte (vários pacientes) com operações agrupadas do pandas.
+
+Parte de uma tabela longa de resultados de um analito e calcula, por
+paciente, o valor mais recente, a variação em relação ao anterior, a
+situação frente à referência e as contagens de alterados. Filtros e
+paginação acontecem aqui, no servidor: a interface recebe só a página.
+"""
+
+import numpy as np
+import pandas as pd
+
+from processador.reference_ranges import compile_reference
+
+RESULT_COLUMNS = [
+    "patient", "date", "category", "analyte", "value", "unit", "flag", "reference", "factor", "age", "is_female",
+]
+
+STATUS_BELOW = "abaixo"
+STATUS_ABOVE = "acima"
+STATUS_NORMAL = "normal"
+STATUS_UNKNOWN = "sem referência"
+STATUSES = (STATUS_BELOW, STATUS_ABOVE, STATUS_NORMAL, STATUS_UNKNOWN)
+
+
+def results_frame(rows):
+    """DataFrame a partir de linhas ``(patient, date ISO, category, analyte,
+    value, unit, flag, reference, factor, age, is_female)`` (ver
+    ``ExamRepository.cohort_rows``).
+
+    ``value`` e ``unit`` já vêm na unidade canônica; ``factor`` é o que foi
+    aplicado ao valor do laudo, e converte também a referência. ``age`` e
+    ``is_female`` (None quando o laudo não informa) escolhem o intervalo de
+    referência, como na flag gravada.
+    """
+    frame = pd.DataFrame(rows, columns=RESULT_COLUMNS)
+    frame["date"] = pd.to_datetime(frame["date"], format="%Y-%m-%d", errors="coerce")
+    frame["value"] = pd.to_numeric(frame["value"], errors="coerce")
+    frame["factor"] = pd.to_numeric(frame["factor"], errors="coerce").fillna(1.0)
+    frame["flag"] = frame["flag"].astype(bool)
+    return frame
+
+
+def _reference_bounds(keys):
+    """``{(reference, age, is_female): low}`` e o mesmo para ``high``; cada
+    texto distinto é compilado uma vez (e memoizado)."""
+    lows, highs = {}, {}
+    for key in keys:
+        reference, age, is_female = key
+        interval = compile_reference(reference).select(age, is_female) if reference else None
+        lows[key] = interval.low if interval and interval.low is not None else np.nan
+        highs[key] = interval.high if interval and interval.high is not None else np.nan
+    return lows, highs
+
+
+def patient_summary(frame):
+    """Uma linha por paciente: último valor, anterior, variação, situação e contagens."""
+    columns = [
+        "patient", "date", "value", "previous_value", "delta", "delta_pct", "unit",
+        "low", "high", "status", "results", "abnormal_results",
+    ]
+    frame = frame[frame["value"].notna()]
+    if frame.empty:
+        return pd.DataFrame(columns=columns)
+
+    frame = frame.sort_values(["patient", "date"], kind="stable")
+    grouped = frame.groupby("patient", sort=False)
+    previous = grouped["value"].shift(1)
+
+    latest_mask = ~frame["patient"].duplicated(keep="last")
+    summary = frame.loc[
+        latest_mask, ["patient", "date", "value", "unit", "reference", "factor", "age", "is_female"]
+    ].copy()
+    summary["previous_value"] = previous[latest_mask]
+    summary["delta"] = summary["value"] - summary["previous_value"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        summary["delta_pct"] = summary["delta"] / summary["previous_value"].abs() * 100
+
+    # Limites na unidade do laudo, para a idade e o sexo do paciente,
+    # convertidos com o mesmo fator do valor
+    keys = [
+        (reference, None if pd.isna(age) else int(age), None if pd.isna(is_female) else bool(is_female))
+        for reference, age, is_female in zip(summary["reference"], summary["age"], summary["is_female"])
+    ]
+    lows, highs = _reference_bounds(set(keys))
+    summary["low"] = np.array([lows[key] for key in keys], dtype=float) * summary["factor"].to_numpy()
+    summary["high"] = np.array([highs[key] for key in keys], dtype=float) * summary["factor"].to_numpy()
+    below = summary["value"] < summary["low"]
+    above = summary["value"] > summary["high"]
+    has_reference = summary["low"].notna() | summary["high"].notna()
+    summary["status"] = np.select(
+        [below, above, has_reference], [STATUS_BELOW, STATUS_ABOVE, STATUS_NORMAL], STATUS_UNKNOWN
+    )
+
+    counts = grouped.agg(results=("value", "size"), abnormal_results=("flag", "sum"))
+    summary = summary.join(counts, on="patient")
+    return summary[columns].reset_index(drop=True)
+
+
+def filter_summary(summary, status=None, rising_only=False, min_delta=0.0, search=""):
+    mask = np.ones(len(summary), dtype=bool)
+    if status:
+        mask &= (summary["status"] == status).to_numpy()
+    if rising_only:
+        mask &= (summary["delta"] > min_delta).fillna(False).to_numpy()
+    if search:
+        mask &= summary["patient"].str.contains(search, case=False, regex=False).to_numpy()
+    return summary[mask]
+
+
+def paginate(frame, page, page_size):
+    """Fatia da página (1-based) e o total de páginas."""
+    page_count = max(1, -(-len(frame) // page_size))
+    page = min(max(page, 1), page_count)
+    start = (page - 1) * page_size
+    return frame.iloc[start:start + page_size], page_count
+
+
+def distribution(summary, bins=20):
+    """Estatísticas e histograma dos valores mais recentes (poucos números,
+    em vez da tabela inteira)."""
+    values = summary["value"].to_numpy(dtype=np.float64)
+    values = values[~np.isnan(values)]
+    if values.size == 0:
+        return {"count": 0}, pd.DataFrame(columns=["faixa", "pacientes"])
+
+    counts, edges = np.histogram(values, bins=min(bins, max(1, np.unique(values).size)))
+    histogram = pd.DataFrame({
+        "faixa": [f"{low:.4g}–{high:.4g}" for low, high in zip(edges[:-1], edges[1:])],
+        "pacientes": counts,
+    })
+    stats = {
+        "count": int(values.size),
+        "mean": float(values.mean()),
+        "median": float(np.median(values)),
+        "p5": float(np.percentile(values, 5)),
+        "p95": float(np.percentile(values, 95)),
+    }
+    return stats, histogram
@@ -0,0 +1,56 @@
+"""eGFR por CKD-EPI vetorizado com NumPy, para coortes inteiras.
+
+Aceita escalares ou arrays (com broadcasting) e calcula tudo em uma
+passada. ``EQUATION_2009`` reproduz ``calculate_ckd_epi``; ``EQUATION_2021``
+é a equação sem coeficiente de raça (Inker et al., NEJM 2021).
+"""
+
+import numpy as np
+
+from processador.clinical import (  # noqa: F401 (reexportados)
+    DEFAULT_AGE, DEFAULT_IS_FEMALE, EQUATION_2009, EQUATION_2021, EQUATIONS, parse_sex,
+)
+
+
+def _ckd_epi_2009(cr, age, is_female, is_black):
+    kappa = np.where(is_female, 0.7, 0.9)
+    alpha = np.where(is_female, -0.329, -0.411)
+    base = np.where(is_female, 144.0, 141.0)
+    exponent = np.where(cr <= kappa, alpha, -1.209)
+    egfr = base * (cr / kappa) ** exponent * 0.993 ** age
+    return np.where(is_black, egfr * 1.159, egfr)
+
+
+def _ckd_epi_2021(cr, age, is_female):
+    kappa = np.where(is_female, 0.7, 0.9)
+    alpha = np.where(is_female, -0.241, -0.302)
+    ratio = cr / kappa
+    egfr = (
+        142.0
+        * np.minimum(ratio, 1.0) ** alpha
+        * np.maximum(ratio, 1.0) ** -1.200
+        * 0.9938 ** age
+    )
+    return np.where(is_female, egfr * 1.012, egfr)
+
+
+def compute_egfr(creatinine, age, is_female=False, is_black=False, equation=EQUATION_2009, rounded=True):
+    """eGFR (mL/min/1,73m²) para arrays de creatinina (mg/dL), idade e sexo.
+
+    Valores ausentes (NaN) ou creatinina não positiva resultam em NaN.
+    ``is_black`` só é usado pela equação de 2009.
+    """
+    cr = np.asarray(creatinine, dtype=np.float64)
+    age = np.asarray(age, dtype=np.float64)
+    is_female = np.asarray(is_female, dtype=bool)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cr = np.where(cr > 0, cr, np.nan)
+        if equation == EQUATION_2009:
+            egfr = _ckd_epi_2009(cr, age, is_female, np.asarray(is_black, dtype=bool))
+        elif equation == EQUATION_2021:
+            egfr = _ckd_epi_2021(cr, age, is_female)
+        else:
+            raise ValueError(f"Equação CKD-EPI desconhecida: {equation!r} (use uma de {EQUATIONS})")
+
+    return np.round(egfr) if rounded else egfr
@@ -0,0 +1,198 @@
+"""Exportação do laudo processado (documento Word).
+
+O documento é montado uma vez por conteúdo: ``word_report_bytes`` guarda os
+bytes em um cache LRU do processo, compartilhado pelas sessões, indexado
+pelo hash do laudo e por ``TEMPLATE_VERSION`` e limitado em memória.
+"""
+
+import hashlib
+import io
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from processador.records import json_default
+
+# Aumentar sempre que o layout de ``generate_word_report`` mudar: os
+# documentos já em cache deixam de ser servidos
+TEMPLATE_VERSION = 1
+DOCX_MIME = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+DEFAULT_CACHE_BYTES = int(os.environ.get("PROCESSADOR_EXPORT_CACHE_MB", "64")) * 1024 * 1024
+
+
+def generate_word_report(patient_info, exam_data):
+    from docx import Document
+    from docx.shared import Pt, RGBColor
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+    
+    # Criar um novo documento
+    doc = Document()
+    
+    # Configurar estilo do documento
+    style = doc.styles['Normal']
+    style.font.name = 'Arial'
+    style.font.size = Pt(11)
+    
+    # Adicionar cabeçalho
+    header = doc.add_heading('RELATÓRIO DE EXAMES MÉDICOS', level=1)
+    header.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    
+    # Informações do paciente
+    doc.add_paragraph()
+    doc.add_paragraph(f"Paciente: {patient_info['name']}")
+    doc.add_paragraph(f"Data da coleta: {patient_info['collectionDate']}")
+    doc.add_paragraph()
+    
+    # Adicionar linha horizontal
+    doc.add_paragraph().add_run('_' * 80).bold = True
+    
+    # Função para adicionar uma seção de exames
+    def add_exam_section(title, items):
+        if not items:
+            return
+            
+        doc.add_heading(title, level=2)
+        
+        # Adicionar tabela
+        table = doc.add_table(rows=1, cols=2)
+        table.style = 'Table Grid'
+        
+        # Cabeçalhos da tabela
+        header_cells = table.rows[0].cells
+        header_cells[0].text = "Exame"
+        header_cells[1].text = "Resultado"
+        
+        # Formatar cabeçalhos
+        for cell in header_cells:
+            cell.paragraphs[0].runs[0].bold = True
+            
+        # Adicionar resultados
+        for item in items:
+            row_cells = table.add_row().cells
+            row_cells[0].text = item['name']
+            
+            # Adicionar valor com formatação para anormais
+            result_paragraph = row_cells[1].paragraphs[0]
+            result_run = result_paragraph.add_run(item['value'])
+            
+            if item.get('isAbnormal', False):
+                result_run.bold = True
+                result_run.font.color.rgb = RGBColor(192, 0, 0)  # Vermelho
+                
+            # Adicionar nota se for calculado
+            if item.get('isCalculated', False):
+                calc_run = result_paragraph.add_run(" (calculado)")
+                calc_run.italic = True
+                calc_run.font.size = Pt(9)
+    
+        doc.add_paragraph()
+    
+    # Adicionar cada seção de exames
+    add_exam_section("Hemograma", exam_data['Hemograma'])
+    add_exam_section("Bioquímica", exam_data['Bioquímica'])
+    add_exam_section("Hormonais", exam_data['Hormonais'])
+    add_exam_section("Outros Exames", exam_data['Outros'])
+    
+    # Adicionar exames de imagem
+    if exam_data['Imagem']:
+        doc.add_heading("Exames de Imagem", level=2)
+        for item in exam_data['Imagem']:
+            p = doc.add_paragraph(style='List Bullet')
+            p.add_run(f"{item['name']}: ").bold = True
+            p.add_run(item['value'])
+    
+    # Adicionar rodapé
+    doc.add_paragraph()
+    footer = doc.add_paragraph("Relatório gerado automaticamente pelo Processador de Exames Médicos")
+    footer.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    
+    # Salvar documento em memória
+    docx_stream = io.BytesIO()
+    doc.save(docx_stream)
+    docx_stream.seek(0)
+    
+    return docx_stream
+
+
+def export_key(kind, patient_info, exam_data, version=TEMPLATE_VERSION):
+    payload = json.dumps([patient_info, exam_data], sort_keys=True, ensure_ascii=False, default=json_default)
+    return f"{kind}:v{version}:{hashlib.sha256(payload.encode('utf-8')).hexdigest()}"
+
+
+class ExportCache:
+    """Cache LRU de documentos exportados, limitado pelo total de bytes.
+
+    Seguro entre threads: o ``st.download_button`` gera os bytes fora da
+    thread do script. Documentos maiores que o limite são devolvidos sem
+    entrar no cache.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Bytes em cache para ``key`` (None se ausentes)."""
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+            return data
+
+    def put(self, key, data):
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = data
+                self._size += len(data)
+            while self._size > self.max_bytes:
+                _key, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+                self.evictions += 1
+
+    def get_or_build(self, key, build):
+        """Devolve os bytes em cache ou chama ``build()``."""
+        data = self.get(key)
+        if data is None:
+            # Fora do lock: a montagem é lenta e não deve bloquear outras sessões
+            data = build()
+            self.put(key, data)
+        return data
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+export_cache = ExportCache()
+
+
+def word_report_bytes(patient_info, exam_data, cache=export_cache):
+    """Bytes do ``.docx`` do laudo, montado só na primeira exportação do conteúdo."""
+    key = export_key("docx", patient_info, exam_data)
+    return cache.get_or_build(key, lambda: generate_word_report(patient_info, exam_data).getvalue())
@@ -0,0 +1,175 @@
+"""Extração de texto dos arquivos enviados (PDF ou texto puro).
+
+A extração é feita em fluxo: cada página é entregue assim que extraída, de
+modo que o parser incremental pode começar antes do fim do documento e a
+memória de trabalho não cresce com o número de páginas.
+
+O motor de extração de PDF é plugável. O padrão continua sendo o PyPDF2;
+pypdfium2 e pdfminer.six são usados se estiverem instalados e forem
+escolhidos por ``PROCESSADOR_PDF_BACKEND`` (``auto`` pega o primeiro
+instalado de ``AUTO_PREFERENCE``). ``benchmarks/bench_extraction.py`` mede
+cada motor e confere se o laudo lido é o mesmo.
+"""
+
+import importlib.util
+import os
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO, StringIO
+
+SUPPORTED_EXTENSIONS = ('.pdf', '.txt')
+
+# A partir de quantas páginas vale a pena extrair em processos paralelos
+PARALLEL_MIN_PAGES = 40
+PAGES_PER_TASK = 4
+
+
+class PyPDF2Backend:
+    name = "pypdf2"
+    module = "PyPDF2"
+
+    def __init__(self, data):
+        import PyPDF2
+
+        self._reader = PyPDF2.PdfReader(BytesIO(data))
+        self.page_count = len(self._reader.pages)
+
+    def page_text(self, index):
+        return self._reader.pages[index].extract_text()
+
+
+class PdfiumBackend:
+    name = "pypdfium2"
+    module = "pypdfium2"
+
+    def __init__(self, data):
+        import pypdfium2
+
+        self._document = pypdfium2.PdfDocument(data)
+        self.page_count = len(self._document)
+
+    def page_text(self, index):
+        page = self._document[index]
+        textpage = page.get_textpage()
+        try:
+            text = textpage.get_text_range()
+        finally:
+            textpage.close()
+            page.close()
+        # pdfium separa linhas com \r\n e não termina a página com quebra
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+        return text if text.endswith("\n") else text + "\n"
+
+
+class PdfminerBackend:
+    name = "pdfminer"
+    module = "pdfminer"
+
+    def __init__(self, data):
+        from pdfminer.pdfpage import PDFPage
+
+        self._pages = list(PDFPage.get_pages(BytesIO(data)))
+        self.page_count = len(self._pages)
+
+    def page_text(self, index):
+        from pdfminer.converter import TextConverter
+        from pdfminer.layout import LAParams
+        from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+
+        output = StringIO()
+        resources = PDFResourceManager(caching=True)
+        device = TextConverter(resources, output, laparams=LAParams())
+        try:
+            PDFPageInterpreter(resources, device).process_page(self._pages[index])
+        finally:
+            device.close()
+        return output.getvalue().replace("\x0c", "")
+
+
+BACKENDS = {backend.name: backend for backend in (PyPDF2Backend, PdfiumBackend, PdfminerBackend)}
+DEFAULT_BACKEND = PyPDF2Backend.name
+# Ordem do modo "auto": só motores validados com bench_extraction.py
+AUTO_PREFERENCE = (PdfiumBackend.name, PyPDF2Backend.name)
+
+
+def available_backends():
+    return [name for name, backend in BACKENDS.items() if importlib.util.find_spec(backend.module)]
+
+
+def resolve_backend(name=None):
+    """Nome do motor a usar: o pedido, o de ``PROCESSADOR_PDF_BACKEND`` ou o padrão."""
+    name = (name or os.environ.get("PROCESSADOR_PDF_BACKEND") or DEFAULT_BACKEND).lower()
+    if name == "auto":
+        installed = available_backends()
+        chosen = next((candidate for candidate in AUTO_PREFERENCE if candidate in installed), None)
+        if chosen is None:
+            modules = ", ".join(BACKENDS[candidate].module for candidate in AUTO_PREFERENCE)
+            raise RuntimeError(f"Modo 'auto' sem motor de extração instalado (instale um de: {modules})")
+        return chosen
+    if name not in BACKENDS:
+        raise ValueError(f"Motor de extração desconhecido: {name!r} (use um de {sorted(BACKENDS)} ou 'auto')")
+    return name
+
+
+def open_document(data, backend=None):
+    return BACKENDS[resolve_backend(backend)](data)
+
+
+_worker_document = None
+
+
+def _init_page_worker(data, backend):
+    # Cada processo abre o PDF uma única vez e reaproveita o documento
+    global _worker_document
+    _worker_document = open_document(data, backend)
+
+
+def _extract_page(index):
+    return _worker_document.page_text(index)
+
+
+def default_page_workers(page_count):
+    if page_count < PARALLEL_MIN_PAGES:
+        return 1
+    return min(os.cpu_count() or 1, 8)
+
+
+class PdfPageStream:
+    """Iterável sobre o texto das páginas de um PDF, em ordem.
+
+    Com ``workers > 1`` as páginas são extraídas em um pool de processos,
+    mas continuam sendo entregues na ordem do documento.
+    """
+
+    def __init__(self, data, workers=None, backend=None):
+        self._data = data
+        self.backend = resolve_backend(backend)
+        self._document = open_document(data, self.backend)
+        self.page_count = self._document.page_count
+        self.workers = default_page_workers(self.page_count) if workers is None else workers
+
+    def __len__(self):
+        return self.page_count
+
+    def __iter__(self):
+        if self.workers <= 1:
+            for index in range(self.page_count):
+                yield self._document.page_text(index)
+            return
+
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_page_worker,
+            initargs=(self._data, self.backend),
+        ) as executor:
+            yield from executor.map(_extract_page, range(self.page_count), chunksize=PAGES_PER_TASK)
+
+
+def iter_text_chunks(data, filename, workers=None, backend=None):
+    # Verificar tipo de arquivo
+    if filename.endswith('.pdf'):
+        return iter(PdfPageStream(data, workers, backend))
+    return iter([data.decode("utf-8")])
+
+
+def extract_pdf_text(data, workers=1, backend=None):
+    return "".join(PdfPageStream(data, workers, backend))
@@ -0,0 +1,207 @@
+"""Histórico de exames em formato colunar (longo), indexado por analito e data.
+
+Além da tabela, o store mantém a lista original de exames (``exams``) para
+as telas que exibem cada laudo completo. Um store montado a partir do
+repositório (``from_rows``) traz só a tabela; os laudos completos ficam no
+banco e são lidos página a página.
+
+Valores e unidades da tabela estão na unidade canônica de cada analito
+(``processador.units``), convertidos em uma passada por lote de exames
+novos.
+
+A data de coleta é convertida uma única vez, na entrada do exame, para uma
+chave ISO (``dateKey``); a lista de exames fica ordenada (mais recente
+primeiro) por inserção com ``bisect`` e a detecção de duplicados usa um
+conjunto de pares (paciente, chave ISO).
+"""
+
+import bisect
+import datetime
+
+from processador.records import compact_categories
+from processador.units import normalize
+
+COLUMNS = ["patient", "date", "date_label", "category", "analyte", "value", "unit", "flag"]
+DATE_FORMAT = "%d/%m/%Y"
+ISO_FORMAT = "%Y-%m-%d"
+
+
+def parse_collection_date(date_label):
+    try:
+        return datetime.datetime.strptime(date_label.strip(), DATE_FORMAT).date()
+    except (AttributeError, ValueError):
+        return None
+
+
+def iso_date(date_label):
+    """Chave ISO (``AAAA-MM-DD``) de uma data ``dd/mm/aaaa``, ou None."""
+    parsed = parse_collection_date(date_label)
+    return parsed.isoformat() if parsed else None
+
+
+def make_exam_record(patient_info, exam_data):
+    date_label = patient_info["collectionDate"]
+    return {
+        "date": date_label,
+        "dateKey": iso_date(date_label),
+        "patient_info": patient_info,
+        "data": exam_data,
+    }
+
+
+def _duplicate_key(patient, date_label, date_key):
+    # Datas válidas comparam pela chave ISO ("17/2/2025" == "17/02/2025")
+    return patient, date_key or date_label
+
+
+def _sort_key(date_key):
+    # Lista crescente de chaves para manter os exames em ordem decrescente;
+    # datas inválidas ficam no fim
+    if date_key is None:
+        return float("inf")
+    return -datetime.date.fromisoformat(date_key).toordinal()
+
+
+def _empty_frame():
+    import pandas as pd
+
+    frame = pd.DataFrame({
+        "patient": pd.Series(dtype="object"),
+        "date": pd.Series(dtype="datetime64[ns]"),
+        "date_label": pd.Series(dtype="object"),
+        "category": pd.Series(dtype="object"),
+        "analyte": pd.Series(dtype="object"),
+        "value": pd.Series(dtype="float64"),
+        "unit": pd.Series(dtype="object"),
+        "flag": pd.Series(dtype="bool"),
+    })
+    return frame.set_index(["analyte", "date"])
+
+
+def exam_rows(exam):
+    patient = exam.get("patient_info", {}).get("name", "")
+    for category, items in exam["data"].items():
+        for item in items:
+            value = item.get("numericValue")
+            yield (
+                patient,
+                exam["dateKey"],
+                exam["date"],
+                category,
+                item["name"],
+                float(value) if value is not None else float("nan"),
+                item.get("unit", ""),
+                bool(item.get("isAbnormal", False)),
+            )
+
+
+class HistoryStore:
+    """Tabela longa ``(patient, date, category, analyte, value, unit, flag)``.
+
+    Novos exames entram em um buffer e só são consolidados (concatenação e
+    ordenação do índice) na próxima consulta.
+    """
+
+    def __init__(self):
+        self.exams = []
+        self.exam_count = 0
+        self._sort_keys = []
+        self._date_keys = set()
+        # pandas só é carregado na primeira consulta à tabela
+        self._frame = None
+        self._pending_rows = []
+        # (category, analyte) com ao menos um valor numérico, mantido a cada exame
+        self.metric_keys = set()
+
+    @classmethod
+    def from_exams(cls, exams):
+        store = cls()
+        for exam in exams:
+            store.add_exam(exam)
+        return store
+
+    @classmethod
+    def from_rows(cls, rows, exam_count):
+        """Store só com a tabela, a partir de linhas no formato de ``exam_rows``."""
+        store = cls()
+        store._pending_rows.extend(rows)
+        store._date_keys.update(_duplicate_key(row[0], row[2], row[1]) for row in store._pending_rows)
+        store.metric_keys.update((row[3], row[4]) for row in store._pending_rows if row[5] == row[5])
+        store.exam_count = exam_count
+        return store
+
+    def __len__(self):
+        return self.exam_count
+
+    def __bool__(self):
+        return self.exam_count > 0
+
+    def __iter__(self):
+        return iter(self.exams)
+
+    def add_exam(self, exam):
+        """Insere o exame na posição cronológica (mais recente primeiro)."""
+        if "dateKey" not in exam:
+            exam["dateKey"] = iso_date(exam["date"])
+        # Itens do histórico ficam no formato compacto (nomes e unidades internalizados)
+        exam["data"] = compact_categories(exam["data"])
+        sort_key = _sort_key(exam["dateKey"])
+        position = bisect.bisect_right(self._sort_keys, sort_key)
+        self._sort_keys.insert(position, sort_key)
+        self.exams.insert(position, exam)
+        self.exam_count += 1
+        patient = exam.get("patient_info", {}).get("name", "")
+        self._date_keys.add(_duplicate_key(patient, exam["date"], exam["dateKey"]))
+        rows = list(exam_rows(exam))
+        self._pending_rows.extend(rows)
+        # NaN != NaN: só entram métricas com valor numérico
+        self.metric_keys.update((row[3], row[4]) for row in rows if row[5] == row[5])
+
+    def has_exam(self, patient, date_label):
+        """Se o paciente já tem um exame na data (mesmo dia, qualquer grafia)."""
+        return _duplicate_key(patient, date_label, iso_date(date_label)) in self._date_keys
+
+    @property
+    def frame(self):
+        import pandas as pd
+
+        if self._frame is None:
+            self._frame = _empty_frame()
+        if self._pending_rows:
+            new_rows = pd.DataFrame(self._pending_rows, columns=COLUMNS)
+            converted = normalize(new_rows["analyte"], new_rows["value"], new_rows["unit"])
+            new_rows["value"] = converted.value
+            new_rows["unit"] = converted.unit
+            new_rows["date"] = pd.to_datetime(new_rows["date"], format=ISO_FORMAT, errors="coerce")
+            new_rows = new_rows.set_index(["analyte", "date"])
+            frames = [self._frame, new_rows] if len(self._frame) else [new_rows]
+            self._frame = pd.concat(frames).sort_index(kind="stable")
+            self._pending_rows = []
+        return self._frame
+
+    def series(self, category, analyte):
+        """Pontos ``(date, date_label, value)`` do analito, em ordem cronológica."""
+        try:
+            # Índice ordenado: a seleção do analito é uma busca binária
+            rows = self.frame.loc[analyte]
+        except KeyError:
+            import pandas as pd
+
+            return pd.DataFrame({"date": pd.Series(dtype="datetime64[ns]"), "date_label": [], "value": []})
+        rows = rows[(rows["category"] == category) & rows["value"].notna()]
+        return rows.reset_index()[["date", "date_label", "value"]]
+
+    def trend(self, category, analyte, current_value=None, current_date=None, current_date_label=None):
+        """Série do analito com o valor do exame atual (se ainda não estiver no
+        histórico), ordenada por data: o que a aba de gráficos exibe."""
+        data = self.series(category, analyte)
+        if current_value is not None and not (data["date_label"] == current_date_label).any():
+            import pandas as pd
+
+            current_point = pd.DataFrame({
+                "date": [pd.Timestamp(current_date)],
+                "date_label": [current_date_label],
+                "value": [float(current_value)],
+            })
+            data = pd.concat([data, current_point], ignore_index=True) if len(data) else current_point
+        return data.sort_values("date", kind="stable")[["date", "value"]]
@@ -0,0 +1,158 @@
+"""Importação de vários laudos de uma vez em um pool de processos.
+
+Cada arquivo é extraído e lido inteiro em um processo do pool. Com vários
+arquivos, as páginas de cada um são extraídas em sequência dentro do
+processo; um arquivo sozinho deixa os outros processos livres, e um PDF
+grande (``extraction.PARALLEL_MIN_PAGES``) tem as páginas extraídas em
+paralelo, como no upload de um arquivo só. O progresso por página
+volta ao processo da interface por uma fila do ``multiprocessing.Manager``
+criada para cada importação, de modo que sessões simultâneas não leem os
+eventos umas das outras.
+
+Se um processo do pool morre (``BrokenProcessPool``), os arquivos em
+andamento voltam como erro e o pool é recriado na importação seguinte.
+"""
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from processador.extraction import PdfPageStream
+from processador.instrumentation import Recorder
+from processador.parsing import ReportParser
+
+DEFAULT_UPLOAD_WORKERS = int(os.environ.get("PROCESSADOR_UPLOAD_WORKERS", "0")) or os.cpu_count() or 1
+POLL_INTERVAL = 0.1
+
+
+def parse_file(data, filename, task_id=None, progress_queue=None, page_workers=1):
+    """Extrai e lê um laudo; devolve ``(patient_info, categories, etapas)``.
+
+    ``etapas`` traz ``(nome, parede, CPU, itens)`` da extração
+    (``upload_extraction``, itens = páginas) e da leitura (``upload_parse``,
+    itens = resultados), para o processo da interface registrar em
+    ``instrumentation.recorder``. Com ``progress_queue``, publica
+    ``(task_id, página, total)`` a cada página. ``page_workers`` vai para
+    ``PdfPageStream`` (None: pelo número de páginas).
+    """
+    # Registro local: mede a extração página a página, sem o tempo do parser
+    timer = Recorder(enabled=True)
+    wall, cpu = time.perf_counter(), time.thread_time()
+    parser = ReportParser()
+    if filename.lower().endswith('.pdf'):
+        # Abrir o documento também conta como extração
+        with timer.stage("upload_extraction"):
+            pages = PdfPageStream(data, workers=page_workers)
+        total = len(pages)
+    else:
+        pages = [data.decode("utf-8")]
+        total = 1
+    for index, page_text in enumerate(timer.iterate("upload_extraction", pages)):
+        parser.feed(page_text)
+        if progress_queue is not None:
+            progress_queue.put((task_id, index + 1, total))
+    patient_info, categories = parser.close()
+    wall, cpu = time.perf_counter() - wall, time.thread_time() - cpu
+
+    extraction = timer.totals()["upload_extraction"]
+    stages = (
+        ("upload_extraction", extraction["wall_s"], extraction["cpu_s"], total),
+        ("upload_parse", wall - extraction["wall_s"], cpu - extraction["cpu_s"], parser.result_count),
+    )
+    return patient_info, categories, stages
+
+
+class UploadPool:
+    """Pool limitado compartilhado pelas sessões do processo."""
+
+    def __init__(self, workers=DEFAULT_UPLOAD_WORKERS):
+        self.workers = max(1, workers)
+        self.restarts = 0
+        self._executor = None
+        self._manager = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self):
+        # Processos só são criados na primeira importação
+        with self._lock:
+            if self._manager is None:
+                import multiprocessing
+
+                self._manager = multiprocessing.Manager()
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            return self._executor
+
+    def _discard(self, executor):
+        """Descarta ``executor`` quebrado; o próximo ``_ensure_started`` cria outro."""
+        with self._lock:
+            if self._executor is not executor:
+                # Outra sessão já trocou o pool
+                return
+            self._executor = None
+            self.restarts += 1
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _submit(self, files, progress_queue, page_workers):
+        def submit_all(executor):
+            return {
+                executor.submit(parse_file, data, filename, task_id, progress_queue, page_workers): task_id
+                for task_id, filename, data in files
+            }
+
+        executor = self._ensure_started()
+        try:
+            return executor, submit_all(executor)
+        except BrokenProcessPool:
+            # Quebrado antes desta importação: uma nova tentativa com um pool novo
+            self._discard(executor)
+            executor = self._ensure_started()
+            return executor, submit_all(executor)
+
+    def run(self, files, on_progress=None):
+        """Processa ``[(task_id, filename, data)]`` e produz ``(task_id, resultado, erro)``
+        na ordem em que os arquivos terminam.
+
+        ``on_progress(task_id, página, total)`` é chamado no processo atual,
+        entre as conclusões, com os eventos publicados pelos processos.
+        """
+        if not files:
+            return
+        self._ensure_started()
+        progress_queue = self._manager.Queue() if on_progress else None
+        # Um arquivo só: páginas em paralelo se o PDF for grande
+        page_workers = None if len(files) == 1 else 1
+        executor, futures = self._submit(files, progress_queue, page_workers)
+
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, timeout=POLL_INTERVAL, return_when=FIRST_COMPLETED)
+            if progress_queue is not None:
+                _drain(progress_queue, on_progress)
+            for future in done:
+                try:
+                    yield futures[future], future.result(), None
+                except BrokenProcessPool as e:
+                    self._discard(executor)
+                    yield futures[future], None, e
+                except Exception as e:
+                    yield futures[future], None, e
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+        if self._manager is not None:
+            self._manager.shutdown()
+        self._executor = self._manager = None
+
+
+def _drain(progress_queue, on_progress):
+    while True:
+        try:
+            event = progress_queue.get_nowait()
+        except queue.Empty:
+            return
+        on_progress(*event)
@@ -0,0 +1,272 @@
+"""Medição por etapa do pipeline (extração, leitura, histórico, renderização...).
+
+Cada etapa registra tempo de parede, tempo de CPU da thread, pico de
+memória alocada (opcional, via ``tracemalloc``) e número de itens. Os
+registros alimentam o painel "Desempenho" da barra lateral, linhas de log
+estruturadas (JSON no logger ``processador.perf``) e, se configurado, um
+arquivo texto no formato do Prometheus (node_exporter textfile).
+
+Desligado, ``stage`` devolve um contexto nulo compartilhado e ``iterate``
+devolve o próprio iterável: o custo é uma checagem de atributo.
+
+O recorder é do processo (todas as sessões): ligar a medição e o
+``tracemalloc`` é configuração do servidor, por ambiente, e não da
+interface. ``set_context`` marca as etapas de cada execução do script para
+que o painel de uma sessão mostre só as suas.
+
+Configuração por ambiente:
+    PROCESSADOR_PERF=1               liga a medição na partida
+    PROCESSADOR_PERF_MEMORY=1        mede pico de memória (tracemalloc)
+    PROCESSADOR_PERF_PROM=<arquivo>  grava as métricas no formato Prometheus
+    PROCESSADOR_PERF_LOG=1           escreve uma linha JSON por etapa no stderr
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import deque, namedtuple
+
+logger = logging.getLogger("processador.perf")
+
+StageRecord = namedtuple("StageRecord", "name wall_s cpu_s peak_bytes items timestamp context")
+
+
+class _NullStage:
+    """Contexto usado quando a medição está desligada.
+
+    É compartilhado por todos os chamadores: ``stage.items = n`` é ignorado.
+    """
+
+    __slots__ = ()
+    items = None
+
+    def __setattr__(self, name, value):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    __slots__ = ("recorder", "name", "items", "_wall", "_cpu", "_memory_start", "_peak")
+
+    def __init__(self, recorder, name, items):
+        self.recorder = recorder
+        self.name = name
+        self.items = items
+        self._memory_start = None
+
+    def __enter__(self):
+        if self.recorder.track_memory:
+            stack = self.recorder._memory_stack()
+            current, peak = tracemalloc.get_traced_memory()
+            if stack:
+                # O pico da etapa externa não pode se perder com o reset
+                stack[-1]._peak = max(stack[-1]._peak, peak)
+            tracemalloc.reset_peak()
+            self._memory_start = current
+            self._peak = current
+            stack.append(self)
+        self._cpu = time.thread_time()
+        self._wall = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        wall = time.perf_counter() - self._wall
+        cpu = time.thread_time() - self._cpu
+        peak_bytes = None
+        # Só mede memória se o tracemalloc já estava ligado na entrada da etapa
+        if self._memory_start is not None and tracemalloc.is_tracing():
+            stack = self.recorder._memory_stack()
+            peak = max(self._peak, tracemalloc.get_traced_memory()[1])
+            peak_bytes = peak - self._memory_start
+            if self in stack:
+                stack.remove(self)
+            if stack:
+                stack[-1]._peak = max(stack[-1]._peak, peak)
+        self.recorder.record(self.name, wall, cpu, peak_bytes, self.items)
+        return False
+
+
+class _TimedIterator:
+    """Mede o tempo gasto produzindo os itens (ex.: extração página a página),
+    sem contar o que o consumidor faz com cada um."""
+
+    def __init__(self, recorder, name, iterable):
+        self.recorder = recorder
+        self.name = name
+        self._iterator = iter(iterable)
+        self._wall = 0.0
+        self._cpu = 0.0
+        self._items = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            item = next(self._iterator)
+        except StopIteration:
+            self._wall += time.perf_counter() - wall
+            self._cpu += time.thread_time() - cpu
+            self.recorder.record(self.name, self._wall, self._cpu, None, self._items)
+            raise
+        self._wall += time.perf_counter() - wall
+        self._cpu += time.thread_time() - cpu
+        self._items += 1
+        return item
+
+
+class Recorder:
+    """Registro de etapas compartilhado pelo processo (todas as sessões)."""
+
+    def __init__(self, enabled=False, track_memory=False, prometheus_path=None, history=200):
+        self.enabled = enabled
+        self.track_memory = False
+        self.prometheus_path = prometheus_path
+        self._recent = deque(maxlen=history)
+        self._totals = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        if track_memory:
+            self.set_track_memory(True)
+
+    @classmethod
+    def from_env(cls, environ=os.environ):
+        if environ.get("PROCESSADOR_PERF_LOG", "") not in ("", "0") and not logger.handlers:
+            handler = logging.StreamHandler()
+            handler.setFormatter(logging.Formatter("%(asctime)s %(name)s %(message)s"))
+            logger.addHandler(handler)
+            logger.setLevel(logging.INFO)
+        return cls(
+            enabled=environ.get("PROCESSADOR_PERF", "") not in ("", "0"),
+            track_memory=environ.get("PROCESSADOR_PERF_MEMORY", "") not in ("", "0"),
+            prometheus_path=environ.get("PROCESSADOR_PERF_PROM") or None,
+        )
+
+    def set_track_memory(self, enabled):
+        if enabled and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        elif not enabled and self.track_memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self.track_memory = enabled
+
+    def _memory_stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def stage(self, name, items=None):
+        """Contexto que mede uma etapa; ``items`` pode ser definido dentro do bloco."""
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name, items)
+
+    def iterate(self, name, iterable):
+        if not self.enabled:
+            return iterable
+        return _TimedIterator(self, name, iterable)
+
+    def set_context(self, context):
+        """Marca as etapas registradas a seguir nesta thread (ex.: a execução
+        do script de uma sessão), para ``recent(context=...)``."""
+        self._local.context = context
+
+    def record(self, name, wall_s, cpu_s, peak_bytes=None, items=None):
+        context = getattr(self._local, "context", None)
+        entry = StageRecord(name, wall_s, cpu_s, peak_bytes, items, time.time(), context)
+        with self._lock:
+            self._recent.append(entry)
+            totals = self._totals.get(name)
+            if totals is None:
+                totals = self._totals[name] = {"calls": 0, "wall_s": 0.0, "cpu_s": 0.0, "items": 0, "peak_bytes": 0}
+            totals["calls"] += 1
+            totals["wall_s"] += wall_s
+            totals["cpu_s"] += cpu_s
+            totals["items"] += items or 0
+            if peak_bytes is not None:
+                totals["peak_bytes"] = max(totals["peak_bytes"], peak_bytes)
+
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(json.dumps({
+                "event": "stage", "stage": name, "wall_ms": round(wall_s * 1000, 3),
+                "cpu_ms": round(cpu_s * 1000, 3), "peak_bytes": peak_bytes, "items": items,
+            }))
+        return entry
+
+    def recent(self, limit=None, context=None):
+        with self._lock:
+            entries = list(self._recent)
+        if context is not None:
+            entries = [entry for entry in entries if entry.context == context]
+        return entries[-limit:] if limit else entries
+
+    def totals(self):
+        with self._lock:
+            return {name: dict(values) for name, values in self._totals.items()}
+
+    def reset(self):
+        with self._lock:
+            self._recent.clear()
+            self._totals.clear()
+
+    def prometheus_text(self):
+        lines = []
+        metrics = [
+            ("processador_stage_calls_total", "counter", "Execuções da etapa", "calls"),
+            ("processador_stage_wall_seconds_total", "counter", "Tempo de parede acumulado", "wall_s"),
+            ("processador_stage_cpu_seconds_total", "counter", "Tempo de CPU acumulado (thread)", "cpu_s"),
+            ("processador_stage_items_total", "counter", "Itens processados", "items"),
+            ("processador_stage_peak_bytes", "gauge", "Maior pico de memória alocada", "peak_bytes"),
+        ]
+        totals = self.totals()
+        for metric, kind, help_text, field in metrics:
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} {kind}")
+            for name, values in sorted(totals.items()):
+                label = name.replace("\\", "\\\\").replace('"', '\\"')
+                lines.append(f'{metric}{{stage="{label}"}} {values[field]}')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path=None):
+        """Grava as métricas de forma atômica (o coletor nunca lê um arquivo pela metade).
+
+        Devolve o caminho gravado, ou ``None`` se não há destino ou a gravação falhou.
+        """
+        path = path or self.prometheus_path
+        if not path:
+            return None
+        # Nome único por chamada: sessões em threads diferentes gravam ao mesmo tempo
+        temporary = None
+        try:
+            descriptor, temporary = tempfile.mkstemp(
+                dir=os.path.dirname(path) or ".", prefix=".processador-", suffix=".tmp")
+            with os.fdopen(descriptor, "w", encoding="utf-8") as handle:
+                handle.write(self.prometheus_text())
+            os.chmod(temporary, 0o644)  # mkstemp cria 0600; o coletor roda com outro usuário
+            os.replace(temporary, path)
+        except OSError as error:
+            # Falha na exportação não pode derrubar a execução do app
+            logger.warning("não foi possível gravar %s: %s", path, error)
+            if temporary and os.path.exists(temporary):
+                try:
+                    os.unlink(temporary)
+                except OSError:
+                    pass
+            return None
+        return path
+
+
+recorder = Recorder.from_env()
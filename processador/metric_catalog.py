@@ -0,0 +1,97 @@
+"""Catálogo de métricas da aba de gráficos, mantido de forma incremental.
+
+Guarda, em conjuntos indexados por ``(category, name)``, as métricas com
+valores no histórico, as métricas numéricas do exame atual e a seleção do
+usuário. Cada novo exame atualiza o catálogo uma vez; a aba de gráficos só
+lê o resultado.
+"""
+
+from processador.units import canonical_unit_for
+
+
+def metric_key(metric):
+    return (metric['category'], metric['name'])
+
+
+class MetricCatalog:
+    def __init__(self):
+        self.history_keys = set()
+        self._current_exam = None
+        self._current_metrics = []
+        self._current_keys = set()
+        self._available = []
+        self._available_dirty = False
+        self._selected = {}
+
+    # Histórico
+
+    def add_history_exam(self, exam_data):
+        """Registra as métricas numéricas de um exame adicionado ao histórico."""
+        for category, items in exam_data.items():
+            for item in items:
+                if item.get('numericValue') is not None:
+                    self._add_history_key((category, item['name']))
+
+    def reset_history(self, keys):
+        self.history_keys = set(keys)
+        self._available_dirty = True
+
+    def _add_history_key(self, key):
+        if key in self.history_keys:
+            return
+        self.history_keys.add(key)
+        # Só recalcula a lista disponível se a métrica existe no exame atual
+        if key in self._current_keys:
+            self._available_dirty = True
+
+    # Exame atual
+
+    def set_current(self, exam_data):
+        if exam_data is self._current_exam:
+            return
+        self._current_exam = exam_data
+        self._current_metrics = []
+        self._current_keys = set()
+        seen = set()
+        for category, items in (exam_data or {}).items():
+            for item in items:
+                if item.get('numericValue') is None:
+                    continue
+                # Unidade canônica: a mesma dos valores da tabela do histórico
+                unit = canonical_unit_for(item['name'], item.get('unit', ''))
+                metric = {"category": category, "name": item['name'], "unit": unit}
+                variant = (category, item['name'], metric['unit'])
+                if variant in seen:
+                    continue
+                seen.add(variant)
+                self._current_metrics.append(metric)
+                self._current_keys.add((category, item['name']))
+        self._available_dirty = True
+
+    def available_metrics(self):
+        """Métricas do exame atual com histórico (Bioquímica sempre aparece)."""
+        if self._available_dirty:
+            self._available = [
+                metric for metric in self._current_metrics
+                if metric['category'] == 'Bioquímica' or metric_key(metric) in self.history_keys
+            ]
+            self._available_dirty = False
+        return self._available
+
+    # Seleção
+
+    def is_selected(self, metric):
+        return metric_key(metric) in self._selected
+
+    def toggle(self, metric):
+        key = metric_key(metric)
+        if key in self._selected:
+            del self._selected[key]
+        else:
+            self._selected[key] = metric
+
+    def set_selection(self, metrics):
+        self._selected = {metric_key(metric): metric for metric in metrics}
+
+    def selected_metrics(self):
+        return list(self._selected.values())
@@ -0,0 +1,59 @@
+"""Cache de laudos já processados, indexado pelo hash do conteúdo."""
+
+import hashlib
+from collections import OrderedDict
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+class ParseCache:
+    """Cache LRU limitado de ``(patient_info, categories)`` por arquivo.
+
+    A chave combina o hash dos bytes com a extensão, já que o mesmo
+    conteúdo é lido de forma diferente como PDF ou como texto.
+    """
+
+    def __init__(self, max_entries=32):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key_for(data, filename):
+        extension = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+        return f"{content_hash(data)}:{extension}"
+
+    def get(self, key):
+        """Resultado em cache para ``key`` (None se ausente)."""
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+        self.misses += 1
+        return None
+
+    def put(self, key, result):
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,281 @@
+"""Motor de leitura dos laudos em texto.
+
+Cada linha passa uma única vez pelo tokenizador, que a classifica como
+cabeçalho, resultado, achado de imagem ou ruído. O motor consome os tokens
+e monta a mesma estrutura ``(patient_info, categories)`` usada pela
+interface.
+"""
+
+import datetime
+import math
+import re
+from collections import namedtuple
+
+from processador.analyte_catalog import CATEGORIES, catalog
+from processador.clinical import DEFAULT_AGE, DEFAULT_IS_FEMALE, EQUATION_2009, parse_sex
+from processador.records import MISSING, ResultItem
+from processador.reference_ranges import flag_abnormal
+from processador.values import parse_value_text
+
+# Tipos de token produzidos pelo tokenizador
+HEADER = 'header'
+RESULT = 'result'
+IMAGE = 'image'
+NOISE = 'noise'
+
+IMAGE_SECTION_MARKER = 'EXAMES DE IMAGEM:'
+HEMOGRAMA_MARKER = 'Hemograma:'
+
+EGFR_NAME = "Estimativa do Ritmo de Filtração Glomerular"
+CREATININE_NAME = "Creatinina"
+
+# Padrões pré-compilados (uma única busca combinada por linha)
+_NAME_RE = re.compile(r'Nome:\s*(.*)')
+_DATE_RE = re.compile(r'Data da Coleta:\s*(.*)')
+_AGE_RE = re.compile(r'Idade:\s*(.*)')
+_SEX_RE = re.compile(r'Sexo:\s*(.*)')
+_BIRTH_DATE_RE = re.compile(r'Data de Nascimento:\s*(.*)')
+_LEADING_INT_RE = re.compile(r'\d+')
+_PATIENT_MARKER_RE = re.compile(r'Nome:|Data da Coleta:|Idade:|Sexo:|Data de Nascimento:')
+_RESULT_RE = re.compile(r'([○●])\s*(.*?):\s*(.*?)\s*\(Referência:\s*(.*?)\)')
+_SUB_RESULT_RE = re.compile(r'○\s*(.*?):\s*(.*?)\s*\(Referência:\s*(.*?)\)')
+_IMAGE_FINDING_RE = re.compile(r'○\s*(.*?):\s*(.*)')
+
+LineToken = namedtuple('LineToken', ['kind', 'category', 'name', 'value', 'reference'])
+
+_NOISE_TOKEN = LineToken(NOISE, None, None, None, None)
+_IMAGE_SECTION_TOKEN = LineToken(HEADER, 'Imagem', None, None, None)
+_HEMOGRAMA_TOKEN = LineToken(HEADER, 'Hemograma', None, None, None)
+
+
+def empty_categories():
+    return {category: [] for category in CATEGORIES}
+
+
+def tokenize_line(line):
+    """Classifica uma linha já normalizada (sem espaços nas pontas).
+
+    ``category`` indica a categoria que a linha ativa, se houver; um token
+    de resultado ou de imagem também pode trocar a categoria corrente.
+    """
+    if IMAGE_SECTION_MARKER in line:
+        return _IMAGE_SECTION_TOKEN
+    if HEMOGRAMA_MARKER in line:
+        return _HEMOGRAMA_TOKEN
+
+    # Palavras-chave do catálogo de analitos (Bioquímica antes de Hormonais)
+    category = catalog.classify(line)
+
+    match = _RESULT_RE.search(line)
+    if match:
+        # Sub-itens (○) têm precedência sobre itens simples (●) na mesma linha
+        if match.group(1) == '●' and '○' in line:
+            sub_match = _SUB_RESULT_RE.search(line)
+            if sub_match:
+                return LineToken(RESULT, category, *sub_match.groups())
+        return LineToken(RESULT, category, *match.groups()[1:])
+
+    image_match = _IMAGE_FINDING_RE.search(line)
+    if image_match:
+        return LineToken(IMAGE, category, image_match.group(1), image_match.group(2), None)
+
+    if category:
+        return LineToken(HEADER, category, None, None, None)
+    return _NOISE_TOKEN
+
+
+def build_result_item(name, value, reference):
+    value = value.strip()
+    parsed = parse_value_text(value)
+    return ResultItem(
+        name.strip(),
+        value,
+        reference.strip(),
+        parsed.number,
+        parsed.unit,
+        # Avaliado em lote ao final do laudo, com os dados do paciente
+        is_abnormal=False,
+        comparator=parsed.comparator or MISSING,
+    )
+
+
+def known_demographics(patient_info):
+    """Idade (anos) e ``is_female`` informados no laudo; ``None`` quando ausentes."""
+    age = None
+    age_match = _LEADING_INT_RE.match(patient_info.get("age", ""))
+    if age_match:
+        age = int(age_match.group())
+    elif patient_info.get("birthDate"):
+        try:
+            birth = datetime.datetime.strptime(patient_info["birthDate"], "%d/%m/%Y").date()
+            reference = datetime.datetime.strptime(patient_info["collectionDate"], "%d/%m/%Y").date()
+            age = reference.year - birth.year - ((reference.month, reference.day) < (birth.month, birth.day))
+        except ValueError:
+            pass
+
+    return age, parse_sex(patient_info.get("sex"))
+
+
+def patient_demographics(patient_info):
+    """Como ``known_demographics``, mas com os padrões históricos (65 anos,
+    masculino) quando o laudo não informa."""
+    age, is_female = known_demographics(patient_info)
+    return (
+        DEFAULT_AGE if age is None else age,
+        DEFAULT_IS_FEMALE if is_female is None else is_female,
+    )
+
+
+def calculated_egfr_item(creatinine_value, age=DEFAULT_AGE, is_female=DEFAULT_IS_FEMALE, equation=EQUATION_2009):
+    """Item calculado de eGFR; None quando a creatinina não permite o cálculo (zero ou negativa)."""
+    # NumPy só é carregado quando há eGFR a calcular
+    from processador.egfr import compute_egfr
+
+    calculated_egfr = compute_egfr(creatinine_value, age, is_female, equation=equation)
+    if math.isnan(calculated_egfr):
+        return None
+    calculated_egfr = int(calculated_egfr)
+    suffix = "CKD-EPI" if equation == EQUATION_2009 else f"CKD-EPI {equation}"
+    return ResultItem(
+        f"Estimativa do Ritmo de Filtração Glomerular ({suffix})",
+        f"{calculated_egfr} mL/min/1,73m²",
+        reference="> 90 mL/min/1,73m²",
+        numeric_value=calculated_egfr,
+        unit="mL/min/1,73m²",
+        is_abnormal=calculated_egfr < 90,
+        is_calculated=True,
+    )
+
+
+class ReportParser:
+    """Versão incremental do motor: recebe o texto em pedaços (por exemplo,
+    uma página de PDF por vez) e mantém apenas a linha ainda incompleta.
+
+    Uma linha pode começar em uma página e terminar na seguinte, como na
+    concatenação original das páginas.
+    """
+
+    # Idade, sexo e nascimento só entram em patient_info quando o laudo traz
+    _PATIENT_FIELDS = (
+        ("name", _NAME_RE), ("collectionDate", _DATE_RE),
+        ("age", _AGE_RE), ("sex", _SEX_RE), ("birthDate", _BIRTH_DATE_RE),
+    )
+
+    def __init__(self, egfr_equation=EQUATION_2009):
+        self.egfr_equation = egfr_equation
+        self.categories = empty_categories()
+        self.patient_info = {"name": "", "collectionDate": ""}
+        self.result_count = 0
+        self._result_items = []
+        self._pending = ""
+        self._current_category = 'Outros'
+        self._in_image_section = False
+        self._creatinine_item = None
+        self._has_egfr = False
+        # Campos do paciente ainda não encontrados e campos cujo valor
+        # continua na próxima linha não vazia ("Nome:" no fim da linha)
+        self._missing_fields = dict(self._PATIENT_FIELDS)
+        self._continued_fields = []
+
+    def feed(self, chunk):
+        lines = (self._pending + chunk).split('\n')
+        self._pending = lines.pop()
+        for line in lines:
+            self._process_line(line)
+
+    def close(self):
+        """Processa o restante do texto e devolve ``(patient_info, categories)``."""
+        self._process_line(self._pending)
+        self._pending = ""
+
+        # Flags de anormalidade em lote, contra as referências compiladas
+        age, is_female = known_demographics(self.patient_info)
+        items = self._result_items
+        flags = flag_abnormal(
+            [item.numeric_value for item in items], [item.reference for item in items], age, is_female
+        )
+        for item, flag in zip(items, flags):
+            item.is_abnormal = flag
+
+        # Verificar se precisamos calcular o clearance de creatinina
+        creatinine_item = self._creatinine_item
+        if creatinine_item is not None and not self._has_egfr and creatinine_item.numeric_value is not None:
+            age, is_female = patient_demographics(self.patient_info)
+            egfr_item = calculated_egfr_item(creatinine_item.numeric_value, age, is_female, self.egfr_equation)
+            if egfr_item is not None:
+                self.categories['Bioquímica'].append(egfr_item)
+                self._has_egfr = True
+
+        return self.patient_info, self.categories
+
+    def _scan_patient_fields(self, line):
+        stripped = line.strip()
+        if self._continued_fields and stripped:
+            for field in self._continued_fields:
+                self.patient_info[field] = stripped
+            self._continued_fields = []
+
+        for field, pattern in list(self._missing_fields.items()):
+            match = pattern.search(line)
+            if match:
+                del self._missing_fields[field]
+                value = match.group(1).strip()
+                if value:
+                    self.patient_info[field] = value
+                else:
+                    self._continued_fields.append(field)
+
+    def _process_line(self, line):
+        if self._continued_fields or (self._missing_fields and _PATIENT_MARKER_RE.search(line)):
+            self._scan_patient_fields(line)
+
+        kind, category, name, value, reference = tokenize_line(line.strip())
+
+        if kind == NOISE:
+            return
+        if kind == HEADER:
+            if category == 'Imagem':
+                self._in_image_section = True
+            else:
+                self._current_category = category
+            return
+
+        if category:
+            self._current_category = category
+
+        if kind == RESULT:
+            item = build_result_item(name, value, reference)
+            self.categories[self._current_category].append(item)
+            self._result_items.append(item)
+            self.result_count += 1
+            if self._current_category == 'Bioquímica':
+                if item.name == CREATININE_NAME and self._creatinine_item is None:
+                    self._creatinine_item = item
+                elif item.name == EGFR_NAME:
+                    self._has_egfr = True
+        elif self._in_image_section:
+            self.categories['Imagem'].append(ResultItem(
+                name.strip(),
+                value.strip(),
+                is_abnormal=True  # Consideramos todos os achados de imagem como relevantes
+            ))
+            self.result_count += 1
+
+
+def parse_report_text(text):
+    """Processa o texto de um laudo e devolve ``(patient_info, categories)``.
+
+    Exceções de conversão são propagadas; cabe a quem chama decidir como
+    exibi-las.
+    """
+    parser = ReportParser()
+    parser.feed(text)
+    return parser.close()
+
+
+def parse_report_chunks(chunks):
+    """Como ``parse_report_text``, mas consumindo um iterável de pedaços de texto."""
+    parser = ReportParser()
+    for chunk in chunks:
+        parser.feed(chunk)
+    return parser.close()
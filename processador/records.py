@@ -0,0 +1,118 @@
+"""Registro compacto de um resultado de exame.
+
+``ResultItem`` guarda os campos em ``__slots__`` (sem ``__dict__`` por
+item) e internaliza nome, unidade e texto de referência, que se repetem em
+todos os exames do histórico: cada string existe uma única vez no processo.
+
+Para o restante do código o item continua parecendo o dict de antes
+(``item['name']``, ``item.get('unit')``, ``'reference' in item``,
+comparação com dicts). Campos ausentes — como ``reference`` nos achados de
+imagem ou ``comparator`` em valores sem "<"/">" — não aparecem nas chaves. Para JSON, use ``json_default`` ou
+``to_dict``.
+"""
+
+import sys
+from collections.abc import Mapping
+
+# Chave pública (a dos dicts antigos) -> slot
+_FIELDS = (
+    ("name", "name"),
+    ("value", "value"),
+    ("reference", "reference"),
+    ("numericValue", "numeric_value"),
+    ("unit", "unit"),
+    ("isAbnormal", "is_abnormal"),
+    ("isCalculated", "is_calculated"),
+    ("comparator", "comparator"),
+)
+_SLOT_FOR_KEY = dict(_FIELDS)
+_INTERNED_KEYS = ("name", "unit", "reference")
+
+
+class _Missing:
+    __slots__ = ()
+
+    def __repr__(self):
+        return "MISSING"
+
+    def __reduce__(self):
+        # Desserializa como o mesmo sentinela
+        return "MISSING"
+
+
+MISSING = _Missing()
+
+
+def intern_text(text):
+    return sys.intern(text) if type(text) is str else text
+
+
+class ResultItem(Mapping):
+    __slots__ = tuple(slot for _key, slot in _FIELDS)
+
+    def __init__(self, name, value, reference=MISSING, numeric_value=MISSING, unit=MISSING,
+                 is_abnormal=False, is_calculated=MISSING, comparator=MISSING):
+        self.name = intern_text(name)
+        self.value = value
+        self.reference = intern_text(reference)
+        self.numeric_value = numeric_value
+        self.unit = intern_text(unit)
+        self.is_abnormal = is_abnormal
+        self.is_calculated = is_calculated
+        self.comparator = comparator
+
+    @classmethod
+    def from_dict(cls, item):
+        if isinstance(item, cls):
+            return item
+        return cls(**{slot: item[key] for key, slot in _FIELDS if key in item})
+
+    # Interface de dict (somente leitura, exceto pelos campos existentes)
+
+    def __getitem__(self, key):
+        try:
+            value = getattr(self, _SLOT_FOR_KEY[key])
+        except KeyError:
+            raise KeyError(key) from None
+        if value is MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        if key not in _SLOT_FOR_KEY:
+            raise KeyError(key)
+        setattr(self, _SLOT_FOR_KEY[key], intern_text(value) if key in _INTERNED_KEYS else value)
+
+    def __iter__(self):
+        for key, slot in _FIELDS:
+            if getattr(self, slot) is not MISSING:
+                yield key
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __contains__(self, key):
+        slot = _SLOT_FOR_KEY.get(key)
+        return slot is not None and getattr(self, slot) is not MISSING
+
+    def __repr__(self):
+        return f"ResultItem({self.to_dict()!r})"
+
+    def __reduce__(self):
+        # Pickle (pool de processos) pelo construtor, com os campos na ordem dos slots
+        return (ResultItem, tuple(getattr(self, slot) for _key, slot in _FIELDS))
+
+    def to_dict(self):
+        return {key: getattr(self, slot) for key, slot in _FIELDS if getattr(self, slot) is not MISSING}
+
+
+def compact_categories(categories):
+    """Converte os itens de um laudo (dicts lidos do banco, por exemplo) em ``ResultItem``."""
+    return {category: [ResultItem.from_dict(item) for item in items] for category, items in categories.items()}
+
+
+def json_default(obj):
+    """``default`` para ``json.dumps``: registros viram dicts."""
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    return str(obj)
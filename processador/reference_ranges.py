@@ -0,0 +1,227 @@
+"""Compilação dos textos de referência em intervalos estruturados.
+
+Cada texto distinto (``"Homens: 65-175 µg/dL, Mulheres: 50-170 µg/dL"``,
+``"> 90 mL/min/1,73m²"``, ``"150 a 400 mil/µL"``...) é lido uma única vez e
+vira um ``CompiledReference`` memoizado. A avaliação escolhe o intervalo
+mais específico para o sexo e a idade do paciente.
+"""
+
+import functools
+import math
+import re
+import unicodedata
+from collections import namedtuple
+
+MAX_AGE = 130
+
+# Número em formato brasileiro ou simples: 13,0 / 2000,0 / 192.000 / 1.234,5 / 0.5
+# Sinal opcional ("-2,5", "−0,3", "+2") só quando não vem logo após letra ou número:
+# em "65-175" o hífen separa a faixa
+NUMBER_PATTERN = r'(?:(?<![\w.,])[-−+])?\d+(?:[.,]\d+)*'
+
+_MULTIPLIER = r'(?:\s*(mil)\b)?'
+# Sem diferença de maiúsculas: "Inferior a 200", "Até 5,0", "150 A 400 MIL"
+_RANGE_RE = re.compile(
+    rf'({NUMBER_PATTERN}){_MULTIPLIER}\s*(?:a|-|–|até)\s*({NUMBER_PATTERN}){_MULTIPLIER}', re.IGNORECASE
+)
+_LOWER_RE = re.compile(
+    rf'(?:>=|≥|>|superior a|acima de|maior que|maior ou igual a)\s*({NUMBER_PATTERN}){_MULTIPLIER}', re.IGNORECASE
+)
+_UPPER_RE = re.compile(
+    rf'(?:<=|≤|<|inferior a|abaixo de|menor que|menor ou igual a|até)\s*({NUMBER_PATTERN}){_MULTIPLIER}',
+    re.IGNORECASE,
+)
+
+# Condições de idade nos rótulos (texto já sem acentos e minúsculo)
+_AGE_BETWEEN_RE = re.compile(r'(?:de\s+)?(\d+)\s*(?:a|-)\s*(\d+)\s*anos')
+_AGE_ABOVE_RE = re.compile(r'(>=|≥|>|acima de|maior(?:es)? de)\s*(\d+)\s*anos')
+_AGE_BELOW_RE = re.compile(r'(<=|≤|<|abaixo de|menor(?:es)? de|ate)\s*(\d+)\s*anos')
+_MALE_RE = re.compile(r'\b(?:homem|homens|masculino)\b')
+_FEMALE_RE = re.compile(r'\b(?:mulher|mulheres|feminino|gestantes?)\b')
+_ADULT_RE = re.compile(r'\badult[oa]s?\b')
+
+# Segmentos são separados por ";" ou por "," seguida de texto (não decimal)
+_SEGMENT_SPLIT_RE = re.compile(r';|,\s+(?=[^\d\s])')
+
+Interval = namedtuple('Interval', ['low', 'high', 'is_female', 'min_age', 'max_age'])
+
+
+def parse_number(text):
+    """Converte um número em formato brasileiro (``1.234,5``, ``192.000``, ``-2,5``)."""
+    if text[:1] in ('-', '−'):
+        return -parse_number(text[1:])
+    if text[:1] == '+':
+        return parse_number(text[1:])
+    if ',' in text:
+        return float(text.replace('.', '').replace(',', '.'))
+    parts = text.split('.')
+    # "192.000" e "1.500.000" são separadores de milhar; "0.5" é decimal
+    if len(parts) > 1 and all(len(part) == 3 for part in parts[1:]):
+        return float(''.join(parts))
+    return float(text)
+
+
+def _scaled(number, multiplier):
+    value = parse_number(number)
+    return value * 1000 if multiplier else value
+
+
+def _normalize(text):
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(ch for ch in decomposed if not unicodedata.combining(ch)).lower()
+
+
+def _parse_conditions(label):
+    """Devolve ``(is_female, min_age, max_age)`` de um rótulo como
+    ``"Homem > 60 anos"``; ``None`` quando a condição não aparece."""
+    label = _normalize(label)
+    is_female = None
+    if _FEMALE_RE.search(label):
+        is_female = True
+    elif _MALE_RE.search(label):
+        is_female = False
+
+    min_age = max_age = None
+    between = _AGE_BETWEEN_RE.search(label)
+    above = _AGE_ABOVE_RE.search(label)
+    below = _AGE_BELOW_RE.search(label)
+    if between:
+        min_age, max_age = int(between.group(1)), int(between.group(2))
+    if above:
+        age = int(above.group(2))
+        min_age = age if above.group(1) in ('>=', '≥') else age + 1
+    if below:
+        age = int(below.group(2))
+        max_age = age if below.group(1) in ('<=', '≤', 'ate') else age - 1
+    if min_age is None and max_age is None and _ADULT_RE.search(label):
+        min_age = 18
+    return is_female, min_age, max_age
+
+
+def _parse_bounds(spec):
+    """Primeiro intervalo do texto: ``(low, high)`` com ``None`` no lado aberto."""
+    candidates = []
+    for pattern in (_RANGE_RE, _LOWER_RE, _UPPER_RE):
+        match = pattern.search(spec)
+        if match:
+            candidates.append((match.start(), pattern, match))
+    if not candidates:
+        return None
+    _, pattern, match = min(candidates, key=lambda candidate: candidate[0])
+    if pattern is _RANGE_RE:
+        low, low_mult, high, high_mult = match.groups()
+        # "150 a 400 mil": o multiplicador vale para os dois extremos
+        multiplier = low_mult or high_mult
+        return _scaled(low, multiplier), _scaled(high, high_mult or multiplier)
+    if pattern is _LOWER_RE:
+        return _scaled(*match.groups()), None
+    return None, _scaled(*match.groups())
+
+
+def _width(interval):
+    low = interval.low if interval.low is not None else -math.inf
+    high = interval.high if interval.high is not None else math.inf
+    return high - low
+
+
+class CompiledReference:
+    __slots__ = ('text', 'intervals')
+
+    def __init__(self, text, intervals):
+        self.text = text
+        self.intervals = tuple(intervals)
+
+    def __repr__(self):
+        return f"CompiledReference({self.text!r}, {list(self.intervals)!r})"
+
+    def select(self, age=None, is_female=None):
+        """Intervalo que vale para o paciente (o mais específico), ou None.
+
+        Com sexo conhecido, o intervalo daquele sexo vence o geral; sem sexo,
+        vence o geral ("Adultos", sem rótulo) e, entre intervalos de sexos
+        diferentes, o mais largo. Com idade conhecida, prefere a faixa etária
+        mais estreita; sem idade, a mais ampla (a regra geral do laudo).
+        """
+        best = None
+        best_key = None
+        for interval in self.intervals:
+            if is_female is not None and interval.is_female is not None and interval.is_female != is_female:
+                continue
+            min_age = interval.min_age if interval.min_age is not None else 0
+            max_age = interval.max_age if interval.max_age is not None else MAX_AGE
+            if age is not None and not (min_age <= age <= max_age):
+                continue
+            span = max_age - min_age
+            if is_female is None:
+                key = (interval.is_female is None, -span if age is not None else span, _width(interval))
+            else:
+                key = (interval.is_female is not None, -span if age is not None else span)
+            if best_key is None or key > best_key:
+                best, best_key = interval, key
+        return best
+
+    def is_abnormal(self, value, age=None, is_female=None):
+        """``value`` numérico; valores ausentes nunca são marcados."""
+        if value is None or (isinstance(value, float) and math.isnan(value)):
+            return False
+        interval = self.select(age, is_female)
+        if interval is None:
+            return False
+        if interval.low is not None and value < interval.low:
+            return True
+        if interval.high is not None and value > interval.high:
+            return True
+        return False
+
+
+@functools.lru_cache(maxsize=4096)
+def compile_reference(text):
+    """Compila (uma vez por texto distinto) uma referência em intervalos."""
+    intervals = []
+    pending_label = ""
+    for segment in _SEGMENT_SPLIT_RE.split(text or ""):
+        segment = segment.strip()
+        if not segment:
+            continue
+        if ':' in segment:
+            label, spec = segment.split(':', 1)
+            label = f"{pending_label} {label}".strip()
+        else:
+            label, spec = pending_label, segment
+            # Segmento só com faixa etária ("22 a 79 anos") condiciona o seguinte
+            if _AGE_BETWEEN_RE.fullmatch(_normalize(segment)):
+                pending_label = segment
+                continue
+        bounds = _parse_bounds(spec)
+        if bounds is None:
+            continue
+        pending_label = ""
+        intervals.append(Interval(bounds[0], bounds[1], *_parse_conditions(label)))
+    return CompiledReference(text, intervals)
+
+
+def flag_abnormal(numbers, references, age=None, is_female=None):
+    """Avalia em lote: uma lista de flags para pares ``(number, reference)``.
+
+    ``numbers`` são os valores já lidos (``ResultItem.numeric_value``; None
+    quando o resultado não tem número).
+
+    Cada referência distinta é compilada uma única vez (memoizada entre
+    chamadas) e a seleção de intervalo é reaproveitada para o lote.
+    """
+    selected = {}
+    flags = []
+    for number, reference in zip(numbers, references):
+        if not reference:
+            flags.append(False)
+            continue
+        if reference not in selected:
+            selected[reference] = compile_reference(reference).select(age, is_female)
+        interval = selected[reference]
+        flags.append(
+            interval is not None and number is not None and (
+                (interval.low is not None and number < interval.low)
+                or (interval.high is not None and number > interval.high)
+            )
+        )
+    return flags
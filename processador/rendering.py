@@ -0,0 +1,87 @@
+"""Renderização dos resultados em um único bloco HTML por laudo.
+
+Em vez de um ``st.markdown`` por analito, o laudo inteiro (títulos das
+seções e cartões em duas colunas) vira uma única string. Não há cache:
+montar a string custa menos que calcular uma chave pelo conteúdo do exame.
+"""
+
+from html import escape
+
+SECTIONS = [
+    ('Hemograma', 'Hemograma'),
+    ('Bioquímica', 'Bioquímica'),
+    ('Hormonais', 'Hormonais'),
+    ('Outros', 'Outros Exames'),
+]
+
+_GRID_STYLE = "display: grid; grid-template-columns: repeat(2, minmax(0, 1fr)); column-gap: 1rem;"
+_CARD_ROW_STYLE = "display: flex; justify-content: space-between;"
+
+_CALCULATED_CARD = (
+    '<div style="background-color: rgba(33, 150, 243, 0.1); border-left: 4px solid #2196F3; padding: 10px; border-radius: 5px; margin-bottom: 10px;">'
+    f'<div style="{_CARD_ROW_STYLE}">'
+    '<span style="font-weight: 500;">{name} <span style="font-size: 0.8em; color: #2196F3;">(calculado)</span></span>'
+    '<span style="font-weight: 700; color: {color};">{value}</span>'
+    '</div></div>'
+)
+_ABNORMAL_CARD = (
+    '<div style="background-color: rgba(255, 0, 0, 0.1); border-left: 4px solid #EF5350; padding: 10px; border-radius: 5px; margin-bottom: 10px;">'
+    f'<div style="{_CARD_ROW_STYLE}">'
+    '<span style="font-weight: 500;">{name}</span>'
+    '<span style="font-weight: 700; color: #D32F2F;">{value}</span>'
+    '</div></div>'
+)
+_NORMAL_CARD = (
+    '<div style="background-color: #F5F5F5; padding: 10px; border-radius: 5px; margin-bottom: 10px;">'
+    f'<div style="{_CARD_ROW_STYLE}">'
+    '<span style="font-weight: 500;">{name}</span>'
+    '<span>{value}</span>'
+    '</div></div>'
+)
+_IMAGE_ITEM = (
+    '<div style="margin-bottom: 8px;">'
+    '<span style="font-weight: 500;">{name}:</span>'
+    '<span style="margin-left: 8px;">{value}</span>'
+    '</div>'
+)
+
+
+def render_card(item):
+    name = escape(str(item['name']))
+    value = escape(str(item['value']))
+    if item.get('isCalculated', False):
+        color = '#D32F2F' if item['isAbnormal'] else '#000'
+        return _CALCULATED_CARD.format(name=name, value=value, color=color)
+    if item['isAbnormal']:
+        return _ABNORMAL_CARD.format(name=name, value=value)
+    return _NORMAL_CARD.format(name=name, value=value)
+
+
+def render_section(title, items):
+    # Título em Markdown e cartões em grade de duas colunas (como st.columns(2)).
+    # Sem linhas em branco nem indentação, para o Markdown não quebrar o HTML.
+    cards = ''.join(render_card(item) for item in items)
+    return f'### {title}\n\n<div style="{_GRID_STYLE}">{cards}</div>'
+
+
+def render_image_section(items):
+    findings = ''.join(
+        _IMAGE_ITEM.format(name=escape(str(item['name'])), value=escape(str(item['value'])))
+        for item in items
+    )
+    return (
+        '### Exames de Imagem\n\n'
+        f'<div style="background-color: #F5F5F5; padding: 15px; border-radius: 5px;">{findings}</div>'
+    )
+
+
+def render_exam_html(exam_data):
+    """HTML (com títulos em Markdown) do laudo inteiro."""
+    blocks = [
+        render_section(title, exam_data[category])
+        for category, title in SECTIONS
+        if exam_data.get(category)
+    ]
+    if exam_data.get('Imagem'):
+        blocks.append(render_image_section(exam_data['Imagem']))
+    return '\n\n'.join(blocks)
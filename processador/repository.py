@@ -0,0 +1,291 @@
+"""Persistência dos exames em SQLite (modo WAL).
+
+Cada exame é gravado uma vez com o laudo completo em JSON e, em paralelo,
+uma linha por analito na tabela ``results`` para consultas indexadas por
+paciente, data de coleta e analito. Cada linha guarda também o valor na
+unidade canônica do analito (``canonical_value``, ``canonical_unit`` e o
+``unit_factor`` aplicado, ver ``processador.units``), calculado na gravação;
+gráficos e coortes leem essas colunas. ``ingested_files`` liga o hash do
+arquivo enviado ao exame, para que o mesmo arquivo não seja lido de novo.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+
+from processador.history_store import iso_date
+from processador.parsing import known_demographics
+from processador.records import json_default
+from processador.units import normalize
+from processador.values import parse_values
+
+DEFAULT_DB_PATH = os.environ.get(
+    "PROCESSADOR_DB_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "exames.sqlite3"),
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS exams (
+    id INTEGER PRIMARY KEY,
+    patient TEXT NOT NULL,
+    collection_date TEXT,
+    date_label TEXT NOT NULL,
+    patient_info TEXT NOT NULL,
+    data TEXT NOT NULL,
+    created_at TEXT NOT NULL DEFAULT (datetime('now')),
+    UNIQUE (patient, date_label)
+);
+CREATE INDEX IF NOT EXISTS idx_exams_patient_date ON exams (patient, collection_date DESC);
+
+CREATE TABLE IF NOT EXISTS results (
+    exam_id INTEGER NOT NULL REFERENCES exams (id) ON DELETE CASCADE,
+    patient TEXT NOT NULL,
+    collection_date TEXT,
+    category TEXT NOT NULL,
+    analyte TEXT NOT NULL,
+    value TEXT,
+    reference TEXT,
+    numeric_value REAL,
+    unit TEXT,
+    is_abnormal INTEGER NOT NULL DEFAULT 0,
+    is_calculated INTEGER NOT NULL DEFAULT 0,
+    canonical_value REAL,
+    canonical_unit TEXT,
+    unit_factor REAL
+);
+CREATE INDEX IF NOT EXISTS idx_results_patient_analyte_date ON results (patient, analyte, collection_date);
+CREATE INDEX IF NOT EXISTS idx_results_analyte_date ON results (analyte, collection_date);
+CREATE INDEX IF NOT EXISTS idx_results_exam ON results (exam_id);
+
+CREATE TABLE IF NOT EXISTS ingested_files (
+    source_hash TEXT PRIMARY KEY,
+    exam_id INTEGER NOT NULL REFERENCES exams (id) ON DELETE CASCADE,
+    filename TEXT,
+    ingested_at TEXT NOT NULL DEFAULT (datetime('now'))
+);
+"""
+
+# PRAGMA user_version: 1 = colunas canônicas em results
+SCHEMA_VERSION = 1
+_ADDED_RESULT_COLUMNS = (
+    ("canonical_value", "REAL"),
+    ("canonical_unit", "TEXT"),
+    ("unit_factor", "REAL"),
+)
+
+
+def canonical_columns(analytes, numeric_values, units):
+    """``[(canonical_value, canonical_unit, unit_factor)]`` das linhas, em uma passada."""
+    numeric_values = [float("nan") if value is None else value for value in numeric_values]
+    converted = normalize(analytes, numeric_values, units)
+    return [
+        (None if value != value else float(value), unit, float(factor))
+        for value, unit, factor in zip(*converted)
+    ]
+
+
+def _exam_from_row(row):
+    return {
+        "id": row["id"],
+        "date": row["date_label"],
+        "dateKey": row["collection_date"],
+        "patient_info": json.loads(row["patient_info"]),
+        "data": json.loads(row["data"]),
+    }
+
+
+class ExamRepository:
+    """Repositório de exames. Uma conexão por instância, protegida por lock,
+    para poder ser compartilhada entre as threads do Streamlit."""
+
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(SCHEMA)
+        self._migrate()
+
+    def _migrate(self):
+        """Acrescenta as colunas canônicas a bancos antigos e preenche as linhas já gravadas."""
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+            return
+        existing = {row["name"] for row in self._conn.execute("PRAGMA table_info(results)")}
+        with self._conn:
+            for name, kind in _ADDED_RESULT_COLUMNS:
+                if name not in existing:
+                    self._conn.execute(f"ALTER TABLE results ADD COLUMN {name} {kind}")
+            rows = self._conn.execute(
+                "SELECT rowid, analyte, value, reference, numeric_value, unit, is_calculated "
+                "FROM results WHERE unit_factor IS NULL"
+            ).fetchall()
+            self._backfill_canonical(rows)
+            # Dentro da transação: só marca a versão se o preenchimento foi gravado
+            self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def _backfill_canonical(self, rows):
+        if not rows:
+            return
+        # Número e unidade relidos do texto (linhas antigas leram "192.000" como 192,0);
+        # valores calculados e achados de imagem ficam como foram gravados
+        parsed = parse_values([row["value"] for row in rows])
+        numbers, units = [], []
+        for row, number, unit in zip(rows, parsed.numeric, parsed.unit):
+            if row["reference"] is None or row["is_calculated"]:
+                numbers.append(row["numeric_value"])
+                units.append(row["unit"])
+            else:
+                numbers.append(None if number != number else float(number))
+                units.append(unit)
+        canonical = canonical_columns([row["analyte"] for row in rows], numbers, units)
+        self._conn.executemany(
+            "UPDATE results SET canonical_value = ?, canonical_unit = ?, unit_factor = ? WHERE rowid = ?",
+            [(*columns, row["rowid"]) for columns, row in zip(canonical, rows)],
+        )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def save_exam(self, patient_info, exam_data):
+        """Grava o exame e devolve ``(exam_id, created)``.
+
+        Um exame já existente para o mesmo paciente e data não é
+        sobrescrito, como no histórico em memória.
+        """
+        patient = patient_info.get("name", "")
+        date_label = patient_info.get("collectionDate", "")
+        collection_date = iso_date(date_label)
+
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO exams (patient, collection_date, date_label, patient_info, data) "
+                "VALUES (?, ?, ?, ?, ?) ON CONFLICT (patient, date_label) DO NOTHING",
+                (patient, collection_date, date_label,
+                 json.dumps(patient_info, ensure_ascii=False),
+                 json.dumps(exam_data, ensure_ascii=False, default=json_default)),
+            )
+            if cursor.rowcount == 0:
+                row = self._conn.execute(
+                    "SELECT id FROM exams WHERE patient = ? AND date_label = ?",
+                    (patient, date_label),
+                ).fetchone()
+                return row["id"], False
+
+            exam_id = cursor.lastrowid
+            rows = [
+                (exam_id, patient, collection_date, category, item["name"], item.get("value"),
+                 item.get("reference"), item.get("numericValue"), item.get("unit"),
+                 int(bool(item.get("isAbnormal"))), int(bool(item.get("isCalculated"))))
+                for category, items in exam_data.items()
+                for item in items
+            ]
+            canonical = canonical_columns([row[4] for row in rows], [row[7] for row in rows], [row[8] for row in rows])
+            self._conn.executemany(
+                "INSERT INTO results (exam_id, patient, collection_date, category, analyte, value, "
+                "reference, numeric_value, unit, is_abnormal, is_calculated, "
+                "canonical_value, canonical_unit, unit_factor) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [row + columns for row, columns in zip(rows, canonical)],
+            )
+            return exam_id, True
+
+    def patients(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT DISTINCT patient FROM exams ORDER BY patient").fetchall()
+        return [row["patient"] for row in rows]
+
+    def count_exams(self, patient):
+        with self._lock:
+            row = self._conn.execute("SELECT COUNT(*) AS n FROM exams WHERE patient = ?", (patient,)).fetchone()
+        return row["n"]
+
+    def list_exams(self, patient, limit=None, offset=0):
+        """Exames do paciente, do mais recente para o mais antigo, paginados."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, date_label, collection_date, patient_info, data FROM exams WHERE patient = ? "
+                "ORDER BY collection_date DESC, id DESC LIMIT ? OFFSET ?",
+                (patient, -1 if limit is None else limit, offset),
+            ).fetchall()
+        return [_exam_from_row(row) for row in rows]
+
+    def latest_exam(self, patient):
+        exams = self.list_exams(patient, limit=1)
+        return exams[0] if exams else None
+
+    def history_rows(self, patient):
+        """Linhas do paciente no formato de ``history_store.exam_rows``."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT r.patient, r.collection_date, e.date_label, r.category, r.analyte, "
+                "r.canonical_value, r.canonical_unit, r.is_abnormal "
+                "FROM results r JOIN exams e ON e.id = r.exam_id WHERE r.patient = ?",
+                (patient,),
+            ).fetchall()
+        return [
+            (row[0], row[1], row[2], row[3], row[4],
+             float("nan") if row[5] is None else row[5], row[6] or "", bool(row[7]))
+            for row in rows
+        ]
+
+    def data_version(self):
+        """Muda sempre que um exame é gravado; serve de chave para caches de coorte."""
+        with self._lock:
+            row = self._conn.execute("SELECT COUNT(*) AS n, MAX(id) AS last_id FROM exams").fetchone()
+        return row["n"], row["last_id"]
+
+    def analytes(self):
+        """Analitos numéricos presentes no repositório, com o número de pacientes."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT analyte, COUNT(DISTINCT patient) AS patients FROM results "
+                "WHERE canonical_value IS NOT NULL GROUP BY analyte ORDER BY analyte"
+            ).fetchall()
+        return [(row["analyte"], row["patients"]) for row in rows]
+
+    def cohort_rows(self, analyte):
+        """Resultados de um analito para todos os pacientes, no formato de
+        ``cohort.results_frame``, com a idade e o sexo informados no laudo."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT r.patient, r.collection_date, r.category, r.analyte, r.canonical_value, "
+                "r.canonical_unit, r.is_abnormal, r.reference, r.unit_factor, r.exam_id, e.patient_info "
+                "FROM results r JOIN exams e ON e.id = r.exam_id "
+                "WHERE r.analyte = ? AND r.canonical_value IS NOT NULL "
+                "ORDER BY r.patient, r.collection_date, r.exam_id",
+                (analyte,),
+            ).fetchall()
+        # Demografia lida uma vez por exame, como na leitura do laudo
+        demographics = {}
+        result = []
+        for row in rows:
+            exam_id = row["exam_id"]
+            if exam_id not in demographics:
+                demographics[exam_id] = known_demographics(json.loads(row["patient_info"]))
+            result.append((*tuple(row)[:9], *demographics[exam_id]))
+        return result
+
+    def ingested_exam(self, source_hash):
+        """Exame já importado a partir de um arquivo com este hash, ou None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT e.id, e.date_label, e.collection_date, e.patient_info, e.data "
+                "FROM ingested_files f JOIN exams e ON e.id = f.exam_id WHERE f.source_hash = ?",
+                (source_hash,),
+            ).fetchone()
+        return _exam_from_row(row) if row else None
+
+    def record_ingested(self, source_hash, exam_id, filename):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO ingested_files (source_hash, exam_id, filename) VALUES (?, ?, ?) "
+                "ON CONFLICT (source_hash) DO NOTHING",
+                (source_hash, exam_id, filename),
+            )
@@ -0,0 +1,50 @@
+"""Laudo de exemplo usado pela interface e pelos benchmarks."""
+
+SAMPLE_REPORT_TEXT = """Resultados de Exames para PEP
+Dados do Paciente:
+● Nome: Nicomedes Ferreira Filho
+● Data da Coleta: 17/02/2025
+Resultados:
+● Hemograma:
+○ Hemoglobina: 11,4 g/dL (Referência: 13,0 a 17,0 g/dL)
+○ VCM: 91,0 fL (Referência: 83,0 a 101,0 fL)
+○ HCM: 30,3 pg (Referência: 27,0 a 32,0 pg)
+○ Leucócitos: 5340/µL (Referência: 4000 a 10000/µL)
+○ Segmentados: 56,9% (Referência: 2000,0 a 7000,0)
+○ Eosinófilos: 13,5% (Referência: 20,0 a 500,0)
+○ Linfócitos: 19,3% (Referência: 1000,0 a 3000,0)
+○ Monócitos: 8,4% (Referência: 200,0 a 1000,0)
+○ Basófilos: 1,9% (Referência: 20,0 a 100,0)
+○ Plaquetas: 192.000/µL (Referência: 150 a 400 mil/µL)
+● Ferro Sérico: 98 µg/dL (Referência: Mulheres: 50-170 µg/dL, Homens: 65-175 µg/dL)
+● Capacidade Total de Combinação do Ferro: 259 µg/dL (Referência: 250 a 450 µg/dL)
+● Ferritina: 106 ng/mL (Referência: Homens: 21,81-274,66 ng/mL, Mulheres: 4,63-204,00 ng/mL)
+● Proteínas Totais e Fracionadas:
+○ Proteínas Totais: 6,6 g/dL (Referência: 6,4-8,3 g/dL)
+○ Albumina: 4,2 g/dL (Referência: 3,5-5,0 g/dL)
+○ Globulina: 2,4 g/dL
+○ Relação A/G: 1,8
+● Bilirrubinas:
+○ Total: 0,55 mg/dL (Referência: Adulto: 0,2 a 1,2 mg/dL)
+○ Direta: 0,26 mg/dL (Referência: Adulto: 0,0 a 0,5 mg/dL)
+○ Indireta: 0,29 mg/dL (Referência: Adulto: 0,2 a 0,7 mg/dL)
+● Fosfatase Alcalina: 140 U/L (Referência: 22 a 79 anos, Homens: 50-116 U/L)
+● Ureia: 145,00 mg/dL (Referência: Adultos: 12,8-42,8 mg/dL, Adultos > 60 anos: 17,1-49,2 mg/dL)
+● Creatinina: 3,18 mg/dL (Referência: Adultos: 0,5-1,00 mg/dL, Homem > 60 anos: 0,6-1,20 mg/dL)
+● Cálcio: 8,8 mg/dL (Referência: Adulto: 8,4 a 10,2 mg/dL, Homem > 60 anos: 8,8 a 10,0 mg/dL)
+● Estimativa do Ritmo de Filtração Glomerular: 18 mL/min/1,73m^2 (Referência: Adultos > 18 anos: > 90 mL/min/1,73 m^2)
+● Potássio: 4,50 mmol/L (Referência: 3,5 a 5,1 mmol/L)
+● Cálcio Iônico: 1,11 mEq/L (Referência: 1,16 a 1,32 mEq/L)
+● Fósforo: 4,3 mg/dL (Referência: Adultos: 2,5-4,5 mg/dL)
+● Paratormônio PTH Intacto (Molécula Inteira): 265,1 pg/mL (Referência: 15 a 68,3 pg/mL)
+● Bicarbonato: 16 mEq/L (Referência: 20 a 32 mEq/L)
+● Testosterona Total: 12,49 ng/dL (Referência: Homens > 50 anos: 220,91 a 715,81 ng/dL)
+● PSA Total e Livre:
+○ PSA Livre: 0,14 ng/mL (Referência: 0,0 a 0,5 ng/mL)
+○ PSA Total: 0,54 ng/mL (Referência: 0,0 a 4,0 ng/mL)
+○ Porcentagem de PSA Livre/PSA Total: 26%
+● Testosterona Livre Calculada: 0,15 ng/dL (Referência: Homem de 50 a 89 anos: 1,81 a 10,20 ng/dL)
+2. EXAMES DE IMAGEM:
+Ultrassonografia dos Rins e Vias Urinárias:
+○ Rins: Sinais de nefropatia parenquimatosa crônica bilateral. Pequenos cistos renais simples corticais bilaterais.
+○ Bexiga: Pós-miccional de 66,7 mL. Sinais de bexiga."""
@@ -0,0 +1,609 @@
+"""Serviço HTTP local para outros sistemas (integração com o prontuário).
+
+Expõe, sem a interface Streamlit, a leitura de laudos, o eGFR e o relatório
+Word, sobre ``asyncio`` puro (HTTP/1.1 com keep-alive, corpo por
+``Content-Length``):
+
+* ``POST /parse``: laudo em PDF (``application/pdf``), texto
+  (``text/plain``) ou JSON ``{"text": ...}``; devolve
+  ``{"patient_info", "categories"}`` com as flags de anormalidade;
+* ``POST /egfr``: JSON ``{"creatinine", "age", "sex" | "is_female",
+  "is_black", "equation"}``, escalares ou listas de mesmo tamanho;
+* ``POST /report``: JSON ``{"patient_info", "categories"}`` ou
+  ``{"text"}``; devolve o ``.docx``;
+* ``GET /health`` (JSON) e ``GET /metrics`` (formato Prometheus).
+
+Leitura e relatório rodam em um pool de processos limitado. Os pedidos que
+chegam enquanto os processos estão ocupados são agrupados em uma única
+tarefa do pool (até ``--max-batch``). Acima de ``--queue-limit`` pedidos
+pendentes, o serviço responde 429 com ``Retry-After`` em vez de enfileirar
+sem limite. O eGFR vetorizado custa microssegundos e roda no próprio loop;
+corpos acima de ``EGFR_INLINE_BYTES`` (coortes) são lidos e calculados em
+uma thread.
+
+Se um processo do pool morre, o lote em andamento recebe 503, o pool é
+recriado e ``/health`` responde ``"degraded"`` (503) até o pool novo
+concluir uma tarefa.
+
+Uso:
+    python -m processador.service --port 8765 --workers 4 --queue-limit 64
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import multiprocessing
+import os
+import signal
+import sys
+import time
+from collections import Counter, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http import HTTPStatus
+from urllib.parse import urlsplit
+
+from processador.clinical import DEFAULT_AGE, DEFAULT_IS_FEMALE, EQUATION_2009, EQUATIONS, parse_sex
+from processador.export import DOCX_MIME, export_cache, export_key, generate_word_report
+from processador.ingest import parse_file
+from processador.instrumentation import recorder
+from processador.parsing import parse_report_text
+from processador.records import json_default
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = int(os.environ.get("PROCESSADOR_SERVICE_PORT", "8765"))
+DEFAULT_WORKERS = int(os.environ.get("PROCESSADOR_SERVICE_WORKERS", "0")) or os.cpu_count() or 1
+DEFAULT_MAX_BATCH = 16
+DEFAULT_BATCH_WINDOW = 0.002
+DEFAULT_MAX_BODY = 32 * 1024 * 1024
+# Corpos de /egfr até este tamanho são calculados no próprio loop
+EGFR_INLINE_BYTES = 64 * 1024
+IDLE_TIMEOUT = 30.0
+RETRY_AFTER = 1
+
+JSON_TYPE = "application/json"
+
+Request = namedtuple("Request", ["method", "path", "headers", "body", "keep_alive"])
+Response = namedtuple("Response", ["status", "body", "content_type", "headers"])
+
+
+class HttpError(Exception):
+    def __init__(self, status, message, headers=None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+
+def _json_bytes(payload):
+    return json.dumps(payload, ensure_ascii=False, default=json_default).encode("utf-8")
+
+
+def json_response(payload, status=HTTPStatus.OK, headers=None):
+    return Response(status, _json_bytes(payload), JSON_TYPE, headers or {})
+
+
+def error_response(status, message, headers=None):
+    return json_response({"error": message}, status, headers)
+
+
+# Executados nos processos do pool: cada item de um lote falha sozinho
+
+
+def parse_batch(documents):
+    """``[(data, filename)]`` -> ``[(True, JSON) | (False, erro)]``."""
+    results = []
+    for data, filename in documents:
+        try:
+            patient_info, categories = parse_file(data, filename)[:2]
+            # JSON montado no processo filho: volta ao loop só o que vai para a rede
+            results.append((True, _json_bytes({"patient_info": patient_info, "categories": categories})))
+        except Exception as e:
+            results.append((False, f"{type(e).__name__}: {e}"))
+    return results
+
+
+def report_batch(reports):
+    """``[(patient_info, categories, text)]`` -> ``[(True, docx) | (False, erro)]``;
+    com ``text``, o laudo é lido antes."""
+    results = []
+    for patient_info, categories, text in reports:
+        try:
+            if text is not None:
+                patient_info, categories = parse_report_text(text)
+            results.append((True, generate_word_report(patient_info, categories).getvalue()))
+        except Exception as e:
+            results.append((False, f"{type(e).__name__}: {e}"))
+    return results
+
+
+class Batcher:
+    """Junta pedidos de um tipo em lotes para o pool.
+
+    Um lote só é formado quando há um processo livre (``slots``), então os
+    pedidos que chegam com o pool ocupado viajam juntos no lote seguinte.
+    """
+
+    def __init__(self, kind, function, executor, slots, max_batch=DEFAULT_MAX_BATCH, window=DEFAULT_BATCH_WINDOW,
+                 on_broken=None):
+        self.kind = kind
+        self.function = function
+        self.executor = executor
+        # Chamado com o executor quando um processo do pool morre
+        self.on_broken = on_broken
+        self.slots = slots
+        self.max_batch = max_batch
+        self.window = window
+        self.batches = 0
+        self.items = 0
+        self._queue = asyncio.Queue()
+        self._task = None
+
+    def __len__(self):
+        return self._queue.qsize()
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    async def submit(self, item):
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((item, future))
+        return await future
+
+    def _drain(self, batch):
+        while len(batch) < self.max_batch and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+
+    async def _run(self):
+        while True:
+            batch = [await self._queue.get()]
+            await self.slots.acquire()
+            self._drain(batch)
+            if len(batch) < self.max_batch and self.window:
+                # Pool livre: espera um instante por pedidos que chegam juntos
+                await asyncio.sleep(self.window)
+                self._drain(batch)
+            asyncio.get_running_loop().create_task(self._dispatch(batch))
+
+    async def _dispatch(self, batch):
+        self.batches += 1
+        self.items += len(batch)
+        executor = self.executor
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(
+                executor, self.function, [item for item, _future in batch]
+            )
+        except BrokenProcessPool as e:
+            # O lote falha (pode ter sido ele a derrubar o processo); o pool é trocado
+            if self.on_broken is not None:
+                self.on_broken(executor)
+            results = [e] * len(batch)
+        except Exception as e:
+            # Processo filho morreu (ou o pool foi encerrado): todo o lote falha
+            results = [e] * len(batch)
+        finally:
+            self.slots.release()
+        for (_item, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
+class Service:
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, workers=DEFAULT_WORKERS, queue_limit=None,
+                 max_batch=DEFAULT_MAX_BATCH, batch_window=DEFAULT_BATCH_WINDOW, max_body=DEFAULT_MAX_BODY):
+        self.host = host
+        self.port = port
+        self.workers = max(1, workers)
+        self.queue_limit = queue_limit or self.workers * max_batch * 2
+        self.max_batch = max_batch
+        self.batch_window = batch_window
+        self.max_body = max_body
+        self.pending = 0
+        self.rejected = 0
+        self.pool_restarts = 0
+        # True entre a queda de um processo do pool e a primeira tarefa concluída no pool novo
+        self.degraded = False
+        self.started_at = None
+        self._requests = Counter()
+        self._seconds = Counter()
+        self._executor = None
+        self._probe = None
+        self._server = None
+        self._batchers = {}
+        self._connections = {}
+        self._routes = {
+            "/parse": ("POST", self.handle_parse),
+            "/egfr": ("POST", self.handle_egfr),
+            "/report": ("POST", self.handle_report),
+            "/health": ("GET", self.handle_health),
+            "/metrics": ("GET", self.handle_metrics),
+        }
+
+    def _new_executor(self):
+        # Processos criados sob demanda, com conexões abertas: com fork herdariam
+        # os sockets dos clientes (e um "Connection: close" não chegaria ao fim)
+        context = multiprocessing.get_context("forkserver") \
+            if "forkserver" in multiprocessing.get_all_start_methods() else None
+        return ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+
+    async def start(self):
+        self._executor = self._new_executor()
+        # Um processo livre por vez, compartilhado pelos tipos de tarefa
+        slots = asyncio.Semaphore(self.workers)
+        for kind, function in (("parse", parse_batch), ("report", report_batch)):
+            batcher = Batcher(kind, function, self._executor, slots, self.max_batch, self.batch_window,
+                              self._replace_executor)
+            batcher.start()
+            self._batchers[kind] = batcher
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self.started_at = time.time()
+        return self
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            # Conexões keep-alive ociosas: fechar o transporte encerra a leitura
+            # (antes de wait_closed, que espera todas as conexões)
+            for writer in list(self._connections.values()):
+                writer.close()
+            await asyncio.gather(*self._connections, return_exceptions=True)
+            await self._server.wait_closed()
+        for batcher in self._batchers.values():
+            await batcher.stop()
+        if self._probe is not None:
+            self._probe.cancel()
+            await asyncio.gather(self._probe, return_exceptions=True)
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+        self._server = self._executor = None
+
+    async def serve_forever(self):
+        await self._server.serve_forever()
+
+    # Pool de processos
+
+    def _replace_executor(self, broken):
+        """Troca o pool quebrado por um novo; só o primeiro lote a notar a queda troca."""
+        if broken is not self._executor:
+            return
+        self.pool_restarts += 1
+        self.degraded = True
+        broken.shutdown(wait=False, cancel_futures=True)
+        self._executor = self._new_executor()
+        for batcher in self._batchers.values():
+            batcher.executor = self._executor
+        # Uma tarefa vazia confirma que o pool novo sobe, mesmo sem pedidos
+        self._probe = asyncio.get_running_loop().create_task(self._probe_executor(self._executor))
+
+    async def _probe_executor(self, executor):
+        try:
+            await asyncio.get_running_loop().run_in_executor(executor, os.getpid)
+        except BrokenProcessPool:
+            # O lote seguinte que falhar troca o pool outra vez
+            return
+        if executor is self._executor:
+            self.degraded = False
+
+    # Conexões e protocolo
+
+    async def _handle_connection(self, reader, writer):
+        task = asyncio.current_task()
+        self._connections[task] = writer
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except HttpError as e:
+                    # Pedido malformado: responde e fecha, o restante da conexão não é confiável
+                    await self._write_response(writer, error_response(e.status, str(e), e.headers), False)
+                    break
+                if request is None:
+                    break
+                response = await self._dispatch(request)
+                await self._write_response(writer, response, request.keep_alive)
+                if not request.keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._connections.pop(task, None)
+            writer.close()
+
+    async def _read_request(self, reader):
+        try:
+            line = await asyncio.wait_for(_read_line(reader, HTTPStatus.REQUEST_URI_TOO_LONG), IDLE_TIMEOUT)
+        except asyncio.TimeoutError:
+            return None
+        if not line:
+            return None
+        try:
+            method, target, version = line.decode("latin-1").split()
+        except ValueError:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "linha de pedido inválida") from None
+
+        headers = {}
+        while True:
+            line = await _read_line(reader, HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE)
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            raise HttpError(HTTPStatus.LENGTH_REQUIRED, "envie o corpo com Content-Length")
+        try:
+            length = int(headers.get("content-length", "0"))
+        except ValueError:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "Content-Length inválido") from None
+        if length > self.max_body:
+            raise HttpError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"corpo acima de {self.max_body} bytes")
+        body = await reader.readexactly(length) if length else b""
+
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+        return Request(method.upper(), urlsplit(target).path, headers, body, keep_alive)
+
+    async def _write_response(self, writer, response, keep_alive):
+        status = HTTPStatus(response.status)
+        head = [
+            f"HTTP/1.1 {status.value} {status.phrase}",
+            f"Content-Type: {response.content_type}",
+            f"Content-Length: {len(response.body)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        head.extend(f"{name}: {value}" for name, value in response.headers.items())
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + response.body)
+        await writer.drain()
+
+    async def _dispatch(self, request):
+        start = time.perf_counter()
+        route = self._routes.get(request.path)
+        try:
+            if route is None:
+                raise HttpError(HTTPStatus.NOT_FOUND, f"rota desconhecida: {request.path}")
+            method, handler = route
+            if request.method != method:
+                raise HttpError(HTTPStatus.METHOD_NOT_ALLOWED, f"use {method} em {request.path}", {"Allow": method})
+            response = await handler(request)
+        except HttpError as e:
+            response = error_response(e.status, str(e), e.headers)
+        except BrokenProcessPool:
+            response = error_response(HTTPStatus.SERVICE_UNAVAILABLE, "pool de processos indisponível")
+        except Exception as e:
+            response = error_response(HTTPStatus.INTERNAL_SERVER_ERROR, f"{type(e).__name__}: {e}")
+        path = request.path if route is not None else "other"
+        self._requests[(path, int(response.status))] += 1
+        self._seconds[path] += time.perf_counter() - start
+        return response
+
+    # Fila limitada
+
+    async def _run_job(self, kind, item):
+        """Envia ``item`` ao lote de ``kind``; 429 quando a fila está cheia."""
+        if self.pending >= self.queue_limit:
+            self.rejected += 1
+            raise HttpError(HTTPStatus.TOO_MANY_REQUESTS, "fila cheia, tente novamente",
+                            {"Retry-After": str(RETRY_AFTER)})
+        self.pending += 1
+        try:
+            ok, result = await self._batchers[kind].submit(item)
+        finally:
+            self.pending -= 1
+        if not ok:
+            raise HttpError(HTTPStatus.UNPROCESSABLE_ENTITY, result)
+        return result
+
+    # Rotas
+
+    async def handle_parse(self, request):
+        content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+        if content_type == "application/pdf":
+            document = (request.body, "laudo.pdf")
+        elif content_type == JSON_TYPE:
+            text = _json_body(request).get("text")
+            if not isinstance(text, str):
+                raise HttpError(HTTPStatus.BAD_REQUEST, "campo 'text' obrigatório")
+            document = (text.encode("utf-8"), "laudo.txt")
+        else:
+            document = (request.body, "laudo.txt")
+        body = await self._run_job("parse", document)
+        return Response(HTTPStatus.OK, body, JSON_TYPE, {})
+
+    async def handle_egfr(self, request):
+        if len(request.body) <= EGFR_INLINE_BYTES:
+            body = egfr_body(request)
+        else:
+            # Coortes grandes: JSON e cálculo numa thread, sem travar as outras conexões
+            body = await asyncio.get_running_loop().run_in_executor(None, egfr_body, request)
+        return Response(HTTPStatus.OK, body, JSON_TYPE, {})
+
+    async def handle_report(self, request):
+        payload = _json_body(request)
+        text = payload.get("text")
+        if text is not None:
+            if not isinstance(text, str):
+                raise HttpError(HTTPStatus.BAD_REQUEST, "campo 'text' deve ser texto")
+            job, key = (None, None, text), export_key("docx-text", None, text)
+        else:
+            patient_info, categories = payload.get("patient_info"), payload.get("categories")
+            if not isinstance(patient_info, dict) or not isinstance(categories, dict):
+                raise HttpError(HTTPStatus.BAD_REQUEST, "envie 'patient_info' e 'categories' ou 'text'")
+            job, key = (patient_info, categories, None), export_key("docx", patient_info, categories)
+
+        # Mesmo cache dos downloads do app: o mesmo laudo não volta ao pool
+        data = export_cache.get(key)
+        if data is None:
+            data = await self._run_job("report", job)
+            export_cache.put(key, data)
+        return Response(HTTPStatus.OK, data, DOCX_MIME, {"Content-Disposition": 'attachment; filename="laudo.docx"'})
+
+    async def handle_health(self, request):
+        # 503 enquanto o pool recriado não confirmou que responde
+        return json_response({
+            "status": "degraded" if self.degraded else "ok",
+            "uptime_s": round(time.time() - self.started_at, 3),
+            "workers": self.workers,
+            "pool_restarts": self.pool_restarts,
+            "pending": self.pending,
+            "queue_limit": self.queue_limit,
+            "queued": {kind: len(batcher) for kind, batcher in self._batchers.items()},
+        }, HTTPStatus.SERVICE_UNAVAILABLE if self.degraded else HTTPStatus.OK)
+
+    async def handle_metrics(self, request):
+        return Response(HTTPStatus.OK, self.prometheus_text().encode("utf-8"), "text/plain; version=0.0.4", {})
+
+    def prometheus_text(self):
+        lines = [
+            "# HELP processador_service_requests_total Pedidos respondidos",
+            "# TYPE processador_service_requests_total counter",
+        ]
+        for (path, status), count in sorted(self._requests.items()):
+            lines.append(f'processador_service_requests_total{{path="{path}",status="{status}"}} {count}')
+        lines += [
+            "# HELP processador_service_request_seconds_total Tempo de resposta acumulado",
+            "# TYPE processador_service_request_seconds_total counter",
+        ]
+        for path, seconds in sorted(self._seconds.items()):
+            lines.append(f'processador_service_request_seconds_total{{path="{path}"}} {seconds}')
+        lines += [
+            "# HELP processador_service_batches_total Tarefas enviadas ao pool",
+            "# TYPE processador_service_batches_total counter",
+        ]
+        lines += [f'processador_service_batches_total{{kind="{kind}"}} {b.batches}' for kind, b in self._batchers.items()]
+        lines += [
+            "# HELP processador_service_batch_items_total Pedidos enviados ao pool dentro dos lotes",
+            "# TYPE processador_service_batch_items_total counter",
+        ]
+        lines += [f'processador_service_batch_items_total{{kind="{kind}"}} {b.items}' for kind, b in self._batchers.items()]
+        lines += [
+            "# HELP processador_service_rejected_total Pedidos recusados com 429",
+            "# TYPE processador_service_rejected_total counter",
+            f"processador_service_rejected_total {self.rejected}",
+            "# HELP processador_service_pending Pedidos aguardando o pool",
+            "# TYPE processador_service_pending gauge",
+            f"processador_service_pending {self.pending}",
+            "# HELP processador_service_pool_restarts_total Pools de processos recriados após a queda de um processo",
+            "# TYPE processador_service_pool_restarts_total counter",
+            f"processador_service_pool_restarts_total {self.pool_restarts}",
+            "# HELP processador_service_degraded 1 enquanto o pool recriado não confirmou que responde",
+            "# TYPE processador_service_degraded gauge",
+            f"processador_service_degraded {int(self.degraded)}",
+            "# HELP processador_service_queue_limit Limite de pedidos pendentes",
+            "# TYPE processador_service_queue_limit gauge",
+            f"processador_service_queue_limit {self.queue_limit}",
+        ]
+        return "\n".join(lines) + "\n" + recorder.prometheus_text()
+
+
+async def _read_line(reader, status):
+    """Uma linha do cabeçalho; acima do limite do ``StreamReader`` (64 KiB), ``HttpError(status)``."""
+    try:
+        return await reader.readline()
+    except (ValueError, asyncio.LimitOverrunError):
+        raise HttpError(status, "linha do cabeçalho acima do limite") from None
+
+
+def _json_body(request):
+    try:
+        payload = json.loads(request.body or b"{}")
+    except ValueError as e:
+        raise HttpError(HTTPStatus.BAD_REQUEST, f"JSON inválido: {e}") from None
+    if not isinstance(payload, dict):
+        raise HttpError(HTTPStatus.BAD_REQUEST, "o corpo deve ser um objeto JSON")
+    return payload
+
+
+def _is_female(payload):
+    if "is_female" in payload:
+        return payload["is_female"]
+    sex = payload.get("sex")
+    if isinstance(sex, list):
+        return [DEFAULT_IS_FEMALE if (found := parse_sex(value)) is None else found for value in sex]
+    found = parse_sex(sex) if isinstance(sex, str) else None
+    return DEFAULT_IS_FEMALE if found is None else found
+
+
+def egfr_body(request):
+    """Corpo JSON da resposta de ``/egfr`` para o pedido."""
+    with recorder.stage("service_egfr"):
+        return _json_bytes(egfr_payload(_json_body(request)))
+
+
+def egfr_payload(payload):
+    """Resposta de ``/egfr``: ``{"egfr": número ou lista, "equation"}``; NaN vira null."""
+    from processador.egfr import compute_egfr
+
+    if payload.get("creatinine") is None:
+        raise HttpError(HTTPStatus.BAD_REQUEST, "campo 'creatinine' obrigatório")
+    equation = str(payload.get("equation", EQUATION_2009))
+    if equation not in EQUATIONS:
+        raise HttpError(HTTPStatus.BAD_REQUEST, f"equação desconhecida: {equation!r} (use uma de {EQUATIONS})")
+    try:
+        egfr = compute_egfr(
+            payload["creatinine"], payload.get("age", DEFAULT_AGE), _is_female(payload),
+            payload.get("is_black", False), equation,
+        )
+    except (TypeError, ValueError) as e:
+        raise HttpError(HTTPStatus.BAD_REQUEST, f"{type(e).__name__}: {e}") from None
+    values = egfr.tolist()
+    if isinstance(values, list):
+        values = [None if math.isnan(value) else value for value in values]
+    elif math.isnan(values):
+        values = None
+    return {"egfr": values, "equation": equation}
+
+
+async def serve(service):
+    await service.start()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signum, service._server.close)
+        except (NotImplementedError, RuntimeError):
+            pass
+    # Primeira linha da saída: quem iniciou o serviço com --port 0 descobre a porta
+    print(f"Ouvindo em http://{service.host}:{service.port} ({service.workers} processos, "
+          f"fila de {service.queue_limit})", flush=True)
+    try:
+        await service.serve_forever()
+    except asyncio.CancelledError:
+        pass
+    finally:
+        await service.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serviço HTTP local de leitura de laudos, eGFR e relatórios.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="0 escolhe uma porta livre")
+    parser.add_argument("-w", "--workers", type=int, default=DEFAULT_WORKERS, help="processos do pool")
+    parser.add_argument("--queue-limit", type=int, help="pedidos pendentes antes do 429 (padrão: 2 lotes por processo)")
+    parser.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH, help="pedidos por tarefa do pool")
+    parser.add_argument("--batch-window", type=float, default=DEFAULT_BATCH_WINDOW * 1000,
+                        help="espera (ms) por pedidos simultâneos com o pool livre")
+    parser.add_argument("--max-body-mb", type=int, default=DEFAULT_MAX_BODY // (1024 * 1024))
+    args = parser.parse_args(argv)
+
+    if args.workers < 1 or args.max_batch < 1 or (args.queue_limit is not None and args.queue_limit < 1):
+        parser.error("--workers, --max-batch e --queue-limit devem ser positivos")
+
+    service = Service(
+        args.host, args.port, args.workers, args.queue_limit, args.max_batch,
+        args.batch_window / 1000, args.max_body_mb * 1024 * 1024,
+    )
+    asyncio.run(serve(service))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
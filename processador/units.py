@@ -0,0 +1,143 @@
+"""Normalização de unidades: cada ``(analito, unidade)`` em uma unidade canônica.
+
+Laboratórios diferentes informam o mesmo analito em unidades diferentes
+(creatinina em mg/dL ou µmol/L, hemoglobina em g/dL ou g/L, plaquetas em
+/µL ou x10³/µL). ``ANALYTE_UNITS`` traz do catálogo de analitos
+(``processador.analyte_catalog``) a unidade canônica de cada analito e,
+quando há conversão molar, a massa molar e a valência; a tabela
+``UNIT_FACTORS`` com o fator de cada par é montada uma única vez, na
+importação do módulo.
+
+``normalize`` converte colunas inteiras (uma consulta por par distinto);
+``normalize_value`` converte um valor. Pares fora do catálogo ficam como
+estão (fator 1, unidade original). O analito é procurado pelo nome ou por
+um sinônimo do catálogo, sem diferença de acentos e maiúsculas.
+"""
+
+import functools
+from collections import namedtuple
+
+from processador.analyte_catalog import catalog
+
+# Unidade -> (grandeza, fator para a unidade base da grandeza)
+# Bases: massa em g/L, quantidade em mol/L, equivalentes em Eq/L, contagem por µL
+UNIT_DIMENSIONS = {
+    "g/dL": ("mass", 10.0),
+    "g/L": ("mass", 1.0),
+    "mg/mL": ("mass", 1.0),
+    "mg/dL": ("mass", 1e-2),
+    "mg/L": ("mass", 1e-3),
+    "µg/mL": ("mass", 1e-3),
+    "µg/dL": ("mass", 1e-5),
+    "µg/L": ("mass", 1e-6),
+    "ng/mL": ("mass", 1e-6),
+    "ng/dL": ("mass", 1e-8),
+    "ng/L": ("mass", 1e-9),
+    "pg/mL": ("mass", 1e-9),
+    "mol/L": ("molar", 1.0),
+    "mmol/L": ("molar", 1e-3),
+    "µmol/L": ("molar", 1e-6),
+    "nmol/L": ("molar", 1e-9),
+    "pmol/L": ("molar", 1e-12),
+    "mEq/L": ("equivalent", 1e-3),
+    "/µL": ("count", 1.0),
+    "/mm³": ("count", 1.0),
+    "/mm3": ("count", 1.0),
+    "/nL": ("count", 1e3),
+    "x10³/µL": ("count", 1e3),
+    "10³/µL": ("count", 1e3),
+    "x10^9/L": ("count", 1e3),
+    "10^9/L": ("count", 1e3),
+    "x10^6/µL": ("count", 1e6),
+    "10^6/µL": ("count", 1e6),
+    "x10^12/L": ("count", 1e6),
+    "mL/min/1,73m²": ("filtration", 1.0),
+}
+
+# Analito -> (unidade canônica, massa molar em g/mol, valência), do catálogo de analitos
+ANALYTE_UNITS = {
+    entry.name: (entry.unit, entry.molar_mass, entry.valence)
+    for entry in catalog
+    if entry.unit in UNIT_DIMENSIONS
+}
+
+Conversion = namedtuple("Conversion", ["unit", "factor"])
+UnitColumns = namedtuple("UnitColumns", ["value", "unit", "factor"])
+
+
+def _to_molar(dimension, scale, molar_mass, valence):
+    """Fator de ``unidade -> mol/L`` (None se a grandeza não converte)."""
+    if dimension == "molar":
+        return scale
+    if dimension == "mass" and molar_mass:
+        return scale / molar_mass
+    if dimension == "equivalent" and valence:
+        return scale / valence
+    return None
+
+
+def _factor(unit, canonical, molar_mass, valence):
+    source, target = UNIT_DIMENSIONS.get(unit), UNIT_DIMENSIONS[canonical]
+    if source is None:
+        return None
+    if source[0] == target[0]:
+        return source[1] / target[1]
+    # Entre massa, quantidade e equivalentes, passando por mol/L
+    source_molar = _to_molar(*source, molar_mass, valence)
+    target_molar = _to_molar(*target, molar_mass, valence)
+    if source_molar is None or target_molar is None:
+        return None
+    return source_molar / target_molar
+
+
+def _build_factors():
+    factors = {}
+    for analyte, (canonical, molar_mass, valence) in ANALYTE_UNITS.items():
+        for unit in UNIT_DIMENSIONS:
+            factor = _factor(unit, canonical, molar_mass, valence)
+            if factor is not None:
+                factors[(analyte, unit)] = Conversion(canonical, factor)
+    return factors
+
+
+UNIT_FACTORS = _build_factors()
+
+
+@functools.lru_cache(maxsize=4096)
+def conversion(analyte, unit):
+    """``Conversion(unidade canônica, fator)``; sem entrada no catálogo, a própria unidade e 1."""
+    analyte = catalog.canonical_name(analyte) or analyte
+    found = UNIT_FACTORS.get((analyte, unit))
+    if found is None and unit:
+        # Unidade escrita só com "x" ou espaços diferentes da tabela ("x 10³/µL")
+        found = UNIT_FACTORS.get((analyte, unit.replace(" ", "")))
+    return found or Conversion(unit or "", 1.0)
+
+
+def canonical_unit_for(analyte, unit):
+    return conversion(analyte, unit).unit
+
+
+def normalize_value(analyte, value, unit):
+    """``(valor, unidade)`` na unidade canônica do analito; ``value`` None continua None."""
+    canonical, factor = conversion(analyte, unit)
+    return (None if value is None else value * factor), canonical
+
+
+def normalize(analytes, values, units):
+    """Converte colunas ``(analito, valor, unidade)`` de uma vez.
+
+    Devolve ``UnitColumns`` com ``value`` (float64), ``unit`` (object) e o
+    ``factor`` aplicado a cada linha (float64), para converter também os
+    limites de referência, que vêm na unidade do laudo.
+    """
+    import numpy as np
+    import pandas as pd
+
+    units = ["" if unit is None else unit for unit in units]
+    codes, pairs = pd.MultiIndex.from_arrays([list(analytes), units]).factorize()
+    found = [conversion(analyte, unit) for analyte, unit in pairs]
+    factors = np.fromiter((entry.factor for entry in found), dtype=float, count=len(found))[codes]
+    canonical = np.array([entry.unit for entry in found], dtype=object)[codes]
+    values = np.asarray(values, dtype=float)
+    return UnitColumns(values * factors, canonical, factors)
@@ -0,0 +1,94 @@
+"""Leitura dos valores de resultado: número, comparador e unidade canônica.
+
+Um valor como ``"192.000/µL"``, ``"150 a 400 mil/µL"``, ``"< 0,5 ng/mL"``
+ou ``"56,9%"`` vira ``(192000.0, "", "/µL")``, ``(150000.0, "", "/µL")``,
+``(0.5, "<", "ng/mL")`` e ``(56.9, "", "%")``. Os números seguem o formato
+brasileiro de ``reference_ranges.parse_number`` (vírgula decimal, ponto de
+milhar, sinal opcional: ``"-2,5 mEq/L"``) e "mil" multiplica por 1000.
+
+A mesma gramática tem duas formas: ``parse_value_text``, para um valor
+(memoizada; o leitor de laudos a usa item a item), e ``parse_values``, que
+lê colunas inteiras de uma vez e devolve arrays tipados do NumPy.
+"""
+
+import functools
+import re
+from collections import namedtuple
+
+from processador.reference_ranges import NUMBER_PATTERN, parse_number
+
+ParsedValue = namedtuple('ParsedValue', ['number', 'comparator', 'unit'])
+ValueColumns = namedtuple('ValueColumns', ['numeric', 'comparator', 'unit'])
+
+# Primeiro número do valor, com comparador opcional antes e "mil" depois;
+# numa faixa ("150 a 400 mil") vale o primeiro número
+VALUE_PATTERN = (
+    r'(?P<comparator><=|>=|≤|≥|<|>)?\s*'
+    rf'(?P<number>{NUMBER_PATTERN})'
+    rf'(?:\s*(?:a|-|–|até)\s*{NUMBER_PATTERN})?'
+    r'(?P<mil>\s*mil\b)?'
+    r'\s*(?P<unit>.*)'
+)
+_VALUE_RE = re.compile(VALUE_PATTERN)
+
+_COMPARATORS = {'<': '<', '>': '>', '<=': '<=', '>=': '>=', '≤': '<=', '≥': '>='}
+
+_MICRO_PREFIX_RE = re.compile(r'(?<![A-Za-zµ])(?:u|mc)(?=(?:g|L|l|mol|UI)\b)')
+_BODY_SURFACE_RE = re.compile(r'(\d+)[.,](\d+)\s*m(?:\^2|2|²)(?!\d)')
+
+_NO_NUMBER = ParsedValue(None, '', '')
+
+
+@functools.lru_cache(maxsize=1024)
+def canonical_unit(text):
+    """Grafia única da unidade: ``"mg / dL"``, ``"uL"``, ``"1.73 m^2"`` ->
+    ``"mg/dL"``, ``"µL"``, ``"1,73m²"``."""
+    unit = ' '.join(text.split())
+    unit = re.sub(r'\s*/\s*', '/', unit)
+    unit = unit.replace('μ', 'µ')  # mi grego -> sinal de micro
+    unit = _MICRO_PREFIX_RE.sub('µ', unit)
+    unit = _BODY_SURFACE_RE.sub(r'\1,\2m²', unit)
+    return unit.replace('^2', '²').replace('^3', '³')
+
+
+@functools.lru_cache(maxsize=16384)
+def parse_value_text(value):
+    """``ParsedValue(number, comparator, unit)`` de um valor; sem número,
+    ``number`` é None e comparador e unidade ficam vazios."""
+    match = _VALUE_RE.search(value) if value else None
+    if not match:
+        return _NO_NUMBER
+    try:
+        number = parse_number(match.group('number'))
+    except ValueError:
+        # "1,2,3" casa com o padrão de número mas não é um número
+        return _NO_NUMBER
+    if match.group('mil'):
+        number *= 1000
+    return ParsedValue(
+        number,
+        _COMPARATORS.get(match.group('comparator'), ''),
+        canonical_unit(match.group('unit')),
+    )
+
+
+def parse_values(values):
+    """Lê uma coluna de valores; devolve ``ValueColumns`` com ``numeric``
+    (float64, NaN sem número), ``comparator`` (``<U2``, vazio sem
+    comparador) e ``unit`` (object, unidade canônica).
+
+    Cada valor distinto (``pd.factorize``) é lido uma única vez e o
+    resultado é espalhado de volta pelas posições com os códigos.
+    """
+    import numpy as np
+    import pandas as pd
+
+    # Ausentes (None/NaN) viram um valor distinto sem número, não o código -1
+    codes, uniques = pd.factorize(np.asarray(values, dtype=object), use_na_sentinel=False)
+    parsed = [parse_value_text(value if isinstance(value, str) else '') for value in uniques]
+    numeric = np.fromiter(
+        (np.nan if entry.number is None else entry.number for entry in parsed), dtype=float, count=len(parsed)
+    )
+    comparator = np.array([entry.comparator for entry in parsed], dtype='<U2')
+    unit = np.array([entry.unit for entry in parsed], dtype=object)
+    return ValueColumns(numeric[codes], comparator[codes], unit[codes])
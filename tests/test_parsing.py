@@ -0,0 +1,48 @@
+"""Casos golden do leitor de laudos contra o oráculo de benchmarks/bench_parser.py.
+
+O resultado esperado de cada caso é o da implementação original
+(``legacy_process_pdf_text``), com a leitura de valores atual e as mudanças
+de flag intencionais (``INTENDED_FLAG_CHANGES``).
+"""
+
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from bench_parser import (  # noqa: E402
+    GOLDEN_CASES,
+    _split,
+    _with_intended_flags,
+    _with_value_parsing,
+    legacy_process_pdf_text,
+)
+from processador.parsing import ReportParser  # noqa: E402
+
+
+def _expected(label):
+    text = GOLDEN_CASES[label]
+    return _with_intended_flags(label, _with_value_parsing(legacy_process_pdf_text(text)))
+
+
+def _parse(chunks):
+    parser = ReportParser()
+    for chunk in chunks:
+        parser.feed(chunk)
+    return parser.close()
+
+
+@pytest.mark.parametrize("label", list(GOLDEN_CASES))
+def test_golden_case(label):
+    assert _parse([GOLDEN_CASES[label]]) == _expected(label)
+
+
+# Páginas cortando linhas ao meio devem dar o mesmo resultado
+@pytest.mark.parametrize("size", [1, 7, 64])
+@pytest.mark.parametrize("label", list(GOLDEN_CASES))
+def test_golden_case_incremental(label, size):
+    assert _parse(_split(GOLDEN_CASES[label], size)) == _expected(label)